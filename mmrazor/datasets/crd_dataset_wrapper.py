@@ -63,7 +63,20 @@ class CRDDataset:
             self.full_init()
 
     def _parse_fullset_contrast_info(self) -> None:
-        """parse contrast information of the whole dataset."""
+        """parse contrast information of the whole dataset.
+
+        Instead of the per-class lists of positive and negative samples, a
+        compact index is built, namely sample indices sorted by class and the
+        offsets of classes, so the memory is O(N) rather than O(C * N). The
+        negative samples of a class are all the samples out of its segment,
+        which are drawn by offset arithmetic in ``_get_contrast_info``.
+
+        If ``0 < percent < 1``, the negative samples of each class are the
+        first ``n`` samples out of this class in a fixed random permutation of
+        the dataset, where ``n`` is ``percent`` of the negative samples of the
+        class 0, and they are drawn by the positions of the class in the
+        permutation.
+        """
         assert self.sample_mode in [
             'exact', 'random'
         ], ('`sample_mode` must in [`exact`, `random`], '
@@ -74,46 +87,49 @@ class CRDDataset:
         #   e.g. [2, 3, 5].
         num_classes: int = self.num_classes  # type: ignore
         if num_classes is None:
-            num_classes = max(self.dataset.get_gt_labels()) + 1
+            num_classes = int(np.max(self.dataset.get_gt_labels())) + 1
 
         if not self.dataset.test_mode:  # type: ignore
             # Parse info.
-            self.gt_labels = self.dataset.get_gt_labels()
+            self.gt_labels = np.asarray(self.dataset.get_gt_labels())
             self.num_samples: int = self.dataset.__len__()
 
-            self.cls_positive: List[List[int]] = [[]
-                                                  for _ in range(num_classes)
-                                                  ]  # type: ignore
-            for i in range(self.num_samples):
-                self.cls_positive[self.gt_labels[i]].append(i)
-
-            self.cls_negative: List[List[int]] = [[]
-                                                  for i in range(num_classes)
-                                                  ]  # type: ignore
-            for i in range(num_classes):  # type: ignore
-                for j in range(num_classes):  # type: ignore
-                    if j == i:
-                        continue
-                    self.cls_negative[i].extend(self.cls_positive[j])
-
-            self.cls_positive = [
-                np.asarray(self.cls_positive[i])
-                for i in range(num_classes)  # type: ignore
-            ]
-            self.cls_negative = [
-                np.asarray(self.cls_negative[i])
-                for i in range(num_classes)  # type: ignore
-            ]
+            # the samples of class c are
+            # ``sorted_indices[class_offsets[c]:class_offsets[c + 1]]``.
+            self.sorted_indices = np.argsort(self.gt_labels, kind='stable')
+            self.class_offsets = np.zeros(num_classes + 1, dtype=np.int64)
+            self.class_offsets[1:] = np.cumsum(
+                np.bincount(self.gt_labels, minlength=num_classes))
 
+            self.neg_permutation = None
+            self.num_negatives = self.num_samples - np.diff(
+                self.class_offsets)
             if 0 < self.percent < 1:
-                n = int(len(self.cls_negative[0]) * self.percent)
-                self.cls_negative = [
-                    np.random.permutation(self.cls_negative[i])[0:n]
-                    for i in range(num_classes)  # type: ignore
-                ]
-
-            self.cls_positive = np.asarray(self.cls_positive)
-            self.cls_negative = np.asarray(self.cls_negative)
+                n = max(int(self.num_negatives[0] * self.percent), 1)
+                self.neg_permutation = np.random.permutation(self.num_samples)
+                # the positions in the permutation of the samples of each
+                # class, sorted by class and then by position.
+                positions = np.empty(self.num_samples, dtype=np.int64)
+                positions[self.neg_permutation] = np.arange(self.num_samples)
+                class_positions = positions[self.sorted_indices]
+                self.class_positions = class_positions[np.lexsort(
+                    (class_positions, self.gt_labels[self.sorted_indices]))]
+                self.num_negatives = np.minimum(self.num_negatives, n)
+
+    def _get_negatives(self, label: int, ranks: np.ndarray) -> np.ndarray:
+        """Get the ``ranks``-th negative samples of class ``label``."""
+        start, end = self.class_offsets[label], self.class_offsets[label + 1]
+        if self.neg_permutation is None:
+            # skip the segment of the class in the sorted indices.
+            ranks = ranks + (ranks >= start) * (end - start)
+            return self.sorted_indices[ranks]
+
+        # the k-th position of the class has ``positions[k] - k`` negative
+        # samples before it.
+        positions = self.class_positions[start:end]
+        num_before = positions - np.arange(end - start)
+        ranks = ranks + np.searchsorted(num_before, ranks, side='right')
+        return self.neg_permutation[ranks]
 
     @property
     def metainfo(self) -> dict:
@@ -126,20 +142,22 @@ class CRDDataset:
 
     def _get_contrast_info(self, data: Dict, idx: int) -> Dict:
         """Get contrast information for each data sample."""
+        label = self.gt_labels[idx]
         if self.sample_mode == 'exact':
             pos_idx = idx
         elif self.sample_mode == 'random':
-            pos_idx = np.random.choice(self.cls_positive[self.gt_labels[idx]],
-                                       1)
-            pos_idx = pos_idx[0]  # type: ignore
+            start = self.class_offsets[label]
+            num_positives = self.class_offsets[label + 1] - start
+            pos_idx = self.sorted_indices[start +
+                                          np.random.randint(num_positives)]
         else:
             raise NotImplementedError(self.sample_mode)
-        replace = True if self.neg_num > \
-            len(self.cls_negative[self.gt_labels[idx]]) else False
-        neg_idx = np.random.choice(
-            self.cls_negative[self.gt_labels[idx]],
-            self.neg_num,
-            replace=replace)
+        num_negatives = self.num_negatives[label]
+        replace = True if self.neg_num > num_negatives else False
+        # seeded by the global random state, which differs in workers.
+        rng = np.random.default_rng(np.random.randint(np.iinfo(np.int32).max))
+        ranks = rng.choice(num_negatives, self.neg_num, replace=replace)
+        neg_idx = self._get_negatives(label, ranks)
         contrast_sample_idxs = np.hstack((np.asarray([pos_idx]), neg_idx))
         data['contrast_sample_idxs'] = contrast_sample_idxs
         return data
@@ -132,13 +132,16 @@ def update_bn_stats(
         if rank == 0:
             prog_bar.update()
 
-    # Sync BN stats across GPUs (no reduction if 1 GPU used)
-    running_means = scaled_all_reduce(running_means, world_size)
-    running_vars = scaled_all_reduce(running_vars, world_size)
+    # Sync BN stats across GPUs (no reduction if 1 GPU used) with a single
+    # all-reduce of the flattened stats
+    num_features = [len(mean) for mean in running_means]
+    running_stats = torch.cat(running_means + running_vars)
+    running_stats = scaled_all_reduce([running_stats], world_size)[0]
+    running_stats = running_stats.split(num_features * 2)
     # Set BN stats and restore original momentum values
     for i, bn in enumerate(bn_layers):
-        bn.running_mean = running_means[i]
-        bn.running_var = running_vars[i]
+        bn.running_mean.copy_(running_stats[i])
+        bn.running_var.copy_(running_stats[len(bn_layers) + i])
         bn.momentum = momentums[i]
 
 
@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Dict, List, Union
+from functools import partial
+from typing import Callable, Dict, List, Union
 
 from mmengine.evaluator import Evaluator
 from mmengine.runner import ValLoop
@@ -7,17 +8,34 @@ from torch.utils.data import DataLoader
 
 from mmrazor.models.utils import add_prefix
 from mmrazor.registry import LOOPS
+from .utils import CalibrateBNMixin
 
 
 @LOOPS.register_module()
-class AutoSlimValLoop(ValLoop):
+class AutoSlimValLoop(ValLoop, CalibrateBNMixin):
+    """Loop validating the max subnet, the min subnet and some random
+    subnets of AutoSlim.
+
+    Args:
+        runner (Runner): A reference of runner.
+        dataloader (Dataloader or dict): A dataloader object or a dict to
+            build a dataloader.
+        evaluator (Evaluator or dict or list): Used for computing metrics.
+        fp16 (bool): Whether to enable fp16 validation. Defaults to
+            False.
+        calibrate_sample_num (int): The number of train samples used to
+            recalibrate the BN statistics of all subnets in one pass before
+            validation. Recalibration is disabled if 0. Defaults to 0.
+    """
 
     def __init__(self,
                  runner,
                  dataloader: Union[DataLoader, Dict],
                  evaluator: Union[Evaluator, Dict, List],
-                 fp16: bool = False) -> None:
+                 fp16: bool = False,
+                 calibrate_sample_num: int = 0) -> None:
         super().__init__(runner, dataloader, evaluator, fp16)
+        self.calibrate_sample_num = calibrate_sample_num
 
         if self.runner.distributed:
             model = self.runner.model.module
@@ -31,22 +49,30 @@ class AutoSlimValLoop(ValLoop):
         """Launch validation."""
         self.runner.call_hook('before_val')
 
-        all_metrics = dict()
-
-        self._model.set_max_subnet()
-        metrics = self._evaluate_once()
-        all_metrics.update(add_prefix(metrics, 'max_subnet'))
+        # the setters of the max subnet, the min subnet and random subnets.
+        setters: List[Callable] = [
+            self._model.set_max_subnet, self._model.set_min_subnet
+        ]
+        for _ in range(self._model.num_samples):
+            subnet = self._model.sample_subnet()
+            setters.append(partial(self._model.set_subnet, subnet))
+        prefixes = ['max_subnet', 'min_subnet'] + [
+            f'random_subnet_{subnet_idx}'
+            for subnet_idx in range(self._model.num_samples)
+        ]
+        if self.calibrate_sample_num > 0:
+            bn_stats = self.recalibrate(setters, self.runner.train_dataloader,
+                                        self.calibrate_sample_num,
+                                        lambda setter: setter())
 
-        self._model.set_min_subnet()
-        metrics = self._evaluate_once()
-        all_metrics.update(add_prefix(metrics, 'min_subnet'))
-
-        for subnet_idx in range(self._model.num_samples):
-            self._model.set_subnet(self._model.sample_subnet())
+        all_metrics = dict()
+        for i, (setter, prefix) in enumerate(zip(setters, prefixes)):
+            setter()
+            if self.calibrate_sample_num > 0:
+                self.load_bn_statistics(bn_stats[i])
             # compute student metrics
             metrics = self._evaluate_once()
-            all_metrics.update(
-                add_prefix(metrics, f'random_subnet_{subnet_idx}'))
+            all_metrics.update(add_prefix(metrics, prefix))
 
         self.runner.call_hook('after_val_epoch', metrics=all_metrics)
 
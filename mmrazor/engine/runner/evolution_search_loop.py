@@ -1,27 +1,31 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import math
 import os
 import os.path as osp
 import random
 import warnings
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
 from mmengine import fileio
-from mmengine.dist import broadcast_object_list
+from mmengine.dist import broadcast_object_list, get_world_size
 from mmengine.evaluator import Evaluator
 from mmengine.runner import EpochBasedTrainLoop
 from mmengine.utils import is_list_of
 from torch.utils.data import DataLoader
 
 from mmrazor.registry import LOOPS, TASK_UTILS
-from mmrazor.structures import Candidates, export_fix_subnet
+from mmrazor.structures import CandidatePool, Candidates, export_fix_subnet
 from mmrazor.utils import SupportRandomSubnet
-from .utils import check_subnet_resources, crossover
+from .utils import (CalibrateBNMixin, SubnetEvalCache, batch_crossover,
+                    build_cached_batch_loader, build_local_dataloader,
+                    check_subnet_resources, crossover, get_model_identity,
+                    val_subnets_racing, val_subnets_sharded)
 
 
 @LOOPS.register_module()
-class EvolutionSearchLoop(EpochBasedTrainLoop):
+class EvolutionSearchLoop(EpochBasedTrainLoop, CalibrateBNMixin):
     """Loop for evolution searching.
 
     Args:
@@ -53,6 +57,49 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
         init_candidates (str, optional): The candidates file path, which is
             used to init `self.candidates`. Its format is usually in .yaml
             format. Defaults to None.
+        screener_cfg (dict, Optional): Used for building a
+            :class:`ResourceScreener`, which screens a batch of encoded
+            candidates with ``constraints_range`` in one vectorized call when
+            sampling, mutating and crossing over. Only FLOPs and params
+            constraints are supported. Defaults to None.
+        eval_cache_cfg (dict, Optional): Used for building a
+            :class:`SubnetEvalCache`, so that a subnet is validated only once
+            with the same supernet weights, even across resumed searches.
+            ``cache_dir`` defaults to ``{work_dir}/eval_cache``, set it to
+            None to keep the in-memory tier only. Defaults to None.
+        shard_candidates (bool): Whether to shard candidates across ranks,
+            that is, each rank validates a disjoint subset of candidates on
+            the whole val set and the scores are all-gathered, instead of
+            validating every candidate with a shard of the val set in each
+            rank. It scales better when the val set is small.
+            Defaults to False.
+        num_shard_val_samples (int, optional): The number of samples of a
+            fixed random subset of the val set used when ``shard_candidates``
+            is True. If None, the whole val set is used. Defaults to None.
+        racing_cfg (dict, Optional): If given, candidates are validated with
+            racing (see :func:`val_subnets_racing`), that is, candidates
+            which clearly can't enter the top k after a few batches are
+            dropped early and scored by their partial results. Its keys are
+            ``num_init_batches`` and ``confidence``. Defaults to None.
+        num_refit_samples (int): The number of candidates with the top
+            predicted scores validated in each epoch when using the predictor.
+            Their real scores are used to refit the predictor, which is
+            fixed after initialization if 0. Defaults to 0.
+        calibrate_sample_num (int): The number of train samples used to
+            recalibrate the BN statistics of the candidates to be validated
+            in one pass (see :class:`CalibrateBNMixin`). Recalibration is
+            disabled if 0. It can't be used with ``shard_candidates`` or
+            ``racing_cfg``. Defaults to 0.
+        batch_cache_cfg (dict, Optional): If given, the val batches and the
+            calibration batches are materialized once by
+            :class:`CachedBatchLoader` built with it, and replayed for every
+            candidate instead of running the data pipeline again.
+            Defaults to None.
+
+    Note:
+        The candidates are kept in :class:`CandidatePool` while searching,
+        and converted from / to :class:`Candidates` when reading
+        ``init_candidates`` and reading / writing ``search_epoch_*.pkl``.
     """
 
     def __init__(self,
@@ -72,7 +119,15 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
                  estimator_cfg: Optional[Dict] = None,
                  predictor_cfg: Optional[Dict] = None,
                  score_key: str = 'accuracy/top1',
-                 init_candidates: Optional[str] = None) -> None:
+                 init_candidates: Optional[str] = None,
+                 screener_cfg: Optional[Dict] = None,
+                 eval_cache_cfg: Optional[Dict] = None,
+                 shard_candidates: bool = False,
+                 num_shard_val_samples: Optional[int] = None,
+                 racing_cfg: Optional[Dict] = None,
+                 num_refit_samples: int = 0,
+                 calibrate_sample_num: int = 0,
+                 batch_cache_cfg: Optional[Dict] = None) -> None:
         super().__init__(runner, dataloader, max_epochs)
         if isinstance(evaluator, dict) or is_list_of(evaluator, dict):
             self.evaluator = runner.build_evaluator(evaluator)  # type: ignore
@@ -96,15 +151,38 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
         self.crossover_prob = crossover_prob
         self.max_keep_ckpts = max_keep_ckpts
         self.resume_from = resume_from
+        self.shard_candidates = shard_candidates
+        if self.shard_candidates:
+            self.shard_dataloader = build_local_dataloader(
+                self.dataloader, num_shard_val_samples)
+        self.batch_cache_cfg = batch_cache_cfg
+        if self.batch_cache_cfg is not None:
+            if self.shard_candidates:
+                self.shard_dataloader = build_cached_batch_loader(
+                    self.shard_dataloader, self.batch_cache_cfg, 'shard_val')
+            self.dataloader = build_cached_batch_loader(
+                self.dataloader, self.batch_cache_cfg, 'val')
+        self._calibrate_dataloader = None
+        self.racing_cfg = racing_cfg
+        assert not (self.shard_candidates and self.racing_cfg is not None), \
+            '`shard_candidates` and `racing_cfg` can not be used together.'
+        self.calibrate_sample_num = calibrate_sample_num
+        assert self.calibrate_sample_num == 0 or not (
+            self.shard_candidates or self.racing_cfg is not None), \
+            '`calibrate_sample_num` can not be used with `shard_candidates` ' \
+            'or `racing_cfg`.'
+        # the recalibrated BN statistics keyed by subnets.
+        self._bn_stats: Dict[str, torch.Tensor] = dict()
 
         if init_candidates is None:
-            self.candidates = Candidates()
+            self.candidates = CandidatePool()
         else:
-            self.candidates = fileio.load(init_candidates)
-            assert isinstance(self.candidates, Candidates), 'please use the \
+            candidates = fileio.load(init_candidates)
+            assert isinstance(candidates, Candidates), 'please use the \
                 correct init candidates file'
+            self.candidates = CandidatePool.from_candidates(candidates)
 
-        self.top_k_candidates = Candidates()
+        self.top_k_candidates = CandidatePool()
 
         if self.runner.distributed:
             self.model = runner.model.module
@@ -125,11 +203,29 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
             self.predictor_cfg['search_groups'] = \
                 self.model.mutator.search_groups
             self.predictor = TASK_UTILS.build(self.predictor_cfg)
+        self.num_refit_samples = num_refit_samples
+
+        # initialize screener
+        self.screener = None
+        if screener_cfg is not None:
+            self.screener = TASK_UTILS.build(screener_cfg)
+
+        # initialize evaluation cache
+        self.eval_cache = None
+        if eval_cache_cfg is not None:
+            eval_cache_cfg = dict(eval_cache_cfg)
+            eval_cache_cfg.setdefault(
+                'cache_dir', osp.join(self.runner.work_dir, 'eval_cache'))
+            self.eval_cache = SubnetEvalCache(**eval_cache_cfg)
 
     def run(self) -> None:
         """Launch searching."""
         self.runner.call_hook('before_train')
 
+        if self.eval_cache is not None:
+            # the checkpoint of supernet has been loaded before running.
+            self.eval_cache.model_id = get_model_identity(self.model)
+
         if self.predictor_cfg is not None:
             self._init_predictor()
 
@@ -159,20 +255,19 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
         self.sample_candidates()
         self.update_candidates_scores()
 
-        scores_before = self.top_k_candidates.scores
+        scores_before = self.top_k_candidates.scores.tolist()
         self.runner.logger.info(f'top k scores before update: '
                                 f'{scores_before}')
 
         self.candidates.extend(self.top_k_candidates)
-        self.candidates.sort_by(key_indicator='score', reverse=True)
-        self.top_k_candidates = Candidates(self.candidates.data[:self.top_k])
+        self.top_k_candidates = self.candidates.top_k(self.top_k)
 
-        scores_after = self.top_k_candidates.scores
+        scores_after = self.top_k_candidates.scores.tolist()
         self.runner.logger.info(f'top k scores after update: '
                                 f'{scores_after}')
 
         mutation_candidates = self.gen_mutation_candidates()
-        self.candidates_mutator_crossover = Candidates(mutation_candidates)
+        self.candidates_mutator_crossover = mutation_candidates[:]
         crossover_candidates = self.gen_crossover_candidates()
         self.candidates_mutator_crossover.extend(crossover_candidates)
 
@@ -189,35 +284,82 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
         init_candidates = len(self.candidates)
         if self.runner.rank == 0:
             while len(self.candidates) < self.num_candidates:
+                if self.screener is not None:
+                    candidates, results = self._screen_candidates(
+                        self.screener.sample,
+                        self.num_candidates - len(self.candidates))
+                    self.candidates.extend(candidates)
+                    candidates_resources.extend(results)
+                    continue
+
                 candidate = self.model.sample_subnet()
                 is_pass, result = self._check_constraints(
                     random_subnet=candidate)
                 if is_pass:
                     self.candidates.append(candidate)
                     candidates_resources.append(result)
-            self.candidates = Candidates(self.candidates.data)
-        else:
-            self.candidates = Candidates([dict(a=0)] * self.num_candidates)
 
         if len(candidates_resources) > 0:
             self.candidates.update_resources(
                 candidates_resources,
-                start=len(self.candidates.data) - len(candidates_resources))
+                start=len(self.candidates) - len(candidates_resources))
             assert init_candidates + len(
                 candidates_resources) == self.num_candidates
 
         # broadcast candidates to val with multi-GPUs.
-        broadcast_object_list(self.candidates.data)
+        candidates = [self.candidates]
+        broadcast_object_list(candidates)
+        self.candidates = candidates[0]
 
     def update_candidates_scores(self) -> None:
         """Validate candicate one by one from the candicate pool, and update
         top-k candicates."""
-        for i, candidate in enumerate(self.candidates.subnets):
-            self.model.set_subnet(candidate)
-            metrics = self._val_candidate(use_predictor=self.use_predictor)
+        use_cache = self.eval_cache is not None and not self.use_predictor
+        subnets = self.candidates.subnets
+        if use_cache:
+            cached_metrics = self.eval_cache.get_batch(subnets)
+        else:
+            cached_metrics = [None] * len(self.candidates)
+
+        if self.use_predictor:
+            # score the whole population with one call of the handler.
+            cached_metrics = self.predictor.predict_batch(subnets)
+            if self.num_refit_samples > 0:
+                self._refit_predictor(cached_metrics)
+
+        if not self.use_predictor:
+            self._recalibrate_candidates([
+                subnet for subnet, metrics in zip(subnets, cached_metrics)
+                if metrics is None
+            ])
+
+        if self.shard_candidates and not self.use_predictor:
+            missing = [i for i, m in enumerate(cached_metrics) if m is None]
+            sharded_metrics = val_subnets_sharded(
+                self.runner.model, self.model, [subnets[i] for i in missing],
+                self.shard_dataloader, self.evaluator)
+            for i, metrics in zip(missing, sharded_metrics):
+                cached_metrics[i] = metrics
+                if use_cache:
+                    self.eval_cache.put(subnets[i], metrics)
+
+        if self.racing_cfg is not None and not self.use_predictor:
+            self._val_missing_with_racing(cached_metrics, use_cache)
+
+        for i, candidate in enumerate(subnets):
+            metrics = cached_metrics[i]
+            if metrics is None and use_cache:
+                # duplicated candidates may be validated in this round.
+                metrics = self.eval_cache.get(candidate, use_disk=False)
+            if metrics is None:
+                self._set_subnet(candidate)
+                metrics = self._val_candidate(
+                    use_predictor=self.use_predictor)
+                if use_cache:
+                    self.eval_cache.put(candidate, metrics)
             score = round(metrics[self.score_key], 2) \
                 if len(metrics) != 0 else 0.
-            self.candidates.set_resource(i, score, 'score')
+            self.candidates.set_score(i, score)
             self.runner.logger.info(
                 f'Epoch:[{self._epoch}/{self._max_epochs}] '
                 f'Candidate:[{i + 1}/{self.num_candidates}] '
@@ -226,8 +368,131 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
                 f'Latency: {self.candidates.resources("latency")[i]} '
                 f'Score: {self.candidates.scores[i]} ')
 
+        if use_cache:
+            self.runner.logger.info(
+                f'Eval cache: {self.eval_cache.num_hits} hits, '
+                f'{self.eval_cache.num_misses} misses in total.')
+
+    def _val_missing_with_racing(self, cached_metrics: List,
+                                 use_cache: bool) -> None:
+        """Validate the candidates without cached metrics with racing, and
+        fill their metrics into ``cached_metrics`` in place."""
+        subnets = self.candidates.subnets
+        missing = [i for i, m in enumerate(cached_metrics) if m is None]
+        ref_scores = self.top_k_candidates.scores.tolist() + [
+            m[self.score_key] for m in cached_metrics if m
+        ]
+        racing_metrics, is_full, num_saved_batches = val_subnets_racing(
+            self.runner.model,
+            self.model, [subnets[i] for i in missing],
+            self.dataloader,
+            self.evaluator,
+            self.score_key,
+            self.top_k,
+            ref_scores=ref_scores,
+            **self.racing_cfg)
+        for i, metrics, full in zip(missing, racing_metrics, is_full):
+            cached_metrics[i] = metrics
+            # the partial results of dropped candidates are not cached.
+            if use_cache and full:
+                self.eval_cache.put(subnets[i], metrics)
+
+        num_total_batches = len(missing) * len(self.dataloader)
+        self.runner.logger.info(
+            f'Epoch:[{self._epoch}/{self._max_epochs}] Racing dropped '
+            f'{len(missing) - sum(is_full)}/{len(missing)} candidates and '
+            f'saved {num_saved_batches}/{num_total_batches} batches.')
+
+    def _refit_predictor(self, predicted_metrics: List[Dict]) -> None:
+        """Validate the candidates with the top predicted scores, replace
+        their metrics in ``predicted_metrics`` in place with the real ones,
+        and refit the predictor with them."""
+        subnets = self.candidates.subnets
+        scores = np.array([m[self.score_key] for m in predicted_metrics])
+        order = np.argsort(-scores, kind='stable')
+        # keep the first occurrence of duplicated subnets in the order.
+        unique_indices = self.candidates[order].unique_indices()
+        indices = order[unique_indices][:self.num_refit_samples].tolist()
+
+        if self.eval_cache is not None:
+            real_metrics = self.eval_cache.get_batch(
+                [subnets[i] for i in indices])
+        else:
+            real_metrics = [None] * len(indices)
+        self._recalibrate_candidates([
+            subnets[i] for j, i in enumerate(indices)
+            if real_metrics[j] is None
+        ])
+        for j, i in enumerate(indices):
+            if real_metrics[j] is None:
+                self._set_subnet(subnets[i])
+                real_metrics[j] = self._val_candidate()
+                if self.eval_cache is not None:
+                    self.eval_cache.put(subnets[i], real_metrics[j])
+
+        for i, metrics in zip(indices, real_metrics):
+            predicted_metrics[i] = metrics
+        self.predictor.update([subnets[i] for i in indices],
+                              [m[self.score_key] for m in real_metrics])
+        self.runner.logger.info(
+            f'Epoch:[{self._epoch}/{self._max_epochs}] Refitted the '
+            f'predictor with {len(indices)} validated candidates, '
+            f'{len(self.predictor.train_label)} samples in total.')
+
+    def _recalibrate_candidates(self,
+                                subnets: List[SupportRandomSubnet]) -> None:
+        """Recalibrate the BN statistics of ``subnets`` in one pass if
+        ``calibrate_sample_num`` is set."""
+        self._bn_stats = dict()
+        if self.calibrate_sample_num == 0 or len(subnets) == 0:
+            return
+        unique_subnets = list(
+            {str(subnet): subnet
+             for subnet in subnets}.values())
+        all_stats = self.recalibrate(unique_subnets,
+                                     self.calibrate_dataloader,
+                                     self.calibrate_sample_num,
+                                     self.model.set_subnet)
+        self._bn_stats = {
+            str(subnet): stats
+            for subnet, stats in zip(unique_subnets, all_stats)
+        }
+
+    @property
+    def calibrate_dataloader(self):
+        """The dataloader of BN recalibration, whose batches are cached if
+        ``batch_cache_cfg`` is set."""
+        if self._calibrate_dataloader is None:
+            dataloader = self.runner.train_dataloader
+            if self.batch_cache_cfg is not None:
+                max_batches = math.ceil(
+                    self.calibrate_sample_num /
+                    (dataloader.batch_size * get_world_size()))
+                dataloader = build_cached_batch_loader(
+                    dataloader,
+                    self.batch_cache_cfg,
+                    'calibration',
+                    max_batches=max_batches)
+            self._calibrate_dataloader = dataloader
+        return self._calibrate_dataloader
+
+    def _set_subnet(self, subnet: SupportRandomSubnet) -> None:
+        """Set ``subnet`` to the model with its recalibrated BN statistics
+        if any."""
+        self.model.set_subnet(subnet)
+        stats = self._bn_stats.get(str(subnet))
+        if stats is not None:
+            self.load_bn_statistics(stats)
+
     def gen_mutation_candidates(self):
         """Generate specified number of mutation candicates."""
+        if self.screener is not None:
+            mutation_candidates, mutation_resources = \
+                self._screen_candidates(self._batch_mutation,
+                                        self.num_mutation)
+            return self._build_candidates(mutation_candidates,
+                                          mutation_resources)
+
         mutation_resources = []
         mutation_candidates: List = []
         max_mutate_iters = self.num_mutation * 10
@@ -245,13 +510,17 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
                 mutation_candidates.append(mutation_candidate)
                 mutation_resources.append(result)
 
-        mutation_candidates = Candidates(mutation_candidates)
-        mutation_candidates.update_resources(mutation_resources)
-
-        return mutation_candidates
+        return self._build_candidates(mutation_candidates, mutation_resources)
 
     def gen_crossover_candidates(self):
         """Generate specofied number of crossover candicates."""
+        if self.screener is not None:
+            crossover_candidates, crossover_resources = \
+                self._screen_candidates(self._batch_crossover,
+                                        self.num_crossover)
+            return self._build_candidates(crossover_candidates,
+                                          crossover_resources)
+
         crossover_resources = []
         crossover_candidates: List = []
         crossover_iter = 0
@@ -269,31 +538,89 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
                 crossover_candidates.append(crossover_candidate)
                 crossover_resources.append(result)
 
-        crossover_candidates = Candidates(crossover_candidates)
-        crossover_candidates.update_resources(crossover_resources)
+        return self._build_candidates(crossover_candidates,
+                                      crossover_resources)
 
-        return crossover_candidates
+    def _build_candidates(self, subnets: List[SupportRandomSubnet],
+                          resources: List[Dict]) -> CandidatePool:
+        """Build a :class:`CandidatePool` of ``subnets`` with their
+        resources, which shares the search space of the top k candidates."""
+        candidates = CandidatePool(self.top_k_candidates.search_space)
+        candidates.extend(subnets)
+        candidates.update_resources(resources)
+        return candidates
+
+    def _random_top_k_subnet(self) -> SupportRandomSubnet:
+        """Randomly choose a subnet from the top k candidates."""
+        return self.top_k_candidates[random.randrange(
+            len(self.top_k_candidates))]
 
     def _mutation(self) -> SupportRandomSubnet:
         """Mutate with the specified mutate_prob."""
-        candidate1 = random.choice(self.top_k_candidates.subnets)
+        candidate1 = self._random_top_k_subnet()
         candidate2 = self.model.sample_subnet()
         candidate = crossover(candidate1, candidate2, prob=self.mutate_prob)
         return candidate
 
     def _crossover(self) -> SupportRandomSubnet:
         """Crossover."""
-        candidate1 = random.choice(self.top_k_candidates.subnets)
-        candidate2 = random.choice(self.top_k_candidates.subnets)
+        candidate1 = self._random_top_k_subnet()
+        candidate2 = self._random_top_k_subnet()
         candidate = crossover(candidate1, candidate2, prob=self.crossover_prob)
         return candidate
 
+    def _batch_mutation(self, num_samples: int) -> np.ndarray:
+        """Mutate a batch of encoded top k candidates with the specified
+        mutate_prob."""
+        top_k = self.screener.encode(self.top_k_candidates.subnets)
+        parents = top_k[np.random.randint(len(top_k), size=num_samples)]
+        return batch_crossover(
+            parents, self.screener.sample(num_samples), prob=self.mutate_prob)
+
+    def _batch_crossover(self, num_samples: int) -> np.ndarray:
+        """Crossover a batch of encoded top k candidates."""
+        top_k = self.screener.encode(self.top_k_candidates.subnets)
+        parents1 = top_k[np.random.randint(len(top_k), size=num_samples)]
+        parents2 = top_k[np.random.randint(len(top_k), size=num_samples)]
+        return batch_crossover(parents1, parents2, prob=self.crossover_prob)
+
+    def _screen_candidates(self, generate: Callable[[int], np.ndarray],
+                           num_candidates: int) -> Tuple[List, List]:
+        """Generate a batch of encoded candidates with ``generate`` and
+        screen them with the constraints in one call.
+
+        Args:
+            generate (Callable): Generate a given number of encoded
+                candidates.
+            num_candidates (int): The max number of passed candidates.
+
+        Returns:
+            Tuple[List, List]: The passed subnets and their resources.
+        """
+        if not self.screener.initialize:
+            self.screener.prepare(self.model)
+
+        matrix = generate(num_candidates * self.screener.oversample_ratio)
+        is_pass, results = self.screener.screen(matrix,
+                                                self.constraints_range)
+        indices = np.nonzero(is_pass)[0][:num_candidates]
+        subnets = self.screener.decode(matrix[indices])
+        resources = [
+            dict(
+                flops=float(results['flops'][i]),
+                params=float(results['params'][i]),
+                latency=0.) for i in indices
+        ]
+        return subnets, resources
+
     def _resume(self):
         """Resume searching."""
         if self.runner.rank == 0:
             searcher_resume = fileio.load(self.resume_from)
-            for k in searcher_resume.keys():
-                setattr(self, k, searcher_resume[k])
+            for k, v in searcher_resume.items():
+                if isinstance(v, Candidates):
+                    v = CandidatePool.from_candidates(v)
+                setattr(self, k, v)
             epoch_start = int(searcher_resume['_epoch'])
             self._max_epochs = self._max_epochs - epoch_start
             self.runner.logger.info('#' * 100)
@@ -303,7 +630,7 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
     def _save_best_fix_subnet(self):
         """Save best subnet in searched top-k candidates."""
         if self.runner.rank == 0:
-            best_random_subnet = self.top_k_candidates.subnets[0]
+            best_random_subnet = self.top_k_candidates[0]
             self.model.set_subnet(best_random_subnet)
             best_fix_subnet = export_fix_subnet(self.model)
             save_name = 'best_fix_subnet.yaml'
@@ -343,7 +670,7 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
             save_for_resume = dict()
             save_for_resume['_epoch'] = self._epoch
             for k in ['candidates', 'top_k_candidates']:
-                save_for_resume[k] = getattr(self, k)
+                save_for_resume[k] = getattr(self, k).to_candidates()
             fileio.dump(
                 save_for_resume,
                 osp.join(self.runner.work_dir,
@@ -390,6 +717,9 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
                                         f'{self.predictor.train_samples}')
                 train_samples = fileio.load(self.predictor.train_samples)
                 self.candidates = train_samples['subnets']
+                if isinstance(self.candidates, Candidates):
+                    self.candidates = CandidatePool.from_candidates(
+                        self.candidates)
             else:
                 self.runner.logger.info(
                     'Without specified samples. Start random sampling.')
@@ -414,4 +744,4 @@ class EvolutionSearchLoop(EpochBasedTrainLoop):
                 self.runner.logger.info(
                     f'Predictor pre-trained, saved in {predictor_dir}.')
             self.use_predictor = True
-            self.candidates = Candidates()
+            self.candidates = CandidatePool()
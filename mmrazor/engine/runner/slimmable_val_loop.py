@@ -7,10 +7,11 @@ from torch.utils.data import DataLoader
 
 from mmrazor.models.utils import add_prefix
 from mmrazor.registry import LOOPS
+from .utils import CalibrateBNMixin
 
 
 @LOOPS.register_module()
-class SlimmableValLoop(ValLoop):
+class SlimmableValLoop(ValLoop, CalibrateBNMixin):
     """Knowledge Distill loop for validation. It is not only validate student,
     but also validate teacher with the same dataloader.
 
@@ -21,14 +22,19 @@ class SlimmableValLoop(ValLoop):
         evaluator (Evaluator or dict or list): Used for computing metrics.
         fp16 (bool): Whether to enable fp16 validation. Defaults to
             False.
+        calibrate_sample_num (int): The number of train samples used to
+            recalibrate the BN statistics of all subnets in one pass before
+            validation. Recalibration is disabled if 0. Defaults to 0.
     """
 
     def __init__(self,
                  runner,
                  dataloader: Union[DataLoader, Dict],
                  evaluator: Union[Evaluator, Dict, List],
-                 fp16: bool = False) -> None:
+                 fp16: bool = False,
+                 calibrate_sample_num: int = 0) -> None:
         super().__init__(runner, dataloader, evaluator, fp16)
+        self.calibrate_sample_num = calibrate_sample_num
 
         if self.runner.distributed:
             model = self.runner.model.module
@@ -42,11 +48,20 @@ class SlimmableValLoop(ValLoop):
         """Launch validation."""
         self.runner.call_hook('before_val')
 
+        subnets = self._model.mutator.subnets
+        if self.calibrate_sample_num > 0:
+            bn_stats = self.recalibrate(subnets,
+                                        self.runner.train_dataloader,
+                                        self.calibrate_sample_num,
+                                        self._model.mutator.set_choices)
+
         all_metrics = dict()
-        for subnet_idx, subnet in enumerate(self._model.mutator.subnets):
+        for subnet_idx, subnet in enumerate(subnets):
             self.runner.call_hook('before_val_epoch')
             self.runner.model.eval()
             self._model.mutator.set_choices(subnet)
+            if self.calibrate_sample_num > 0:
+                self.load_bn_statistics(bn_stats[subnet_idx])
             for idx, data_batch in enumerate(self.dataloader):
                 self.run_iter(idx, data_batch)
             # compute student metrics
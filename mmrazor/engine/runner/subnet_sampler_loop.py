@@ -13,9 +13,11 @@ from mmengine.utils import is_list_of
 from torch.utils.data import DataLoader
 
 from mmrazor.registry import LOOPS, TASK_UTILS
-from mmrazor.structures import Candidates
+from mmrazor.structures import CandidatePool
 from mmrazor.utils import SupportRandomSubnet
-from .utils import check_subnet_resources
+from .utils import (SubnetEvalCache, build_cached_batch_loader,
+                    build_local_dataloader, check_subnet_resources,
+                    val_subnets_sharded)
 
 
 class BaseSamplerTrainLoop(IterBasedTrainLoop):
@@ -124,6 +126,21 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
             Defaults to 0.0.
         max_prob (float): The max probablity of the prob_schedule.
             Defaults to 0.8.
+        eval_cache_cfg (dict, Optional): Used for building a
+            :class:`SubnetEvalCache`. As the supernet is being trained, the
+            cached scores are only reused by the duplicated candidates in the
+            same round of updating scores. Defaults to None.
+        shard_candidates (bool): Whether to shard candidates across ranks,
+            that is, each rank validates a disjoint subset of candidates on
+            the whole val set and the scores are all-gathered.
+            Defaults to False.
+        num_shard_val_samples (int, optional): The number of samples of a
+            fixed random subset of the val set used when ``shard_candidates``
+            is True. If None, the whole val set is used. Defaults to None.
+        batch_cache_cfg (dict, Optional): If given, the val batches are
+            materialized once by :class:`CachedBatchLoader` built with it,
+            and replayed for every candidate instead of running the data
+            pipeline again. Defaults to None.
     """
 
     def __init__(self,
@@ -144,7 +161,11 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
                  schedule_start_iter: int = 10000,
                  schedule_end_iter: int = 144360,
                  init_prob: float = 0.,
-                 max_prob: float = 0.8) -> None:
+                 max_prob: float = 0.8,
+                 eval_cache_cfg: Optional[Dict] = None,
+                 shard_candidates: bool = False,
+                 num_shard_val_samples: Optional[int] = None,
+                 batch_cache_cfg: Optional[Dict] = None) -> None:
         super().__init__(runner, dataloader, max_iters, val_begin,
                          val_interval)
         if isinstance(dataloader_val, dict):
@@ -170,9 +191,19 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
         self.init_prob = init_prob
         self.max_prob = max_prob
         self.cur_prob: float = 0.
-
-        self.candidates = Candidates()
-        self.top_k_candidates = Candidates()
+        self.shard_candidates = shard_candidates
+        if self.shard_candidates:
+            self.shard_dataloader = build_local_dataloader(
+                self.dataloader_val, num_shard_val_samples)
+        if batch_cache_cfg is not None:
+            if self.shard_candidates:
+                self.shard_dataloader = build_cached_batch_loader(
+                    self.shard_dataloader, batch_cache_cfg, 'shard_val')
+            self.dataloader_val = build_cached_batch_loader(
+                self.dataloader_val, batch_cache_cfg, 'val')
+
+        self.candidates = CandidatePool()
+        self.top_k_candidates = CandidatePool()
 
         # initialize estimator
         estimator_cfg = dict() if estimator_cfg is None else estimator_cfg
@@ -180,6 +211,11 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
             estimator_cfg['type'] = 'mmrazor.ResourceEstimator'
         self.estimator = TASK_UTILS.build(estimator_cfg)
 
+        # initialize evaluation cache
+        self.eval_cache = None
+        if eval_cache_cfg is not None:
+            self.eval_cache = SubnetEvalCache(**eval_cache_cfg)
+
     def run(self) -> None:
         """Launch training."""
         self.runner.call_hook('before_train')
@@ -228,11 +264,8 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
 
             self.update_candidates_scores()
 
-            self.candidates.sort_by(key_indicator='score', reverse=True)
-            self.candidates = Candidates(
-                self.candidates.data[:self.num_candidates])
-            self.top_k_candidates = Candidates(
-                self.candidates.data[:self.top_k])
+            self.candidates = self.candidates.top_k(self.num_candidates)
+            self.top_k_candidates = self.candidates[:self.top_k]
 
             top1_score = self.top_k_candidates.scores[0]
             if (self._iter % self.val_interval) < self.top_k:
@@ -243,7 +276,7 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
                     f'{num_sample_from_supernet}/{self.num_samples} '
                     f'top1_score {top1_score:.3f} '
                     f'cur_num_candidates: {len(self.candidates)}')
-        return self.top_k_candidates.subnets[0]
+        return self.top_k_candidates[0]
 
     def update_cur_prob(self, cur_iter: int) -> None:
         """update current probablity of sampling from the candidates, which is
@@ -269,12 +302,12 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
                 raise ValueError('`prob_schedule` is eroor, it should be \
                     one of `linear` and `consine`.')
 
-    def get_candidates_with_sample(self,
-                                   num_samples: int) -> Tuple[Candidates, int]:
+    def get_candidates_with_sample(
+            self, num_samples: int) -> Tuple[CandidatePool, int]:
         """Get candidates with sampling from supernet and the candidates based
         on the current probablity."""
         num_sample_from_supernet = 0
-        sampled_candidates = Candidates()
+        sampled_candidates = CandidatePool(self.candidates.search_space)
         for _ in range(num_samples):
             if random.random() >= self.cur_prob or len(self.candidates) == 0:
                 subnet = self._sample_from_supernet()
@@ -289,11 +322,35 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
     def update_candidates_scores(self) -> None:
         """Update candidates' scores, which are validated with the
         `dataloader_val`."""
-        for i, candidate in enumerate(self.candidates.subnets):
-            self.model.set_subnet(candidate)
-            metrics = self._val_candidate()
+        subnets = self.candidates.subnets
+        if self.eval_cache is not None:
+            # the supernet weights are updated in each round.
+            self.eval_cache.model_id = f'{self.runner.timestamp}_{self._iter}'
+            cached_metrics = self.eval_cache.get_batch(subnets)
+        else:
+            cached_metrics = [None] * len(self.candidates)
+
+        if self.shard_candidates:
+            missing = [i for i, m in enumerate(cached_metrics) if m is None]
+            sharded_metrics = val_subnets_sharded(
+                self.runner.model, self.model, [subnets[i] for i in missing],
+                self.shard_dataloader, self.evaluator)
+            for i, metrics in zip(missing, sharded_metrics):
+                cached_metrics[i] = metrics
+                if self.eval_cache is not None:
+                    self.eval_cache.put(subnets[i], metrics)
+
+        for i, candidate in enumerate(subnets):
+            metrics = cached_metrics[i]
+            if metrics is None and self.eval_cache is not None:
+                metrics = self.eval_cache.get(candidate, use_disk=False)
+            if metrics is None:
+                self.model.set_subnet(candidate)
+                metrics = self._val_candidate()
+                if self.eval_cache is not None:
+                    self.eval_cache.put(candidate, metrics)
             score = metrics[self.score_key] if len(metrics) != 0 else 0.
-            self.candidates.set_resource(i, score, 'score')
+            self.candidates.set_score(i, score)
 
     @torch.no_grad()
     def _val_candidate(self) -> Dict:
@@ -313,7 +370,7 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
     def _sample_from_candidates(self) -> SupportRandomSubnet:
         """Sample from the candidates."""
         assert len(self.candidates) > 0
-        subnet = random.choice(self.candidates.data)
+        subnet = self.candidates[random.randrange(len(self.candidates))]
         return subnet
 
     def _check_constraints(self, random_subnet: SupportRandomSubnet):
@@ -331,8 +388,12 @@ class GreedySamplerTrainLoop(BaseSamplerTrainLoop):
         return is_pass, results
 
     def _save_candidates(self) -> None:
-        """Save the candidates to init the next searching."""
+        """Save the candidates to init the next searching.
+
+        The candidates are saved as :class:`Candidates`, which can be used as
+        ``init_candidates`` of :class:`EvolutionSearchLoop`.
+        """
         save_path = os.path.join(self.runner.work_dir, 'candidates.pkl')
-        fileio.dump(self.candidates, save_path)
+        fileio.dump(self.candidates.to_candidates(), save_path)
         self.runner.logger.info(f'candidates.pkl saved in '
                                 f'{self.runner.work_dir}')
@@ -1,5 +1,17 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from .cached_batch_loader import CachedBatchLoader, build_cached_batch_loader
+from .calibrate_bn_mixin import CalibrateBNMixin, get_bn_layers
 from .check import check_subnet_resources
-from .genetic import crossover
+from .distributed_eval import (build_local_dataloader, evaluate_locally,
+                               val_subnets_sharded)
+from .eval_cache import SubnetEvalCache, get_model_identity
+from .genetic import batch_crossover, crossover
+from .racing import val_subnets_racing
 
-__all__ = ['crossover', 'check_subnet_resources']
+__all__ = [
+    'crossover', 'batch_crossover', 'check_subnet_resources',
+    'SubnetEvalCache', 'get_model_identity', 'build_local_dataloader',
+    'evaluate_locally', 'val_subnets_sharded', 'val_subnets_racing',
+    'CalibrateBNMixin', 'get_bn_layers', 'CachedBatchLoader',
+    'build_cached_batch_loader'
+]
@@ -0,0 +1,163 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+from typing import Any, Callable, Iterator, List, Optional
+
+import numpy as np
+import torch
+from mmengine.dist import get_rank
+from mmengine.utils import mkdir_or_exist
+from torch import Tensor
+from torch.utils.data import DataLoader
+
+
+class _MemmapTensor:
+    """Placeholder of a tensor saved in a ``.npy`` file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> Tensor:
+        """Load the tensor from the memory-mapped file."""
+        array = np.load(self.path, mmap_mode='r')
+        return torch.from_numpy(np.array(array))
+
+
+def _map_tensors(data: Any, func: Callable) -> Any:
+    """Apply ``func`` to the tensors and placeholders in nested dicts, lists
+    and tuples."""
+    if isinstance(data, (Tensor, _MemmapTensor)):
+        return func(data)
+    if isinstance(data, dict):
+        return type(data)(
+            {k: _map_tensors(v, func)
+             for k, v in data.items()})  # type: ignore
+    if isinstance(data, (list, tuple)):
+        return type(data)(_map_tensors(v, func) for v in data)
+    return data
+
+
+class CachedBatchLoader:
+    """Dataloader materializing the batches of ``dataloader`` once and
+    replaying them in every iteration.
+
+    The data pipeline, e.g. decoding and augmentation, runs only in the first
+    iteration, so it suits validating or recalibrating many subnets with the
+    same batches. The inputs packed by the pipeline are usually uint8 and
+    normalized on device by the data preprocessor of the model, so the cached
+    batches are as compact as the packed inputs.
+
+    Note:
+        Random augmentations are frozen after the first iteration.
+
+    Args:
+        dataloader (DataLoader): The original dataloader.
+        max_batches (int, optional): If given, only the first
+            ``max_batches`` batches are cached and replayed. Defaults to None.
+        cache_dir (str, optional): If given, the tensors of the batches are
+            saved to ``.npy`` files in its subdirectory of the current rank
+            and memory-mapped when replayed, instead of being kept in RAM.
+            Defaults to None.
+        pin_memory (bool): Whether to pin the cached tensors in RAM, which
+            speeds up copying them to GPUs. Only used if CUDA is available
+            and ``cache_dir`` is None. Defaults to True.
+    """
+
+    def __init__(self,
+                 dataloader: DataLoader,
+                 max_batches: Optional[int] = None,
+                 cache_dir: Optional[str] = None,
+                 pin_memory: bool = True) -> None:
+        self.dataloader = dataloader
+        self.max_batches = max_batches
+        self.cache_dir = None if cache_dir is None else osp.join(
+            cache_dir, f'rank{get_rank()}')
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self._batches: Optional[List[Any]] = None
+
+    @property
+    def dataset(self):
+        """The dataset of the original dataloader."""
+        return self.dataloader.dataset
+
+    @property
+    def batch_size(self) -> Optional[int]:
+        """The batch size of the original dataloader."""
+        return self.dataloader.batch_size
+
+    @property
+    def is_cached(self) -> bool:
+        """bool: Whether the batches have been materialized."""
+        return self._batches is not None
+
+    def __len__(self) -> int:
+        if self._batches is not None:
+            return len(self._batches)
+        num_batches = len(self.dataloader)
+        if self.max_batches is not None:
+            num_batches = min(num_batches, self.max_batches)
+        return num_batches
+
+    def __iter__(self) -> Iterator:
+        if self._batches is None:
+            self._batches = self._materialize()
+        for batch in self._batches:
+            if self.cache_dir is not None:
+                batch = _map_tensors(batch, lambda t: t.load())
+            yield batch
+
+    def _materialize(self) -> List[Any]:
+        """Run the original dataloader and cache its batches."""
+        if self.cache_dir is not None:
+            mkdir_or_exist(self.cache_dir)
+        batches = []
+        for batch_idx, batch in enumerate(self.dataloader):
+            if self.max_batches is not None and \
+                    batch_idx >= self.max_batches:
+                break
+            if self.cache_dir is not None:
+                batch = self._save_batch(batch, batch_idx)
+            elif self.pin_memory:
+                batch = _map_tensors(batch, lambda t: t.pin_memory())
+            batches.append(batch)
+        return batches
+
+    def _save_batch(self, batch: Any, batch_idx: int) -> Any:
+        """Save the tensors of ``batch`` and replace them with
+        placeholders."""
+        tensor_idx = 0
+
+        def save(tensor: Tensor) -> _MemmapTensor:
+            nonlocal tensor_idx
+            path = osp.join(self.cache_dir,
+                            f'batch{batch_idx}.{tensor_idx}.npy')
+            tensor_idx += 1
+            np.save(path, tensor.cpu().numpy())
+            return _MemmapTensor(path)
+
+        return _map_tensors(batch, save)
+
+    def clear(self) -> None:
+        """Drop the cached batches, which are materialized again in the next
+        iteration."""
+        if self._batches is not None and self.cache_dir is not None:
+            for batch in self._batches:
+                _map_tensors(batch, lambda t: os.remove(t.path))
+        self._batches = None
+
+
+def build_cached_batch_loader(dataloader: DataLoader, batch_cache_cfg: dict,
+                              name: str, **kwargs) -> CachedBatchLoader:
+    """Build a :class:`CachedBatchLoader` of ``dataloader``.
+
+    Args:
+        dataloader (DataLoader): The original dataloader.
+        batch_cache_cfg (dict): The kwargs of :class:`CachedBatchLoader`.
+        name (str): The name of the subdirectory of ``cache_dir`` if given,
+            so that loaders sharing a config don't overwrite each other.
+        **kwargs: Overrides of ``batch_cache_cfg``.
+    """
+    cfg = dict(batch_cache_cfg, **kwargs)
+    if cfg.get('cache_dir') is not None:
+        cfg['cache_dir'] = osp.join(cfg['cache_dir'], name)
+    return CachedBatchLoader(dataloader, **cfg)
@@ -0,0 +1,158 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import math
+from typing import Any, Callable, List, Optional, Sequence
+
+import torch
+from mmengine.dist import all_reduce, get_dist_info
+from mmengine.model import is_model_wrapper
+from mmengine.runner import autocast
+from torch import Tensor, nn
+from torch.nn.modules.batchnorm import _BatchNorm
+from torch.utils.data import DataLoader
+
+from mmrazor.utils import SupportRandomSubnet
+
+
+def get_bn_layers(model: nn.Module) -> List[_BatchNorm]:
+    """Get the BN layers tracking running stats in ``model``."""
+    if is_model_wrapper(model):
+        model = model.module
+    return [
+        m for m in model.modules()
+        if isinstance(m, _BatchNorm) and m.track_running_stats
+    ]
+
+
+def _get_batch_size(data_batch: Any) -> int:
+    """Get the number of samples in ``data_batch`` from a dataloader."""
+    if isinstance(data_batch, Tensor):
+        return data_batch.size(0)
+    if isinstance(data_batch, dict):
+        return _get_batch_size(data_batch['inputs'])
+    return len(data_batch)
+
+
+class CalibrateBNMixin:
+    """Mixin of loops recalibrating the BN statistics of subnets before
+    validating them.
+
+    The statistics of several subnets are recalibrated in one pass over the
+    calibration batches, i.e. each batch is loaded once and forwarded by every
+    subnet. The exact mean and variance of all samples are computed from the
+    per-batch statistics, and the statistics of all subnets in all ranks are
+    kept in one flat buffer, which is synced with a single all-reduce.
+
+    The loop should have ``runner`` and optionally ``fp16``.
+    """
+
+    @torch.no_grad()
+    def recalibrate(self,
+                    subnets: Sequence[Optional[SupportRandomSubnet]],
+                    dataloader: DataLoader,
+                    calibrate_sample_num: int = 2000,
+                    set_subnet: Optional[Callable] = None) -> List[Tensor]:
+        """Recalibrate the BN statistics of ``subnets``.
+
+        The BN statistics of the model are restored after recalibration, use
+        :meth:`load_bn_statistics` to load the returned ones.
+
+        Args:
+            subnets (Sequence): The subnets to be recalibrated.
+            dataloader (DataLoader): The dataloader of calibration data,
+                usually the train dataloader.
+            calibrate_sample_num (int): The number of calibration samples
+                in all ranks. Defaults to 2000.
+            set_subnet (Callable, optional): The function setting a subnet to
+                the model. If None, subnets are ignored, which is used to
+                recalibrate the model itself. Defaults to None.
+
+        Returns:
+            List[Tensor]: The flattened running means and running vars of all
+            BN layers for each subnet.
+        """
+        model = self.runner.model  # type: ignore
+        bn_layers = get_bn_layers(model)
+        if len(bn_layers) == 0:
+            self.runner.logger.warning(  # type: ignore
+                'No BN found in model, skip recalibration.')
+            return [torch.zeros(0) for _ in subnets]
+        states = [(bn.running_mean.clone(), bn.running_var.clone(),
+                   bn.num_batches_tracked.clone(), bn.momentum)
+                  for bn in bn_layers]
+        num_features = sum(bn.num_features for bn in bn_layers)
+        # Each row holds the sums of batch means, batch vars and squared batch
+        # means weighted by batch sizes, and the number of samples.
+        buffer = torch.zeros(
+            len(subnets),
+            3 * num_features + 1,
+            dtype=torch.float64,
+            device=bn_layers[0].running_mean.device)
+
+        _, world_size = get_dist_info()
+        num_local_samples = math.ceil(calibrate_sample_num / world_size)
+        self.runner.logger.info(  # type: ignore
+            f'Recalibrating {len(bn_layers)} BN layers of {len(subnets)} '
+            f'subnets with {calibrate_sample_num} samples...')
+
+        model.train()
+        for bn in bn_layers:
+            # the running stats are the stats of the current batch.
+            bn.momentum = 1.
+        num_seen_samples = 0
+        fp16 = getattr(self, 'fp16', False)
+        for data_batch in dataloader:
+            batch_size = _get_batch_size(data_batch)
+            for i, subnet in enumerate(subnets):
+                if set_subnet is not None:
+                    set_subnet(subnet)
+                with autocast(enabled=fp16):
+                    model.test_step(data_batch)
+                mean = torch.cat([bn.running_mean for bn in bn_layers])
+                var = torch.cat([bn.running_var for bn in bn_layers])
+                stats = torch.cat([mean, var, mean.square()])
+                buffer[i, :-1] += stats.double() * batch_size
+                buffer[i, -1] += batch_size
+            num_seen_samples += batch_size
+            if num_seen_samples >= num_local_samples:
+                break
+        all_reduce(buffer)
+
+        for bn, (mean, var, num_batches_tracked, momentum) in zip(
+                bn_layers, states):
+            bn.running_mean.copy_(mean)
+            bn.running_var.copy_(var)
+            bn.num_batches_tracked.copy_(num_batches_tracked)
+            bn.momentum = momentum
+
+        buffer = buffer[:, :-1] / buffer[:, -1:].clamp(min=1)
+        mean, var, mean_square = buffer.split(num_features, dim=1)
+        # law of total variance over batches.
+        var = var + mean_square - mean.square()
+        all_stats = torch.cat([mean, var], dim=1).float()
+        return list(all_stats.unbind(0))
+
+    @torch.no_grad()
+    def load_bn_statistics(self, stats: Tensor) -> None:
+        """Load the BN statistics returned by :meth:`recalibrate`."""
+        bn_layers = get_bn_layers(self.runner.model)  # type: ignore
+        if len(bn_layers) == 0:
+            return
+        num_features = [bn.num_features for bn in bn_layers]
+        means, variances = stats.split(sum(num_features))
+        for bn, mean, var in zip(bn_layers, means.split(num_features),
+                                 variances.split(num_features)):
+            bn.running_mean.copy_(mean)
+            bn.running_var.copy_(var)
+
+    def calibrate_bn_statistics(self,
+                                dataloader: DataLoader,
+                                calibrate_sample_num: int = 2000) -> None:
+        """Recalibrate the BN statistics of the current model in place.
+
+        Args:
+            dataloader (DataLoader): The dataloader of calibration data.
+            calibrate_sample_num (int): The number of calibration samples
+                in all ranks. Defaults to 2000.
+        """
+        stats = self.recalibrate([None], dataloader, calibrate_sample_num)
+        self.load_bn_statistics(stats[0])
@@ -1,11 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-import copy
 from typing import Any, Dict, Tuple
 
 import torch
 
 from mmrazor.models import ResourceEstimator
-from mmrazor.structures import export_fix_subnet, load_fix_subnet
 from mmrazor.utils import SupportRandomSubnet
 
 try:
@@ -24,6 +22,18 @@ def check_subnet_resources(
 ) -> Tuple[bool, Dict]:
     """Check whether is beyond resources constraints.
 
+    The resources are estimated in place on the dynamic supernet with the
+    given ``subnet`` activated, so neither the supernet nor the exported
+    static subnet is copied.
+
+    Args:
+        model (nn.Module): The supernet algorithm with ``set_subnet`` and
+            ``architecture``.
+        subnet (SupportRandomSubnet): The subnet to be checked.
+        estimator (ResourceEstimator): The resource estimator.
+        constraints_range (Dict[str, Any]): Constraints to be used for
+            screening the subnet. Defaults to dict(flops=(0, 330)).
+
     Returns:
         bool, result: The result of checking.
     """
@@ -32,9 +42,6 @@ def check_subnet_resources(
 
     assert hasattr(model, 'set_subnet') and hasattr(model, 'architecture')
     model.set_subnet(subnet)
-    fix_mutable = export_fix_subnet(model)
-    copied_model = copy.deepcopy(model)
-    load_fix_subnet(copied_model, fix_mutable)
 
     model_to_check = model.architecture
     if isinstance(model_to_check, BaseDetector):
@@ -0,0 +1,113 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Dict, List, Optional
+
+import torch
+import torch.nn as nn
+from mmengine.dist import all_gather_object, get_dist_info
+from mmengine.evaluator import Evaluator
+from torch.utils.data import DataLoader
+
+from mmrazor.utils import SupportRandomSubnet
+
+
+def build_local_dataloader(dataloader: DataLoader,
+                           num_samples: Optional[int] = None,
+                           seed: int = 0) -> DataLoader:
+    """Build a dataloader iterating the whole dataset of ``dataloader`` in
+    each rank, instead of a shard of it.
+
+    Args:
+        dataloader (DataLoader): The original dataloader.
+        num_samples (int, optional): If given, a fixed random subset with
+            ``num_samples`` samples is used. Defaults to None.
+        seed (int): The seed of sampling the subset, which should be the same
+            in all ranks. Defaults to 0.
+    """
+    dataset = dataloader.dataset
+    indices = list(range(len(dataset)))  # type: ignore
+    if num_samples is not None and num_samples < len(indices):
+        generator = torch.Generator()
+        generator.manual_seed(seed)
+        indices = torch.randperm(
+            len(indices), generator=generator)[:num_samples].tolist()
+        indices.sort()
+
+    return DataLoader(
+        dataset,
+        batch_size=dataloader.batch_size,
+        sampler=indices,  # type: ignore
+        num_workers=dataloader.num_workers,
+        collate_fn=dataloader.collate_fn,
+        pin_memory=dataloader.pin_memory)
+
+
+def evaluate_locally(evaluator: Evaluator,
+                     results_list: Optional[List[List]] = None) -> Dict:
+    """Compute the metrics with the results processed in the current rank,
+    without collecting results from other ranks.
+
+    Args:
+        evaluator (Evaluator): Used for computing metrics.
+        results_list (List[List], optional): The results of each metric. If
+            None, the processed results of metrics are used and cleared.
+            Defaults to None.
+    """
+    metrics = dict()
+    for i, metric in enumerate(evaluator.metrics):
+        if results_list is None:
+            results = metric.compute_metrics(metric.results)
+            metric.results.clear()
+        else:
+            results = metric.compute_metrics(results_list[i])
+        if metric.prefix:
+            results = {'/'.join((metric.prefix, k)): v
+                       for k, v in results.items()}
+        metrics.update(results)
+    return metrics
+
+
+@torch.no_grad()
+def val_subnets_sharded(model: nn.Module, algorithm: nn.Module,
+                        subnets: List[SupportRandomSubnet],
+                        dataloader: DataLoader,
+                        evaluator: Evaluator) -> List[Dict]:
+    """Validate subnets sharded across ranks.
+
+    Each rank validates a disjoint subset of ``subnets`` on the whole
+    ``dataloader`` (see :func:`build_local_dataloader`), then the metrics are
+    all-gathered, so N ranks work as N independent evaluators. Duplicated
+    subnets are validated only once.
+
+    Args:
+        model (nn.Module): The model with ``val_step``, which may be wrapped.
+        algorithm (nn.Module): The unwrapped model with ``set_subnet``.
+        subnets (List[SupportRandomSubnet]): The subnets to be validated,
+            which should be the same in all ranks.
+        dataloader (DataLoader): The dataloader of the whole val set.
+        evaluator (Evaluator): Used for computing metrics.
+
+    Returns:
+        List[Dict]: The metrics of each subnet.
+    """
+    unique_ids: Dict[str, int] = dict()
+    for subnet in subnets:
+        unique_ids.setdefault(str(subnet), len(unique_ids))
+    unique_subnets = list(
+        {str(subnet): subnet
+         for subnet in subnets}.values())
+
+    rank, world_size = get_dist_info()
+    model.eval()
+    local_results = []
+    for i in range(rank, len(unique_subnets), world_size):
+        algorithm.set_subnet(unique_subnets[i])
+        for data_batch in dataloader:
+            outputs = model.val_step(data_batch)
+            evaluator.process(data_samples=outputs, data_batch=data_batch)
+        local_results.append((i, evaluate_locally(evaluator)))
+
+    unique_metrics: List[Dict] = [dict() for _ in unique_subnets]
+    for results in all_gather_object(local_results):
+        for i, metrics in results:
+            unique_metrics[i] = metrics
+    return [unique_metrics[unique_ids[str(subnet)]] for subnet in subnets]
@@ -0,0 +1,146 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import hashlib
+import json
+import os
+import os.path as osp
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import torch
+import torch.nn as nn
+from mmengine import fileio
+from mmengine.dist import broadcast_object_list, get_rank
+
+from mmrazor.utils import SupportRandomSubnet
+
+
+def get_model_identity(model: nn.Module) -> str:
+    """Get the identity of the weights of ``model``, which is the sha1 of its
+    state dict."""
+    sha1 = hashlib.sha1()
+    for name, tensor in model.state_dict().items():
+        sha1.update(name.encode())
+        if isinstance(tensor, torch.Tensor):
+            tensor = tensor.detach().cpu().contiguous().reshape(-1)
+            sha1.update(str(tensor.dtype).encode())
+            sha1.update(tensor.view(torch.uint8).numpy().tobytes())
+    return sha1.hexdigest()
+
+
+class SubnetEvalCache:
+    """Cache of the evaluation results of subnets.
+
+    The results are keyed by the canonical hash of the subnet and the
+    identity of the supernet weights. It has an in-memory LRU tier and an
+    optional on-disk tier, in which each result is dumped to
+    ``{cache_dir}/{key}.json``, so that the results could be reused by
+    resumed searches.
+
+    Note:
+        In distributed mode, the hit or miss of a batch of subnets is
+        decided by rank 0 in :meth:`get_batch` and broadcasted, and only rank
+        0 writes the on-disk tier, so that all the ranks validate the same
+        subnets.
+
+    Args:
+        cache_dir (str, optional): The directory of the on-disk tier. If
+            None, only the in-memory tier is used. Defaults to None.
+        max_size (int): The max size of the in-memory tier. Defaults to 4096.
+        model_id (str): The identity of the supernet weights.
+            Defaults to ''.
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 max_size: int = 4096,
+                 model_id: str = '') -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.model_id = model_id
+        self._memory: OrderedDict = OrderedDict()
+        self.num_hits = 0
+        self.num_misses = 0
+
+        if self.cache_dir is not None and get_rank() == 0:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_subnet(subnet: SupportRandomSubnet) -> str:
+        """Get the canonical hash of ``subnet``, which is independent of the
+        order of its keys."""
+        canonical = json.dumps({str(k): v
+                                for k, v in subnet.items()},
+                               sort_keys=True,
+                               default=str)
+        return hashlib.sha1(canonical.encode()).hexdigest()
+
+    def get_key(self, subnet: SupportRandomSubnet) -> str:
+        """Get the cache key of ``subnet`` with the current ``model_id``."""
+        return hashlib.sha1(
+            (self.model_id + self.hash_subnet(subnet)).encode()).hexdigest()
+
+    def get(self,
+            subnet: SupportRandomSubnet,
+            use_disk: bool = True) -> Optional[Dict]:
+        """Get the cached metrics of ``subnet``, return None if missing."""
+        key = self.get_key(subnet)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if use_disk:
+            metrics = self._load_disk(key)
+            if metrics is not None:
+                self._put_memory(key, metrics)
+            return metrics
+        return None
+
+    def get_batch(self, subnets: List[SupportRandomSubnet]) -> List:
+        """Get the cached metrics of ``subnets``, which are the same in all
+        ranks."""
+        metrics_list = [self.get(subnet, use_disk=False) for subnet in subnets]
+        disk_metrics_list: List[Optional[Dict]] = [None] * len(subnets)
+        if self.cache_dir is not None:
+            if get_rank() == 0:
+                disk_metrics_list = [
+                    self._load_disk(self.get_key(subnet))
+                    if metrics is None else None
+                    for subnet, metrics in zip(subnets, metrics_list)
+                ]
+            broadcast_object_list(disk_metrics_list)
+
+        for i, metrics in enumerate(disk_metrics_list):
+            if metrics is not None:
+                self._put_memory(self.get_key(subnets[i]), metrics)
+                metrics_list[i] = metrics
+        num_hits = sum(metrics is not None for metrics in metrics_list)
+        self.num_hits += num_hits
+        self.num_misses += len(subnets) - num_hits
+        return metrics_list
+
+    def put(self, subnet: SupportRandomSubnet, metrics: Dict) -> None:
+        """Cache the metrics of ``subnet``."""
+        metrics = {
+            k: v.item() if hasattr(v, 'item') else v
+            for k, v in metrics.items()
+        }
+        key = self.get_key(subnet)
+        self._put_memory(key, metrics)
+        if self.cache_dir is not None and get_rank() == 0:
+            fileio.dump(metrics, osp.join(self.cache_dir, f'{key}.json'))
+
+    def _load_disk(self, key: str) -> Optional[Dict]:
+        """Load from the on-disk tier, return None if missing."""
+        if self.cache_dir is None:
+            return None
+        path = osp.join(self.cache_dir, f'{key}.json')
+        return fileio.load(path) if osp.isfile(path) else None
+
+    def _put_memory(self, key: str, metrics: Dict) -> None:
+        """Put to the in-memory tier and evict the least recently used."""
+        self._memory[key] = metrics
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._memory)
@@ -29,3 +29,24 @@ def crossover(random_subnet1: SingleMutatorRandomSubnet,
         if np.random.random_sample() < prob:
             crossover_subnet[group_id] = choice
     return crossover_subnet
+
+
+def batch_crossover(matrix1: np.ndarray,
+                    matrix2: np.ndarray,
+                    prob: float = 0.5) -> np.ndarray:
+    """Crossover a batch of encoded subnets in genetic algorithm.
+
+    Args:
+        matrix1 (np.ndarray): ``N x D`` matrix of encoded subnets.
+        matrix2 (np.ndarray): ``N x D`` matrix of encoded subnets.
+        prob (float): The probablity of getting choice from `matrix2`.
+            Defaults to 0.5.
+
+    Returns:
+        np.ndarray: The ``N x D`` matrix of crossover results.
+    """
+    assert prob >= 0. and prob <= 1.,  \
+        'The probability of crossover has to be between 0 and 1'
+    assert matrix1.shape == matrix2.shape
+    return np.where(
+        np.random.random_sample(matrix1.shape) < prob, matrix2, matrix1)
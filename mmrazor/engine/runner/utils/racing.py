@@ -0,0 +1,119 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+from mmengine.dist import all_gather_object
+from mmengine.evaluator import Evaluator
+from torch.utils.data import DataLoader
+
+from mmrazor.utils import SupportRandomSubnet
+from .distributed_eval import evaluate_locally
+
+
+@torch.no_grad()
+def val_subnets_racing(
+        model: nn.Module,
+        algorithm: nn.Module,
+        subnets: List[SupportRandomSubnet],
+        dataloader: DataLoader,
+        evaluator: Evaluator,
+        score_key: str,
+        top_k: int,
+        ref_scores: Sequence[float] = (),
+        num_init_batches: int = 4,
+        confidence: float = 1.96) -> Tuple[List[Dict], List[bool], int]:
+    """Validate subnets with racing, which is an early-stopping partial
+    validation in successive halving style.
+
+    The val set is iterated only once, and each batch is validated by all
+    the surviving subnets. After ``num_init_batches``, and every time the
+    number of validated batches is doubled, the mean and the confidence
+    interval of the score of each subnet are estimated by its per-batch
+    scores. The subnets whose upper confidence bound is below the current
+    k-th best score are dropped, so that the remaining batches are only spent
+    on the contenders.
+
+    Args:
+        model (nn.Module): The model with ``val_step``, which may be wrapped.
+        algorithm (nn.Module): The unwrapped model with ``set_subnet``.
+        subnets (List[SupportRandomSubnet]): The subnets to be validated.
+        dataloader (DataLoader): The val dataloader.
+        evaluator (Evaluator): Used for computing metrics.
+        score_key (str): The metric to score subnets.
+        top_k (int): The number of subnets to be kept.
+        ref_scores (Sequence[float]): The scores of the subnets validated
+            before, e.g. the current top k candidates. Defaults to ().
+        num_init_batches (int): The number of batches validated by all the
+            subnets. Defaults to 4.
+        confidence (float): The multiplier of the standard error to get the
+            confidence interval. Defaults to 1.96.
+
+    Returns:
+        Tuple[List[Dict], List[bool], int]: The metrics of each subnet,
+            whether each subnet is validated on the whole val set, and the
+            number of batches saved in the current rank. The metrics of the
+            dropped subnets only contain the estimated ``score_key``.
+    """
+    num_batches = len(dataloader)
+    checkpoints = set()
+    num_checkpoint_batches = num_init_batches
+    while num_checkpoint_batches < num_batches:
+        checkpoints.add(num_checkpoint_batches)
+        num_checkpoint_batches *= 2
+
+    results = [[list() for _ in evaluator.metrics] for _ in subnets]
+    batch_scores: List[List[float]] = [list() for _ in subnets]
+    all_metrics: List[Dict] = [dict() for _ in subnets]
+    is_full = [True] * len(subnets)
+    alive = list(range(len(subnets)))
+    num_saved_batches = 0
+
+    model.eval()
+    for batch_idx, data_batch in enumerate(dataloader):
+        for i in alive:
+            algorithm.set_subnet(subnets[i])
+            outputs = model.val_step(data_batch)
+            starts = [len(r) for r in results[i]]
+            for metric, metric_results in zip(evaluator.metrics, results[i]):
+                metric.results = metric_results
+            evaluator.process(data_samples=outputs, data_batch=data_batch)
+            batch_metrics = evaluate_locally(
+                evaluator, [r[s:] for r, s in zip(results[i], starts)])
+            batch_scores[i].append(float(batch_metrics[score_key]))
+
+        if batch_idx + 1 not in checkpoints or len(alive) == 0:
+            continue
+
+        # all ranks make the same decision with the gathered scores.
+        gathered_scores = all_gather_object([batch_scores[i] for i in alive])
+        means, uppers = dict(), dict()
+        for j, i in enumerate(alive):
+            scores = np.array(sum([g[j] for g in gathered_scores], []))
+            std = scores.std(ddof=1) if len(scores) > 1 else 0.
+            means[i] = scores.mean()
+            uppers[i] = means[i] + confidence * std / math.sqrt(len(scores))
+
+        estimates = sorted(
+            list(means.values()) + list(ref_scores), reverse=True)
+        if len(estimates) <= top_k:
+            continue
+        kth_score = estimates[top_k - 1]
+        for i in list(alive):
+            if uppers[i] < kth_score:
+                alive.remove(i)
+                all_metrics[i] = {score_key: float(means[i])}
+                is_full[i] = False
+                results[i] = list()
+                num_saved_batches += num_batches - batch_idx - 1
+
+    for i in alive:
+        for metric, metric_results in zip(evaluator.metrics, results[i]):
+            metric.results = metric_results
+        all_metrics[i] = evaluator.evaluate(len(dataloader.dataset))
+    for metric in evaluator.metrics:
+        metric.results = list()
+
+    return all_metrics, is_full, num_saved_batches
@@ -1,8 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .base import BaseAlgorithm
 from .distill import (DAFLDataFreeDistillation, DataFreeDistillation,
-                      FpnTeacherDistill, OverhaulFeatureDistillation,
-                      SelfDistill, SingleTeacherDistill)
+                      FpnTeacherDistill, MultiTeacherDistill,
+                      OverhaulFeatureDistillation, SelfDistill,
+                      SingleTeacherDistill)
 from .nas import (DSNAS, DSNASDDP, SPOS, Autoformer, AutoSlim, AutoSlimDDP,
                   Darts, DartsDDP)
 from .pruning import DCFF, SlimmableNetwork, SlimmableNetworkDDP, DMCP, DMCPDDP
@@ -30,4 +31,5 @@ __all__ = [
     'DSNAS',
     'DSNASDDP',
     'Autoformer',
+    'MultiTeacherDistill',
 ]
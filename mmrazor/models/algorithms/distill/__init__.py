@@ -1,10 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .configurable import (DAFLDataFreeDistillation, DataFreeDistillation,
-                           FpnTeacherDistill, OverhaulFeatureDistillation,
-                           SelfDistill, SingleTeacherDistill)
+                           FpnTeacherDistill, MultiTeacherDistill,
+                           OverhaulFeatureDistillation, SelfDistill,
+                           SingleTeacherDistill)
 
 __all__ = [
     'SingleTeacherDistill', 'FpnTeacherDistill', 'SelfDistill',
     'DataFreeDistillation', 'DAFLDataFreeDistillation',
-    'OverhaulFeatureDistillation'
+    'OverhaulFeatureDistillation', 'MultiTeacherDistill'
 ]
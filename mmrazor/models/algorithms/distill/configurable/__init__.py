@@ -2,6 +2,7 @@
 from .datafree_distillation import (DAFLDataFreeDistillation,
                                     DataFreeDistillation)
 from .fpn_teacher_distill import FpnTeacherDistill
+from .multi_teacher_distill import MultiTeacherDistill
 from .overhaul_feature_distillation import OverhaulFeatureDistillation
 from .self_distill import SelfDistill
 from .single_teacher_distill import SingleTeacherDistill
@@ -9,5 +10,5 @@ from .single_teacher_distill import SingleTeacherDistill
 __all__ = [
     'SelfDistill', 'SingleTeacherDistill', 'FpnTeacherDistill',
     'DataFreeDistillation', 'DAFLDataFreeDistillation',
-    'OverhaulFeatureDistillation'
+    'OverhaulFeatureDistillation', 'MultiTeacherDistill'
 ]
@@ -27,26 +27,32 @@ class FpnTeacherDistill(SingleTeacherDistill):
         """Calculate losses from a batch of inputs and data samples."""
 
         losses = dict()
-        # If the `override_data` of a delivery is False, the delivery will
-        # record the origin data.
-        self.distiller.set_deliveries_override(False)
-        if self.teacher_trainable:
+        # The outputs of modules shared by the teacher and the student are
+        # reused in the student pass if `share_forward` of the distiller is
+        # True.
+        with self.distiller.shared_forward:
+            # If the `override_data` of a delivery is False, the delivery
+            # will record the origin data.
+            self.distiller.set_deliveries_override(False)
             # Unlike ``SingleTeacherDistill``, teacher will only execute
             # back + neck, not head, so there will be no loss.
-            with self.distiller.teacher_recorders, self.distiller.deliveries:
-                _ = self.teacher.extract_feat(batch_inputs)
-        else:
-            with self.distiller.teacher_recorders, self.distiller.deliveries:
-                with torch.no_grad():
-                    _ = self.teacher(batch_inputs, data_samples, mode='loss')
-
-        # If the `override_data` of a delivery is True, the delivery will
-        # override the origin data with the recorded data.
-        self.distiller.set_deliveries_override(True)
-        with self.distiller.student_recorders, self.distiller.deliveries:
-            student_losses = self.student(
-                batch_inputs, data_samples, mode='loss')
-        losses.update(add_prefix(student_losses, 'student'))
+            if self.teacher_trainable:
+                with self.distiller.teacher_recorders, \
+                        self.distiller.deliveries:
+                    _ = self.teacher.extract_feat(batch_inputs)
+            else:
+                with self.distiller.teacher_recorders, \
+                        self.distiller.deliveries:
+                    with torch.no_grad():
+                        _ = self.teacher.extract_feat(batch_inputs)
+
+            # If the `override_data` of a delivery is True, the delivery will
+            # override the origin data with the recorded data.
+            self.distiller.set_deliveries_override(True)
+            with self.distiller.student_recorders, self.distiller.deliveries:
+                student_losses = self.student(
+                    batch_inputs, data_samples, mode='loss')
+            losses.update(add_prefix(student_losses, 'student'))
 
         # Automatically compute distill losses based on `loss_forward_mappings`
         # The required data already exists in the recorders.
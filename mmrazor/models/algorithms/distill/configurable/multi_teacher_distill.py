@@ -0,0 +1,269 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Union
+
+import torch
+from mmengine.model import BaseModel
+from mmengine.runner import load_checkpoint
+from mmengine.structures import BaseDataElement
+from torch import nn
+from torch.nn.modules.batchnorm import _BatchNorm
+
+from mmrazor.models.utils import add_prefix
+from mmrazor.registry import MODELS
+from ...base import BaseAlgorithm, LossResults
+
+
+@MODELS.register_module()
+class MultiTeacherDistill(BaseAlgorithm):
+    """``MultiTeacherDistill`` distills a student with several frozen
+    teachers, of which only a subset may run in each step.
+
+    The teachers are kept in ``self.teachers``, an ``nn.ModuleDict`` which is
+    passed to ``prepare_from_teacher`` of the distiller, so the sources of
+    teacher recorders start with the names of the teachers, e.g.
+    ``'teacher1.neck.gap'``. A distill loss using the records of some
+    teachers is only computed in the steps all of them run.
+
+    Note:
+        With ``num_active_teachers`` less than the number of teachers, the
+        parameters of connectors used by inactive teachers don't get grads in
+        a step, so ``find_unused_parameters=True`` is required with DDP.
+
+    Args:
+        distiller (dict): The config dict for built distiller.
+        teachers (Dict[str, dict | BaseModel]): The config dicts or built
+            models of teachers, keyed by teacher names.
+        teacher_ckpts (Dict[str, str], optional): The paths of checkpoints
+            keyed by teacher names. Defaults to None.
+        teacher_norm_eval (bool): Whether to set teachers' norm layers to eval
+            mode, namely, freeze running stats (mean and var). Note: Effect on
+            Batch Norm and its variants only. Defaults to True.
+        num_active_teachers (int, optional): The number of teachers running in
+            each step. If None, all teachers run. Defaults to None.
+        teacher_sampler (str): How to choose the active teachers in each
+            step, 'round_robin' or 'random'. Defaults to 'round_robin'.
+        rescale_losses (bool): Whether to divide the distill losses of
+            teachers by the frequency that the teachers are all active, so
+            that their expectation equals the losses with all teachers. The
+            frequency is counted over a cycle of the schedule with
+            'round_robin', and is the probability over random subsets with
+            'random'. Defaults to True.
+        parallel_teachers (bool): Whether to run the active teachers
+            concurrently, on separate CUDA streams for inputs on GPUs or in a
+            thread pool for inputs on CPU. Defaults to False.
+        calculate_student_loss (bool): Whether to calculate student loss
+            (original task loss) to update student model. Defaults to True.
+    """
+
+    def __init__(self,
+                 distiller: dict,
+                 teachers: Dict[str, Union[BaseModel, Dict]],
+                 teacher_ckpts: Optional[Dict[str, str]] = None,
+                 teacher_norm_eval: bool = True,
+                 num_active_teachers: Optional[int] = None,
+                 teacher_sampler: str = 'round_robin',
+                 rescale_losses: bool = True,
+                 parallel_teachers: bool = False,
+                 calculate_student_loss: bool = True,
+                 **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.distiller = MODELS.build(distiller)
+
+        self.teachers = nn.ModuleDict()
+        for name, teacher in teachers.items():
+            if isinstance(teacher, Dict):
+                teacher = MODELS.build(teacher)
+            if not isinstance(teacher, BaseModel):
+                raise TypeError('teacher should be a `dict` or '
+                                f'`BaseModel` instance, but got '
+                                f'{type(teacher)}')
+            self.teachers[name] = teacher
+        teacher_ckpts = dict() if teacher_ckpts is None else teacher_ckpts
+        for name, teacher_ckpt in teacher_ckpts.items():
+            # avoid loaded parameters be overwritten
+            self.teachers[name].init_weights()
+            _ = load_checkpoint(self.teachers[name], teacher_ckpt)
+        self.teacher_norm_eval = teacher_norm_eval
+
+        num_teachers = len(self.teachers)
+        if num_active_teachers is None:
+            num_active_teachers = num_teachers
+        assert 0 < num_active_teachers <= num_teachers, \
+            f'`num_active_teachers` should be in [1, {num_teachers}], but ' \
+            f'got {num_active_teachers}.'
+        assert teacher_sampler in ['round_robin', 'random'], \
+            f'Unsupported teacher sampler {teacher_sampler}.'
+        self.num_active_teachers = num_active_teachers
+        self.teacher_sampler = teacher_sampler
+        self.rescale_losses = rescale_losses
+        self.parallel_teachers = parallel_teachers
+        self.calculate_student_loss = calculate_student_loss
+        self._num_steps = 0
+
+        self.distiller.prepare_from_student(self.student)
+        self.distiller.prepare_from_teacher(self.teachers)
+        assert len(self.distiller.deliveries.deliveries) == 0, \
+            'Deliveries are not supported with multiple teachers.'
+        self.loss_teachers = self._get_loss_teachers()
+        self.loss_active_freqs = self._get_loss_active_freqs()
+
+    @property
+    def student(self) -> nn.Module:
+        """Alias for ``architecture``."""
+        return self.architecture
+
+    def _get_loss_teachers(self) -> Dict[str, Set[str]]:
+        """Get the names of teachers whose records are used by each distill
+        loss."""
+        loss_teachers = dict()
+        recorders = self.distiller.teacher_recorders
+        for loss_name, forward_mappings in \
+                self.distiller.loss_forward_mappings.items():
+            loss_teachers[loss_name] = set()
+            for record in forward_mappings.values():
+                if record['from_student']:
+                    continue
+                source = recorders.get_recorder(record['recorder']).source
+                teacher_name = source.split('.')[0]
+                assert teacher_name in self.teachers, \
+                    f'The source "{source}" of a teacher recorder should ' \
+                    'start with the name of a teacher.'
+                loss_teachers[loss_name].add(teacher_name)
+        return loss_teachers
+
+    def _get_loss_active_freqs(self) -> Dict[str, float]:
+        """Get the frequency that the teachers of each distill loss are all
+        active in a step.
+
+        Round robin cycles through fixed windows of teachers, so the
+        frequency is counted over a cycle of the schedule, and a loss whose
+        teachers never run together is not allowed.
+        """
+        num_teachers = len(self.teachers)
+        num_active = self.num_active_teachers
+        loss_active_freqs = dict()
+        if self.teacher_sampler == 'round_robin':
+            names = list(self.teachers.keys())
+            cycle = num_teachers // math.gcd(num_teachers, num_active)
+            active_sets = [{
+                names[i]
+                for i in self._round_robin_indices(step)
+            } for step in range(cycle)]
+            for loss_name, teachers in self.loss_teachers.items():
+                num_runs = sum(
+                    teachers.issubset(active) for active in active_sets)
+                assert num_runs > 0, \
+                    f'The teachers {sorted(teachers)} of {loss_name} are ' \
+                    'never active together with the round robin sampler.'
+                loss_active_freqs[loss_name] = num_runs / cycle
+        else:
+            for loss_name, teachers in self.loss_teachers.items():
+                # the probability that the teachers are all in a uniformly
+                # random subset.
+                prob = 1.
+                for i in range(len(teachers)):
+                    prob *= (num_active - i) / (num_teachers - i)
+                loss_active_freqs[loss_name] = prob
+        return loss_active_freqs
+
+    def _round_robin_indices(self, step: int) -> List[int]:
+        """The indices of the teachers active in ``step`` with round
+        robin."""
+        start = step * self.num_active_teachers
+        return [(start + i) % len(self.teachers)
+                for i in range(self.num_active_teachers)]
+
+    def sample_teachers(self) -> List[str]:
+        """Choose the names of the teachers running in the current step."""
+        names = list(self.teachers.keys())
+        num_active = self.num_active_teachers
+        if num_active == len(names):
+            return names
+        if self.teacher_sampler == 'round_robin':
+            indices = self._round_robin_indices(self._num_steps)
+        else:
+            indices = torch.randperm(len(names))[:num_active].tolist()
+        self._num_steps += 1
+        return [names[i] for i in sorted(indices)]
+
+    def _forward_teachers(
+            self, names: List[str], batch_inputs: torch.Tensor,
+            data_samples: Optional[List[BaseDataElement]]) -> None:
+        """Forward the teachers in ``names`` without grad."""
+
+        def forward(name: str) -> None:
+            # grad mode is thread local.
+            with torch.no_grad():
+                _ = self.teachers[name](
+                    batch_inputs, data_samples, mode='loss')
+
+        if not self.parallel_teachers or len(names) == 1:
+            for name in names:
+                forward(name)
+        elif batch_inputs.is_cuda:
+            current_stream = torch.cuda.current_stream()
+            streams = [torch.cuda.Stream() for _ in names]
+            for name, stream in zip(names, streams):
+                stream.wait_stream(current_stream)
+                with torch.cuda.stream(stream):
+                    forward(name)
+            # The records are used and freed on the current stream after
+            # this, and the side streams wait for it before being reused.
+            for stream in streams:
+                current_stream.wait_stream(stream)
+        else:
+            with ThreadPoolExecutor(len(names)) as executor:
+                list(executor.map(forward, names))
+
+    def loss(
+        self,
+        batch_inputs: torch.Tensor,
+        data_samples: Optional[List[BaseDataElement]] = None,
+    ) -> LossResults:
+        """Calculate losses from a batch of inputs and data samples."""
+
+        losses = dict()
+        active_teachers = self.sample_teachers()
+
+        with self.distiller.shared_forward:
+            with self.distiller.teacher_recorders:
+                self._forward_teachers(active_teachers, batch_inputs,
+                                       data_samples)
+
+            with self.distiller.student_recorders:
+                if self.calculate_student_loss:
+                    student_losses = self.student(
+                        batch_inputs, data_samples, mode='loss')
+                    losses.update(add_prefix(student_losses, 'student'))
+                else:
+                    _ = self.student(batch_inputs, data_samples, mode='loss')
+
+        loss_names = [
+            loss_name
+            for loss_name, teachers in self.loss_teachers.items()
+            if teachers.issubset(active_teachers)
+        ]
+        if len(loss_names) == len(self.loss_teachers):
+            # all losses are computed, which may use the loss plan.
+            distill_losses = self.distiller.compute_distill_losses()
+        else:
+            distill_losses = self.distiller.compute_distill_losses(
+                loss_names)
+        if self.rescale_losses:
+            for loss_name, loss in distill_losses.items():
+                distill_losses[loss_name] = \
+                    loss / self.loss_active_freqs[loss_name]
+        losses.update(add_prefix(distill_losses, 'distill'))
+
+        return losses
+
+    def train(self, mode: bool = True) -> None:
+        """Set distiller's forward mode."""
+        super().train(mode)
+        if mode and self.teacher_norm_eval:
+            for m in self.teachers.modules():
+                if isinstance(m, _BatchNorm):
+                    m.eval()
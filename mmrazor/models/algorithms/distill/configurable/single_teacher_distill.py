@@ -8,6 +8,8 @@ from mmengine.structures import BaseDataElement
 from torch import nn
 from torch.nn.modules.batchnorm import _BatchNorm
 
+from mmrazor.models.task_modules import (CachedTeacherRecorder,
+                                         TeacherRecordCache)
 from mmrazor.models.utils import add_prefix
 from mmrazor.registry import MODELS
 from ...base import BaseAlgorithm, LossResults
@@ -32,6 +34,13 @@ class SingleTeacherDistill(BaseAlgorithm):
             to True.
         calculate_student_loss (bool): Whether to calculate student loss
             (original task loss) to update student model. Defaults to True.
+        teacher_cache_cfg (dict, optional): If given, a
+            :class:`TeacherRecordCache` is built with it. The teacher records
+            of each sample are stored the first time, and served by
+            :class:`CachedTeacherRecorder` later instead of calling the
+            teacher. It requires a frozen teacher, deterministic inputs
+            without random augmentation and no deliveries.
+            Defaults to None.
     """
 
     def __init__(self,
@@ -42,6 +51,7 @@ class SingleTeacherDistill(BaseAlgorithm):
                  teacher_norm_eval: bool = True,
                  student_trainable: bool = True,
                  calculate_student_loss: bool = True,
+                 teacher_cache_cfg: Optional[Dict] = None,
                  **kwargs) -> None:
         super().__init__(**kwargs)
 
@@ -76,6 +86,19 @@ class SingleTeacherDistill(BaseAlgorithm):
         self.distiller.prepare_from_student(self.student)
         self.distiller.prepare_from_teacher(self.teacher)
 
+        self.teacher_cache: Optional[TeacherRecordCache] = None
+        if teacher_cache_cfg is not None:
+            assert not self.teacher_trainable, \
+                'The teacher records can not be cached if the teacher is ' \
+                'trainable.'
+            assert len(self.distiller.deliveries.deliveries) == 0, \
+                'The teacher records can not be cached with deliveries.'
+            self.teacher_cache = TeacherRecordCache(**teacher_cache_cfg)
+            recorders = self.distiller.teacher_recorders.recorders
+            for name, recorder in recorders.items():
+                if not isinstance(recorder, CachedTeacherRecorder):
+                    recorders[name] = CachedTeacherRecorder(recorder)
+
     @property
     def student(self) -> nn.Module:
         """Alias for ``architecture``."""
@@ -90,37 +113,50 @@ class SingleTeacherDistill(BaseAlgorithm):
 
         losses = dict()
 
-        # If the `override_data` of a delivery is False, the delivery will
-        # record the origin data.
-        self.distiller.set_deliveries_override(False)
-        if self.teacher_trainable:
-            with self.distiller.teacher_recorders, self.distiller.deliveries:
-                teacher_losses = self.teacher(
-                    batch_inputs, data_samples, mode='loss')
-
-            losses.update(add_prefix(teacher_losses, 'teacher'))
-        else:
-            with self.distiller.teacher_recorders, self.distiller.deliveries:
-                with torch.no_grad():
-                    _ = self.teacher(batch_inputs, data_samples, mode='loss')
-
-        # If the `override_data` of a delivery is True, the delivery will
-        # override the origin data with the recorded data.
-        self.distiller.set_deliveries_override(True)
-        # Original task loss will not be used during some pretraining process.
-        if self.calculate_student_loss:
-            with self.distiller.student_recorders, self.distiller.deliveries:
-                student_losses = self.student(
-                    batch_inputs, data_samples, mode='loss')
-            losses.update(add_prefix(student_losses, 'student'))
-        else:
-            with self.distiller.student_recorders, self.distiller.deliveries:
-                if self.student_trainable:
-                    _ = self.student(batch_inputs, data_samples, mode='loss')
-                else:
+        # The outputs of modules shared by the teacher and the student are
+        # reused in the student pass if `share_forward` of the distiller is
+        # True.
+        with self.distiller.shared_forward:
+            # If the `override_data` of a delivery is False, the delivery
+            # will record the origin data.
+            self.distiller.set_deliveries_override(False)
+            if self.teacher_trainable:
+                with self.distiller.teacher_recorders, \
+                        self.distiller.deliveries:
+                    teacher_losses = self.teacher(
+                        batch_inputs, data_samples, mode='loss')
+
+                losses.update(add_prefix(teacher_losses, 'teacher'))
+            elif self.teacher_cache is not None:
+                self._record_teacher_with_cache(batch_inputs, data_samples)
+            else:
+                with self.distiller.teacher_recorders, \
+                        self.distiller.deliveries:
                     with torch.no_grad():
+                        _ = self.teacher(
+                            batch_inputs, data_samples, mode='loss')
+
+            # If the `override_data` of a delivery is True, the delivery will
+            # override the origin data with the recorded data.
+            self.distiller.set_deliveries_override(True)
+            # Original task loss will not be used during some pretraining
+            # process.
+            if self.calculate_student_loss:
+                with self.distiller.student_recorders, \
+                        self.distiller.deliveries:
+                    student_losses = self.student(
+                        batch_inputs, data_samples, mode='loss')
+                losses.update(add_prefix(student_losses, 'student'))
+            else:
+                with self.distiller.student_recorders, \
+                        self.distiller.deliveries:
+                    if self.student_trainable:
                         _ = self.student(
                             batch_inputs, data_samples, mode='loss')
+                    else:
+                        with torch.no_grad():
+                            _ = self.student(
+                                batch_inputs, data_samples, mode='loss')
 
         # Automatically compute distill losses based on `loss_forward_mappings`
         # The required data already exists in the recorders.
@@ -129,6 +165,31 @@ class SingleTeacherDistill(BaseAlgorithm):
 
         return losses
 
+    def _record_teacher_with_cache(
+            self, batch_inputs: torch.Tensor,
+            data_samples: Optional[List[BaseDataElement]]) -> None:
+        """Fill the teacher recorders with the cached records, or with a
+        teacher forward whose records are cached then."""
+        assert data_samples is not None, \
+            'Data samples with sample indices are required by the cache.'
+        indices = self.teacher_cache.get_indices(data_samples)
+        recorders = self.distiller.teacher_recorders.recorders
+        if self.teacher_cache.contains(indices):
+            records = self.teacher_cache.get(indices, batch_inputs.device)
+            for name, recorder in recorders.items():
+                recorder.serve(records[name])
+            with self.distiller.teacher_recorders:
+                pass
+        else:
+            with self.distiller.teacher_recorders:
+                with torch.no_grad():
+                    _ = self.teacher(batch_inputs, data_samples, mode='loss')
+            self.teacher_cache.put(
+                {
+                    name: recorder.data_buffer
+                    for name, recorder in recorders.items()
+                }, indices)
+
     def train(self, mode: bool = True) -> None:
         """Set distiller's forward mode."""
         super().train(mode)
@@ -80,8 +80,10 @@ class _DynamicBatchNorm(_BatchNorm, DynamicBatchNormMixin):
         out = F.batch_norm(input, running_mean, running_var, weight, bias,
                            bn_training, exponential_average_factor, self.eps)
 
-        # copy changed running statistics
-        if self.training and self.track_running_stats:
+        # copy changed running statistics, unless they are sliced as views
+        # and updated in place
+        if self.training and self.track_running_stats and not isinstance(
+                self._get_num_features_index(), slice):
             out_mask = self._get_num_features_mask()
             self.running_mean.masked_scatter_(out_mask, running_mean)
             self.running_var.masked_scatter_(out_mask, running_var)
@@ -322,8 +324,10 @@ class DMCPBatchNorm2d(DynamicBatchNorm2d):
         out = F.batch_norm(input, running_mean, running_var, weight, bias,
                            bn_training, exponential_average_factor, self.eps)
 
-        # copy changed running statistics
-        if self.training and self.track_running_stats:
+        # copy changed running statistics, unless they are sliced as views
+        # and updated in place
+        if self.training and self.track_running_stats and not isinstance(
+                self._get_num_features_index(), slice):
             out_mask = self._get_num_features_mask()
             self.running_mean.masked_scatter_(out_mask, running_mean)
             self.running_var.masked_scatter_(out_mask, running_var)
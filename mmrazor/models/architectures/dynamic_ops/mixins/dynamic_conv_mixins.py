@@ -158,28 +158,28 @@ class DynamicConvMixin(DynamicChannelMixin):
             return weight, bias
 
         if 'in_channels' in self.mutable_attrs:
-            mutable_in_channels = self.mutable_attrs['in_channels']
-            in_mask = mutable_in_channels.current_mask.to(weight.device)
+            in_index = self.get_channel_index(
+                self.mutable_attrs['in_channels'], weight.device)
         else:
-            in_mask = torch.ones(weight.size(1)).bool().to(weight.device)
+            in_index = slice(None)
 
         if 'out_channels' in self.mutable_attrs:
-            mutable_out_channels = self.mutable_attrs['out_channels']
-            out_mask = mutable_out_channels.current_mask.to(weight.device)
+            out_index = self.get_channel_index(
+                self.mutable_attrs['out_channels'], weight.device)
         else:
-            out_mask = torch.ones(weight.size(0)).bool().to(weight.device)
+            out_index = slice(None)
 
         if self.groups == 1:
-            weight = weight[out_mask][:, in_mask]
+            weight = weight[out_index][:, in_index]
         elif self.groups == self.in_channels == self.out_channels:
             # depth-wise conv
-            weight = weight[out_mask]
+            weight = weight[out_index]
         else:
             raise NotImplementedError(
                 'Current `ChannelMutator` only support pruning the depth-wise '
                 '`nn.Conv2d` or `nn.Conv2d` module whose group number equals '
                 f'to one, but got {self.groups}.')
-        bias = self.bias[out_mask] if self.bias is not None else None
+        bias = self.bias[out_index] if self.bias is not None else None
         return weight, bias
 
     def forward_mixin(self: _ConvNd, x: Tensor) -> Tensor:
@@ -222,9 +222,9 @@ class DynamicConvMixin(DynamicChannelMixin):
             groups=groups,
             bias=True if bias is not None else False)
 
-        static_conv.weight = nn.Parameter(weight)
+        static_conv.weight = nn.Parameter(weight.clone())
         if bias is not None:
-            static_conv.bias = nn.Parameter(bias)
+            static_conv.bias = nn.Parameter(bias.clone())
 
         return static_conv
 
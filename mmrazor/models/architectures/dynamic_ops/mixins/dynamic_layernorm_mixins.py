@@ -1,6 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import logging
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, Optional, Set, Tuple, Union
 
 import torch
 from mmengine import print_log
@@ -98,6 +98,14 @@ class DynamicLayerNormMixin(DynamicChannelMixin):
 
         return out_mask
 
+    def _get_num_features_index(self: LayerNorm) -> Union[slice, Tensor]:
+        """Get index of ``num_features`` to select parameters."""
+        if not self.elementwise_affine or \
+                'num_features' not in self.mutable_attrs:
+            return slice(None)
+        return self.get_channel_index(self.mutable_num_features,
+                                      self.weight.device)
+
     def get_dynamic_params(
             self: LayerNorm) -> Tuple[Optional[Tensor], Optional[Tensor]]:
         """Get dynamic parameters that will be used in forward process.
@@ -107,11 +115,11 @@ class DynamicLayerNormMixin(DynamicChannelMixin):
                 Optional[Tensor]]: Sliced running_mean, running_var, weight and
                 bias.
         """
-        out_mask = self._get_num_features_mask()
+        out_index = self._get_num_features_index()
 
         if self.elementwise_affine:
-            weight = self.weight[out_mask]
-            bias = self.bias[out_mask]
+            weight = self.weight[out_index]
+            bias = self.bias[out_index]
         else:
             weight, bias = self.weight, self.bias
 
@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Set, Tuple
+from typing import Any, Dict, Optional, Set, Tuple, Union
 
 import torch
 from mmengine import print_log
@@ -139,6 +139,26 @@ class DynamicChannelMixin(DynamicMixin):
             raise ValueError(
                 'channel mutable must have attribute `current_mask`')
 
+    @staticmethod
+    def get_channel_index(mutable_channels: BaseMutable,
+                          device: torch.device) -> Union[slice, Tensor]:
+        """Get the index to select the activated channels of parameters.
+
+        Args:
+            mutable_channels (BaseMutable): Mutable of the channels.
+            device (torch.device): Device of the parameters.
+
+        Returns:
+            Union[slice, Tensor]: ``current_slice`` of the mutable if the
+                activated channels are the first ones, so that parameters
+                are sliced as views without copying, otherwise
+                ``current_mask`` on ``device``.
+        """
+        current_slice = getattr(mutable_channels, 'current_slice', None)
+        if isinstance(current_slice, slice):
+            return current_slice
+        return mutable_channels.current_mask.to(device)
+
 
 class DynamicBatchNormMixin(DynamicChannelMixin):
     """A mixin class for Pytorch BatchNorm, which can mutate
@@ -216,6 +236,15 @@ class DynamicBatchNormMixin(DynamicChannelMixin):
 
         return out_mask
 
+    def _get_num_features_index(self: _BatchNorm) -> Union[slice, Tensor]:
+        """Get index of ``num_features`` to select parameters and running
+        statistics."""
+        if 'num_features' not in self.mutable_attrs:
+            return slice(None)
+        refer_tensor = self.weight if self.affine else self.running_mean
+        return self.get_channel_index(self.mutable_attrs['num_features'],
+                                      refer_tensor.device)
+
     def get_dynamic_params(
         self: _BatchNorm
     ) -> Tuple[Optional[Tensor], Optional[Tensor], Optional[Tensor],
@@ -227,18 +256,18 @@ class DynamicBatchNormMixin(DynamicChannelMixin):
                 Optional[Tensor]]: Sliced running_mean, running_var, weight and
                 bias.
         """
-        out_mask = self._get_num_features_mask()
+        out_index = self._get_num_features_index()
 
         if self.affine:
-            weight = self.weight[out_mask]
-            bias = self.bias[out_mask]
+            weight = self.weight[out_index]
+            bias = self.bias[out_index]
         else:
             weight, bias = self.weight, self.bias
 
         if self.track_running_stats:
-            running_mean = self.running_mean[out_mask] \
+            running_mean = self.running_mean[out_index] \
                 if not self.training or self.track_running_stats else None
-            running_var = self.running_var[out_mask] \
+            running_var = self.running_var[out_index] \
                 if not self.training or self.track_running_stats else None
         else:
             running_mean, running_var = self.running_mean, self.running_var
@@ -273,9 +302,9 @@ class DynamicBatchNormMixin(DynamicChannelMixin):
         if running_var is not None:
             static_bn.running_var.copy_(running_var)
         if weight is not None:
-            static_bn.weight = nn.Parameter(weight)
+            static_bn.weight = nn.Parameter(weight.clone())
         if bias is not None:
-            static_bn.bias = nn.Parameter(bias)
+            static_bn.bias = nn.Parameter(bias.clone())
 
         return static_bn
 
@@ -366,21 +395,18 @@ class DynamicLinearMixin(DynamicChannelMixin):
             return self.weight, self.bias
 
         if 'in_features' in self.mutable_attrs:
-            in_mask = self.mutable_attrs['in_features'].current_mask.to(
-                self.weight.device)
+            in_index = self.get_channel_index(
+                self.mutable_attrs['in_features'], self.weight.device)
         else:
-            in_mask = torch.ones(self.weight.size(1)).bool().to(
-                self.weight.device)
+            in_index = slice(None)
         if 'out_features' in self.mutable_attrs:
-
-            out_mask = self.mutable_attrs['out_features'].current_mask.to(
-                self.weight.device)
+            out_index = self.get_channel_index(
+                self.mutable_attrs['out_features'], self.weight.device)
         else:
-            out_mask = torch.ones(self.weight.size(0)).bool().to(
-                self.weight.device)
+            out_index = slice(None)
 
-        weight = self.weight[out_mask][:, in_mask]
-        bias = self.bias[out_mask] if self.bias is not None else None
+        weight = self.weight[out_index][:, in_index]
+        bias = self.bias[out_index] if self.bias is not None else None
 
         return weight, bias
 
@@ -401,8 +427,8 @@ class DynamicLinearMixin(DynamicChannelMixin):
             out_features=out_features,
             bias=True if bias is not None else False)
 
-        static_linear.weight = nn.Parameter(weight)
+        static_linear.weight = nn.Parameter(weight.clone())
         if bias is not None:
-            static_linear.bias = nn.Parameter(bias)
+            static_linear.bias = nn.Parameter(bias.clone())
 
         return static_linear
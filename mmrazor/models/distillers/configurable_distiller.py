@@ -1,15 +1,19 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import warnings
 from inspect import signature
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
+import torch
 from mmengine.model import BaseModel
+from mmengine.utils import digit_version
 from torch import nn
 
 from mmrazor.registry import MODELS
 from ..algorithms.base import LossResults
-from ..task_modules import DistillDeliveryManager, RecorderManager
+from ..task_modules import (DistillDeliveryManager, RecorderManager,
+                            SharedForwardManager)
 from .base_distiller import BaseDistiller
+from .distill_loss_plan import DistillLossPlan
 
 
 @MODELS.register_module()
@@ -46,6 +50,21 @@ class ConfigurableDistiller(BaseDistiller):
             loss. Defaults to None.
         loss_forward_mappings: (Dict[str, Dict], optional): Mapping between
             distill loss forward arguments and records.
+        free_records (bool): Whether to clear the data buffers of all
+            recorders right after computing distill losses, so that the
+            records not used by the losses are freed before backward.
+            Defaults to False.
+        fuse_losses (bool): Whether to compute distill losses with a
+            :class:`DistillLossPlan` built once from ``loss_forward_mappings``,
+            which fetches each record and calls each connector on a record
+            only once. Defaults to False.
+        compile_losses (bool): Whether to wrap the computation of the plan
+            with ``torch.compile``, which requires torch>=2.0. Only used if
+            ``fuse_losses`` is True. Defaults to False.
+        share_forward (bool): Whether to reuse the outputs of modules shared
+            by the teacher and the student in a distill step, see
+            :class:`SharedForwardManager`. It is not supported with
+            deliveries. Defaults to False.
 
     Note:
         If a distill loss needs to backward, the name of the loss must contain
@@ -101,6 +120,10 @@ class ConfigurableDistiller(BaseDistiller):
                  connectors: Optional[Dict[str, Dict]] = None,
                  distill_losses: Optional[Dict[str, Dict]] = None,
                  loss_forward_mappings: Optional[Dict[str, Dict]] = None,
+                 free_records: bool = False,
+                 fuse_losses: bool = False,
+                 compile_losses: bool = False,
+                 share_forward: bool = False,
                  **kwargs):
         super().__init__(**kwargs)
         # The recorder manager is just constructed, but not really initialized
@@ -111,6 +134,14 @@ class ConfigurableDistiller(BaseDistiller):
 
         self.deliveries = DistillDeliveryManager(distill_deliveries)
 
+        # The skipped forward of shared modules can't deliver data.
+        assert not (share_forward and distill_deliveries), \
+            '`share_forward` is not supported with deliveries.'
+        self.share_forward = share_forward
+        self.shared_forward = SharedForwardManager()
+
+        self.free_records = free_records
+
         self.distill_losses = self.build_distill_losses(distill_losses)
 
         self.connectors = self.build_connectors(connectors)
@@ -125,6 +156,23 @@ class ConfigurableDistiller(BaseDistiller):
         else:
             self.loss_forward_mappings = dict()
 
+        self.loss_plan: Optional[DistillLossPlan] = None
+        if fuse_losses:
+            assert type(self).get_record is ConfigurableDistiller.get_record, \
+                '`fuse_losses` is not supported by distillers overriding ' \
+                '`get_record`.'
+            self.loss_plan = DistillLossPlan(self.loss_forward_mappings,
+                                             self.distill_losses,
+                                             self.connectors)
+            self._compute_planned_losses = self.loss_plan.compute
+            if compile_losses:
+                assert digit_version(torch.__version__) >= \
+                    digit_version('2.0.0'), \
+                    '`compile_losses` requires `torch.compile`, which is ' \
+                    f'available since torch 2.0, but got {torch.__version__}.'
+                self._compute_planned_losses = torch.compile(
+                    self.loss_plan.compute)
+
     def set_deliveries_override(self, override: bool) -> None:
         """Set the `override_data` of all deliveries."""
         self.deliveries.override_data = override
@@ -132,10 +180,14 @@ class ConfigurableDistiller(BaseDistiller):
     def prepare_from_student(self, model: BaseModel) -> None:
         """Initialize student recorders."""
         self.student_recorders.initialize(model)
+        if self.share_forward:
+            self.shared_forward.prepare_from_student(model)
 
     def prepare_from_teacher(self, model: nn.Module) -> None:
         """Initialize teacher recorders."""
         self.teacher_recorders.initialize(model)
+        if self.share_forward:
+            self.shared_forward.prepare_from_teacher(model)
 
     def build_connectors(
         self,
@@ -185,11 +237,8 @@ class ConfigurableDistiller(BaseDistiller):
         """According to each item in ``record_infos``, get the corresponding
         record in ``recorder_manager``."""
 
-        if from_student:
-            recorder_ = self.student_recorders.get_recorder(recorder)
-        else:
-            recorder_ = self.teacher_recorders.get_recorder(recorder)
-        record_data = recorder_.get_record_data(record_idx, data_idx)
+        record_data = self._get_record_data(from_student, recorder,
+                                            record_idx, data_idx)
 
         if connector:
             record_data = self.connectors[connector](record_data)
@@ -198,20 +247,50 @@ class ConfigurableDistiller(BaseDistiller):
 
         return record_data
 
-    def compute_distill_losses(self) -> LossResults:
-        """Compute distill losses automatically."""
-        # Record all computed losses' results.
-        losses = dict()
-        for loss_name, forward_mappings in self.loss_forward_mappings.items():
-            forward_kwargs = dict()
-            for forward_key, record in forward_mappings.items():
-                forward_var = self.get_record(**record)
-                forward_kwargs[forward_key] = forward_var
-
-            loss_module = self.distill_losses[loss_name]
-            loss = loss_module(**forward_kwargs)  # type: ignore
-            # add computed loss result.
-            losses[loss_name] = loss
+    def _get_record_data(self, from_student: bool, recorder: str,
+                         record_idx: int, data_idx: Optional[int]) -> List:
+        """Get the record in the student or the teacher recorders."""
+        if from_student:
+            recorder_ = self.student_recorders.get_recorder(recorder)
+        else:
+            recorder_ = self.teacher_recorders.get_recorder(recorder)
+        return recorder_.get_record_data(record_idx, data_idx)
+
+    def compute_distill_losses(
+            self,
+            loss_names: Optional[Sequence[str]] = None) -> LossResults:
+        """Compute distill losses automatically.
+
+        Args:
+            loss_names (Sequence[str], optional): If given, only these losses
+                are computed, and the loss plan is not used. Defaults to None.
+        """
+        if self.loss_plan is not None and loss_names is None:
+            records = [
+                self._get_record_data(*key)
+                for key in self.loss_plan.record_keys
+            ]
+            losses = self._compute_planned_losses(records)
+        else:
+            # Record all computed losses' results.
+            losses = dict()
+            for loss_name, forward_mappings in \
+                    self.loss_forward_mappings.items():
+                if loss_names is not None and loss_name not in loss_names:
+                    continue
+                forward_kwargs = dict()
+                for forward_key, record in forward_mappings.items():
+                    forward_var = self.get_record(**record)
+                    forward_kwargs[forward_key] = forward_var
+
+                loss_module = self.distill_losses[loss_name]
+                loss = loss_module(**forward_kwargs)  # type: ignore
+                # add computed loss result.
+                losses[loss_name] = loss
+
+        if self.free_records:
+            self.student_recorders.reset_data_buffer()
+            self.teacher_recorders.reset_data_buffer()
 
         return losses
 
@@ -0,0 +1,98 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Any, Dict, List, Optional, Tuple
+
+from torch import nn
+
+from ..algorithms.base import LossResults
+
+RecordKey = Tuple[bool, str, int, Optional[int]]
+
+
+class DistillLossPlan:
+    """Plan of computing distill losses, which is built once from
+    ``loss_forward_mappings`` of :class:`ConfigurableDistiller`.
+
+    The records used by the losses are fetched once even if several losses
+    use them, and a connector is called once on the same record even if
+    several losses share it. The records and the intermediate results are
+    kept in a list of slots, so :meth:`compute` only runs the connectors and
+    the losses in a fixed order without building dicts, and it can be
+    wrapped with ``torch.compile``.
+
+    Args:
+        loss_forward_mappings (Dict[str, Dict]): Mapping between distill
+            losses and their forward arguments.
+        distill_losses (nn.ModuleDict): The distill losses.
+        connectors (nn.ModuleDict): The connectors.
+    """
+
+    def __init__(self, loss_forward_mappings: Dict[str, Dict],
+                 distill_losses: nn.ModuleDict,
+                 connectors: nn.ModuleDict) -> None:
+        self.distill_losses = distill_losses
+        self.connectors = connectors
+
+        # (from_student, recorder, record_idx, data_idx) of each record.
+        self.record_keys: List[RecordKey] = list()
+        # (input slot, connector name or None, connector_idx) of each step,
+        # whose output is appended to the slots.
+        self.steps: List[Tuple[int, Optional[str], Optional[int]]] = list()
+        # (loss name, [(forward key, slot)]) of each loss.
+        self.loss_inputs: List[Tuple[str, List[Tuple[str, int]]]] = list()
+
+        # The records take the first slots, and the outputs of the steps are
+        # appended after all the records, as in :meth:`compute`.
+        record_slots: Dict[RecordKey, int] = dict()
+        for forward_mappings in loss_forward_mappings.values():
+            for record in forward_mappings.values():
+                key = self._get_record_key(record)
+                if key not in record_slots:
+                    record_slots[key] = len(record_slots)
+                    self.record_keys.append(key)
+
+        step_slots: Dict[Any, int] = dict()
+        for loss_name, forward_mappings in loss_forward_mappings.items():
+            inputs = list()
+            for forward_key, record in forward_mappings.items():
+                slot = record_slots[self._get_record_key(record)]
+                connector = record.get('connector')
+                connector_idx = record.get('connector_idx')
+                if connector or connector_idx is not None:
+                    step = (slot, connector or None, connector_idx)
+                    if step not in step_slots:
+                        step_slots[step] = len(record_slots) + len(
+                            self.steps)
+                        self.steps.append(step)
+                    slot = step_slots[step]
+                inputs.append((forward_key, slot))
+            self.loss_inputs.append((loss_name, inputs))
+
+    @staticmethod
+    def _get_record_key(record: Dict) -> RecordKey:
+        """Get (from_student, recorder, record_idx, data_idx) of a record."""
+        return (record['from_student'], record['recorder'],
+                record.get('record_idx', 0), record.get('data_idx'))
+
+    @property
+    def num_records(self) -> int:
+        """int: The number of distinct records used by the losses."""
+        return len(self.record_keys)
+
+    def compute(self, records: List) -> LossResults:
+        """Compute the losses with the records fetched in the order of
+        ``record_keys``."""
+        slots = list(records)
+        for src, connector, connector_idx in self.steps:
+            data = slots[src]
+            if connector is not None:
+                data = self.connectors[connector](data)
+            if connector_idx is not None:
+                data = data[connector_idx]
+            slots.append(data)
+
+        losses = dict()
+        for loss_name, inputs in self.loss_inputs:
+            forward_kwargs = {key: slots[slot] for key, slot in inputs}
+            losses[loss_name] = self.distill_losses[loss_name](
+                **forward_kwargs)
+        return losses
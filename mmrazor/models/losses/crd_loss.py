@@ -1,9 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import math
-from typing import Union
+from typing import List, Optional, Tuple, Union
 
 import torch
+import torch.distributed as dist
 import torch.nn as nn
+from mmengine.dist import get_dist_info
 
 from mmrazor.registry import MODELS
 
@@ -21,6 +23,12 @@ class CRDLoss(nn.Module):
         dim_out (int, optional): output channels. Defaults to 128.
         momentum (float, optional): momentum. Defaults to 0.5.
         eps (double, optional): eps. Defaults to 1e-7.
+        sharded_memory (bool, optional): Whether to shard the memory banks
+            across ranks with :class:`ShardedContrastMemory`, instead of
+            replicating them. Defaults to False.
+        memory_dtype (str, optional): dtype of the sharded memory banks, e.g.
+            'float16' or 'bfloat16'. Only used if ``sharded_memory`` is True.
+            Defaults to None, namely float32.
     """
 
     def __init__(self,
@@ -30,13 +38,22 @@ class CRDLoss(nn.Module):
                  sample_n=50000,
                  dim_out=128,
                  momentum=0.5,
-                 eps=1e-7):
+                 eps=1e-7,
+                 sharded_memory: bool = False,
+                 memory_dtype: Optional[str] = None):
         super().__init__()
         self.loss_weight = loss_weight
         self.eps = eps
 
-        self.contrast = ContrastMemory(dim_out, sample_n, neg_num, temperature,
-                                       momentum)
+        if sharded_memory:
+            self.contrast = ShardedContrastMemory(dim_out, sample_n, neg_num,
+                                                  temperature, momentum,
+                                                  memory_dtype)
+        else:
+            assert memory_dtype is None, \
+                '`memory_dtype` is only supported by the sharded memory.'
+            self.contrast = ContrastMemory(dim_out, sample_n, neg_num,
+                                           temperature, momentum)
         self.criterion_s_t = ContrastLoss(sample_n, eps=self.eps)
 
     def forward(self, s_feats, t_feats, data_samples):
@@ -203,6 +220,195 @@ class ContrastMemory(nn.Module):
         return out_s, out_t
 
 
+class ShardedContrastMemory(nn.Module):
+    """Memory buffer of CRD whose memory banks are sharded across ranks.
+
+    Sample ``i`` is owned by rank ``i % world_size``, which stores its rows of
+    both memory banks, so every rank only keeps about ``n_sample /
+    world_size`` rows. In each step, the indices of the positive and negative
+    samples are sent to their owner ranks, which send back the requested
+    rows. The momentum updates are also sent to and applied by the owners.
+
+    Compared with :class:`ContrastMemory`, the hyper-parameters are kept as
+    Python scalars and the normalization constants are set on device, so
+    there is no host-device sync except the exchange of the split sizes
+    between ranks. The negatives are drawn uniformly with ``torch.randint``.
+
+    Note:
+        The exchange between ranks uses ``all_to_all_single``, which requires
+        a backend supporting it, e.g. NCCL. The shards are gathered into the
+        whole memory banks in :meth:`state_dict`, and each rank takes back its
+        rows in :meth:`load_state_dict`, so both of them must be called on
+        all ranks, as the runner does when saving and resuming checkpoints.
+
+    Args:
+        dim_out (int): output channels.
+        n_sample (int): number of total samples.
+        neg_sample (int): number of negative samples.
+        T (float, optional): temperature. Defaults to 0.07.
+        momentum (float, optional): momentum. Defaults to 0.5.
+        dtype (str, optional): dtype of the memory banks, e.g. 'float16' or
+            'bfloat16'. Defaults to None, namely float32.
+    """
+
+    def __init__(self,
+                 dim_out: int,
+                 n_sample: int,
+                 neg_sample: int,
+                 T: float = 0.07,
+                 momentum: float = 0.5,
+                 dtype: Optional[str] = None):
+        super().__init__()
+        self.dim_out = dim_out
+        self.n_sample = n_sample
+        self.neg_sample = neg_sample
+        self.T = T
+        self.momentum = momentum
+        self.rank, self.world_size = get_dist_info()
+        num_local = len(range(self.rank, n_sample, self.world_size))
+        dtype = torch.float32 if dtype is None else getattr(torch, dtype)
+
+        stdv = 1. / math.sqrt(dim_out / 3)
+        for name in ('memory_v1', 'memory_v2'):
+            memory = torch.rand(num_local, dim_out).mul_(2 * stdv).add_(-stdv)
+            self.register_buffer(name, memory.to(dtype))
+        # Z_s and Z_t, which are set in the first step.
+        self.register_buffer('norm_constants', torch.full((2, ), -1.))
+
+    def _save_to_state_dict(self, destination, prefix, keep_vars):
+        """Save the whole memory banks gathered from all ranks."""
+        super()._save_to_state_dict(destination, prefix, keep_vars)
+        if self.world_size == 1:
+            return
+        for name in ('memory_v1', 'memory_v2'):
+            destination[prefix + name] = self._gather(getattr(self, name))
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        """Load the rows owned by this rank from the whole memory banks."""
+        if self.world_size > 1:
+            for name in ('memory_v1', 'memory_v2'):
+                key = prefix + name
+                # the memory banks of other sizes are left to be reported as
+                # size mismatch.
+                if key in state_dict and len(
+                        state_dict[key]) == self.n_sample:
+                    state_dict[key] = \
+                        state_dict[key][self.rank::self.world_size]
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
+
+    def _gather(self, memory: torch.Tensor) -> torch.Tensor:
+        """Gather the shards of ``memory`` into the whole memory bank."""
+        # pad the shards to the same size, the padded rows are in the end
+        # after interleaving the shards.
+        num_max = math.ceil(self.n_sample / self.world_size)
+        shard = memory.detach().new_zeros(num_max, self.dim_out)
+        shard[:len(memory)] = memory.detach()
+        shards = [torch.empty_like(shard) for _ in range(self.world_size)]
+        dist.all_gather(shards, shard)
+        return torch.stack(shards, dim=1).flatten(0, 1)[:self.n_sample]
+
+    def _all_to_all(self, tensor: torch.Tensor, output_splits: List[int],
+                    input_splits: List[int]) -> torch.Tensor:
+        """Send the splits of ``tensor`` to each rank in order."""
+        output = tensor.new_empty((sum(output_splits), ) + tensor.shape[1:])
+        dist.all_to_all_single(output, tensor.contiguous(), output_splits,
+                               input_splits)
+        return output
+
+    def _send_to_owners(
+            self, indices: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, List[int], List[int]]:
+        """Send ``indices`` to their owner ranks.
+
+        Returns:
+            Tuple: The order sorting ``indices`` by owners, the local rows of
+            the received indices, and the sizes of the sent and the received
+            splits.
+        """
+        owners = indices % self.world_size
+        order = torch.argsort(owners)
+        send_counts = torch.bincount(owners, minlength=self.world_size)
+        recv_counts = torch.empty_like(send_counts)
+        dist.all_to_all_single(recv_counts, send_counts)
+        send_splits = send_counts.tolist()
+        recv_splits = recv_counts.tolist()
+        recv_indices = self._all_to_all(indices[order], recv_splits,
+                                        send_splits)
+        return order, recv_indices // self.world_size, send_splits, \
+            recv_splits
+
+    def _lookup(self, indices: torch.Tensor) -> torch.Tensor:
+        """Get the rows of ``indices`` in both memory banks, concatenated in
+        the last dim."""
+        if self.world_size == 1:
+            return torch.cat(
+                [self.memory_v1[indices], self.memory_v2[indices]], dim=1)
+        order, rows, send_splits, recv_splits = self._send_to_owners(indices)
+        weights = torch.cat([self.memory_v1[rows], self.memory_v2[rows]],
+                            dim=1)
+        weights = self._all_to_all(weights, send_splits, recv_splits)
+        outputs = torch.empty_like(weights)
+        outputs[order] = weights
+        return outputs
+
+    def _update(self, idx: torch.Tensor, feat_s: torch.Tensor,
+                feat_t: torch.Tensor) -> None:
+        """Update the rows of ``idx`` with momentum on their owner ranks."""
+        feats = torch.cat([feat_s, feat_t], dim=1)
+        if self.world_size == 1:
+            rows = idx
+        else:
+            order, rows, send_splits, recv_splits = self._send_to_owners(idx)
+            feats = self._all_to_all(feats[order], recv_splits, send_splits)
+        for memory, feat in zip((self.memory_v1, self.memory_v2),
+                                feats.split(self.dim_out, dim=1)):
+            pos = memory[rows].float().mul_(self.momentum)
+            pos.add_(feat.float(), alpha=1 - self.momentum)
+            pos = pos.div_(pos.norm(dim=1, keepdim=True))
+            memory.index_copy_(0, rows, pos.to(memory.dtype))
+
+    def forward(
+        self,
+        feat_s: torch.Tensor,
+        feat_t: torch.Tensor,
+        idx: torch.Tensor,
+        sample_idx: Optional[torch.Tensor] = None
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        bsz = feat_s.size(0)
+        feat_s = feat_s.view(bsz, self.dim_out)
+        feat_t = feat_t.view(bsz, self.dim_out)
+        idx = idx.view(-1)
+
+        if sample_idx is None:
+            sample_idx = torch.randint(
+                self.n_sample, (bsz, self.neg_sample + 1),
+                device=feat_s.device)
+            sample_idx[:, 0] = idx
+        num_contrast = sample_idx.size(1)
+
+        weights = self._lookup(sample_idx.reshape(-1)).detach()
+        weights = weights.view(bsz, num_contrast, 2 * self.dim_out)
+        weight_s, weight_t = weights.to(feat_s.dtype).split(
+            self.dim_out, dim=2)
+        out_t = torch.bmm(weight_s, feat_t.unsqueeze(2)).div(self.T).exp()
+        out_s = torch.bmm(weight_t, feat_s.unsqueeze(2)).div(self.T).exp()
+
+        with torch.no_grad():
+            # set Z if haven't been set yet, without syncing with host.
+            norm_constants = torch.stack([out_s.mean(), out_t.mean()])
+            norm_constants = norm_constants.float() * self.n_sample
+            self.norm_constants.copy_(
+                torch.where(self.norm_constants < 0, norm_constants,
+                            self.norm_constants))
+        out_s = torch.div(out_s, self.norm_constants[0]).contiguous()
+        out_t = torch.div(out_t, self.norm_constants[1]).contiguous()
+
+        with torch.no_grad():
+            self._update(idx, feat_s.detach(), feat_t.detach())
+
+        return out_s, out_t
+
+
 class AliasMethod(object):
     """
     From: https://hips.seas.harvard.edu/blog/2013/03/03/
@@ -78,6 +78,23 @@ def _expand_mask_fn(
     return fn
 
 
+def _expand_slice_fn(mutable: MutableProtocol,
+                     expand_ratio: Union[int, float]) -> Callable:
+    """Helper function to build `slice_fn` for expand derived mutable."""
+
+    def fn():
+        # the expanded mask is a prefix only if the source mask is.
+        if getattr(mutable, 'current_slice', None) is None:
+            return None
+        if isinstance(expand_ratio, int):
+            expand_choice = mutable.current_choice * expand_ratio
+        else:
+            expand_choice = int(mutable.current_choice * expand_ratio)
+        return slice(0, expand_choice)
+
+    return fn
+
+
 def _divide_and_divise(x: int, ratio: int, divisor: int = 8) -> int:
     """Helper function for divide and divise."""
     new_x = x // ratio
@@ -116,6 +133,21 @@ def _divide_mask_fn(mutable: MutableProtocol,
     return fn
 
 
+def _divide_slice_fn(mutable: MutableProtocol,
+                     ratio: int,
+                     divisor: int = 8) -> Callable:
+    """Helper function to build `slice_fn` for divide derived mutable."""
+
+    def fn():
+        # the divided mask is a prefix only if the source mask is.
+        if getattr(mutable, 'current_slice', None) is None:
+            return None
+        return slice(
+            0, _divide_and_divise(mutable.current_choice, ratio, divisor))
+
+    return fn
+
+
 def _concat_choice_fn(mutables: Iterable[MutableChannelProtocol]) -> Callable:
     """Helper function to build `choice_fn` for concat derived mutable."""
 
@@ -158,18 +190,23 @@ class DerivedMethodMixin:
                 f'Not support type of ratio: {type(expand_ratio)}')
 
         mask_fn: Optional[Callable] = None
+        slice_fn: Optional[Callable] = None
         if hasattr(self, 'current_mask'):
             if isinstance(expand_ratio, int):
                 mask_fn = _expand_mask_fn(self, expand_ratio=expand_ratio)
+                slice_fn = _expand_slice_fn(self, expand_ratio=expand_ratio)
             elif isinstance(expand_ratio, float):
                 mask_fn = _expand_mask_fn(self, expand_ratio=expand_ratio)
+                slice_fn = _expand_slice_fn(self, expand_ratio=expand_ratio)
             elif isinstance(expand_ratio, BaseMutable):
                 mask_fn = _expand_mask_fn(self, expand_ratio=current_ratio)
+                slice_fn = _expand_slice_fn(self, expand_ratio=current_ratio)
             else:
                 raise NotImplementedError(
                     f'Not support type of ratio: {type(expand_ratio)}')
 
-        return DerivedMutable(choice_fn=choice_fn, mask_fn=mask_fn)
+        return DerivedMutable(
+            choice_fn=choice_fn, mask_fn=mask_fn, slice_fn=slice_fn)
 
     def derive_divide_mutable(self: MutableProtocol,
                               ratio: Union[int, float, BaseMutable],
@@ -192,15 +229,21 @@ class DerivedMethodMixin:
                 f'Not support type of ratio: {type(ratio)}')
 
         mask_fn: Optional[Callable] = None
+        slice_fn: Optional[Callable] = None
         if isinstance(self, BaseMutableChannel) and hasattr(
                 self, 'current_mask'):
             mask_fn = _divide_mask_fn(
                 self, ratio=current_ratio, divisor=divisor)
+            slice_fn = _divide_slice_fn(
+                self, ratio=current_ratio, divisor=divisor)
         elif getattr(self, 'mask_fn', None):  # OneShotMutableChannel
             mask_fn = _divide_mask_fn(
                 self, ratio=current_ratio, divisor=divisor)
+            slice_fn = _divide_slice_fn(
+                self, ratio=current_ratio, divisor=divisor)
 
-        return DerivedMutable(choice_fn=choice_fn, mask_fn=mask_fn)
+        return DerivedMutable(
+            choice_fn=choice_fn, mask_fn=mask_fn, slice_fn=slice_fn)
 
     @staticmethod
     def derive_concat_mutable(
@@ -243,6 +286,9 @@ class DerivedMutable(BaseMutable, DerivedMethodMixin):
             ``BaseModule``. OpenMMLab has implement 5 initializer including
             `Constant`, `Xavier`, `Normal`, `Uniform`, `Kaiming`,
             and `Pretrained`. Defaults to None.
+        slice_fn (callable, optional): A closure that controls how to generate
+            `current_slice`, for the derived mutables whose masks are always
+            prefixes. Defaults to None.
 
     Examples:
         >>> from mmrazor.models.mutables import SquentialMutableChannel
@@ -264,11 +310,13 @@ class DerivedMutable(BaseMutable, DerivedMethodMixin):
                  mask_fn: Optional[Callable] = None,
                  source_mutables: Optional[Iterable[BaseMutable]] = None,
                  alias: Optional[str] = None,
-                 init_cfg: Optional[Dict] = None) -> None:
+                 init_cfg: Optional[Dict] = None,
+                 slice_fn: Optional[Callable] = None) -> None:
         super().__init__(alias, init_cfg)
 
         self.choice_fn = choice_fn
         self.mask_fn = mask_fn
+        self.slice_fn = slice_fn
 
         if source_mutables is None:
             source_mutables = self._trace_source_mutables()
@@ -393,6 +441,14 @@ class DerivedMutable(BaseMutable, DerivedMethodMixin):
         """
         raise RuntimeError('Mask of drived mutable can not be set.')
 
+    @property
+    def current_slice(self) -> Optional[slice]:
+        """Current slice of derived mutable, None if its mask may not be a
+        prefix."""
+        if self.slice_fn is None:
+            return None
+        return self.slice_fn()
+
     @staticmethod
     def _trace_source_mutables_from_closure(
             closure: Callable) -> Set[BaseMutable]:
@@ -1,6 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 """"""
 from abc import abstractmethod
+from typing import Optional
 
 import torch
 
@@ -41,6 +42,16 @@ class BaseMutableChannel(BaseMutable, DerivedMethodMixin):
         """Return a mask indicating the channel selection."""
         raise NotImplementedError()
 
+    @property
+    def current_slice(self) -> Optional[slice]:
+        """Return a slice of the channels if the activated channels are
+        contiguous from the first one, otherwise None.
+
+        Dynamic ops select their params with the slice as views instead of
+        gathering them with ``current_mask``.
+        """
+        return None
+
     @property
     def activated_channels(self) -> int:
         """Number of activated channels."""
@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
+from typing import Optional
 
 import torch
 
@@ -62,6 +63,27 @@ class MutableChannelContainer(BaseMutableChannel):
         """Return current mask."""
         return self.current_choice.bool()
 
+    @property
+    def current_slice(self) -> Optional[slice]:
+        """Return the slice of the activated channels if every stored
+        BaseMutableChannel has a slice, and only the last one activating any
+        channels may activate part of its channels."""
+        if len(self.mutable_channels) == 0:
+            return slice(0, self.num_channels)
+        self._fill_unregistered_range()
+        self._assert_mutables_valid()
+        num_activated = 0
+        for (start, _), mutable in self.mutable_channels.items():
+            mutable_slice = getattr(mutable, 'current_slice', None)
+            if mutable_slice is None:
+                return None
+            if mutable_slice.stop == 0:
+                continue
+            if num_activated < start:
+                return None
+            num_activated = start + mutable_slice.stop
+        return slice(0, num_activated)
+
     # basic extension
 
     def register_mutable(self, mutable_channel: BaseMutableChannel, start: int,
@@ -59,6 +59,12 @@ class SquentialMutableChannel(SimpleMutableChannel):
         """Return current mask."""
         return self.mask
 
+    @property
+    def current_slice(self) -> slice:
+        """Return the slice of the activated channels, which are always the
+        first ones."""
+        return slice(0, int(self.mask.sum().item()))
+
     # methods for
 
     def fix_chosen(self, chosen=...):
@@ -104,10 +110,21 @@ class SquentialMutableChannel(SimpleMutableChannel):
 
             return fn
 
+        def expand_slice_fn(mutable1: 'SquentialMutableChannel',
+                            mutable2: OneShotMutableValue) -> Callable:
+
+            def fn():
+                return slice(
+                    0,
+                    int(mutable1.current_choice * mutable2.current_choice))
+
+            return fn
+
         if isinstance(other, OneShotMutableValue):
             return DerivedMutable(
                 choice_fn=expand_choice_fn(self, other),
-                mask_fn=expand_mask_fn(self, other))
+                mask_fn=expand_mask_fn(self, other),
+                slice_fn=expand_slice_fn(self, other))
 
         raise TypeError(f'Unsupported type {type(other)} for mul!')
 
@@ -14,6 +14,7 @@ from mmrazor.registry import MODELS
 from mmrazor.structures.graph import ModuleGraph
 from ..base_mutator import BaseMutator
 from ..group_mixin import GroupMixin
+from .channel_unit_cache import ChannelUnitCache, get_model_fingerprint
 
 
 def is_dynamic_op_for_fx_tracer(module, name):
@@ -56,6 +57,12 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType], GroupMixin):
         init_cfg (dict, optional): initialization configuration dict for
             BaseModule.
 
+        unit_cache_dir (str, optional): The directory to cache the configs
+            of the units traced by the tracer in ``parse_cfg``, keyed by the
+            structural fingerprint of the supernet and ``parse_cfg``. If the
+            supernet has been traced, the units are initialized from the
+            cached config without tracing. Defaults to None, meaning no cache.
+
     Note:
         There are three ways used in ChannelMutator to parse a model and
         get MutableChannelUnits.
@@ -76,7 +83,8 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType], GroupMixin):
                      type='BackwardTracer',
                      loss_calculator=dict(type='ImageClassifierPseudoLoss')),
                  custom_groups: Optional[List[List[str]]] = None,
-                 init_cfg: Optional[Dict] = None) -> None:
+                 init_cfg: Optional[Dict] = None,
+                 unit_cache_dir: Optional[str] = None) -> None:
 
         super().__init__(init_cfg)
 
@@ -101,6 +109,9 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType], GroupMixin):
             custom_groups = []
         self._custom_groups = custom_groups
 
+        self.unit_cache = None if unit_cache_dir is None else \
+            ChannelUnitCache(unit_cache_dir)
+
     def prepare_from_supernet(self, supernet: Module) -> None:
         """Prepare from a model for pruning.
 
@@ -112,7 +123,7 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType], GroupMixin):
         self._name2module = dict(supernet.named_modules())
 
         if 'Tracer' in self.parse_cfg['type']:
-            units = self._prepare_from_tracer(supernet, self.parse_cfg)
+            units = self._prepare_from_unit_cache_or_tracer(supernet)
         elif self.parse_cfg['type'] == 'Config':
             units = self._prepare_from_cfg(supernet, self.units_cfg)
         elif self.parse_cfg['type'] == 'Predefined':
@@ -337,6 +348,32 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType], GroupMixin):
         units = self._convert_channel_unit_to_mutable(units)
         return units
 
+    def _prepare_from_unit_cache_or_tracer(self, model: Module):
+        """Initialize units from the unit cache if the model has been traced,
+        otherwise using a tracer and cache the traced units."""
+        if self.unit_cache is None:
+            return self._prepare_from_tracer(model, self.parse_cfg)
+
+        key = get_model_fingerprint(model, self.parse_cfg)
+        units_config = self.unit_cache.get(key)
+        if units_config is not None:
+            units = [
+                ChannelUnit.init_from_cfg(model, unit_config)
+                for unit_config in units_config.values()
+            ]
+            return self._convert_channel_unit_to_mutable(units)
+
+        units = self._prepare_from_tracer(model, self.parse_cfg)
+        # the units are cached as ChannelUnits, and the init args of the
+        # mutable units are applied by `_convert_channel_unit_to_mutable`.
+        units_config = {
+            unit.name: ChannelUnit.config_template(
+                unit, with_init_args=True, with_channels=True)
+            for unit in units
+        }
+        self.unit_cache.put(key, units_config)
+        return units
+
     def _prepare_from_cfg(self, model, config: Dict):
         """Initialize units using config dict."""
         assert isinstance(self.channel_unit_cfg, dict)
@@ -0,0 +1,79 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import hashlib
+import inspect
+import json
+import os
+import os.path as osp
+from typing import Dict, Optional
+
+import torch.nn as nn
+from mmengine import fileio
+from mmengine.dist import get_rank
+
+
+def get_model_fingerprint(model: nn.Module, parse_cfg: Dict) -> str:
+    """Get the structural fingerprint of ``model`` traced with
+    ``parse_cfg``.
+
+    It is the sha1 of the names, types and ``extra_repr`` of the modules, the
+    names and shapes of their parameters and buffers, the source code of the
+    module classes and ``parse_cfg``, but not the values of the weights.
+    """
+    sha1 = hashlib.sha1()
+    sha1.update(json.dumps(parse_cfg, sort_keys=True, default=str).encode())
+    sources: Dict[type, str] = dict()
+    for name, module in model.named_modules():
+        module_type = type(module)
+        if module_type not in sources:
+            try:
+                sources[module_type] = inspect.getsource(module_type)
+            except (OSError, TypeError):
+                sources[module_type] = ''
+        sha1.update(f'{name}:{module_type.__module__}.'
+                    f'{module_type.__qualname__}({module.extra_repr()})'.
+                    encode())
+        tensors = list(module.named_parameters(recurse=False)) + list(
+            module.named_buffers(recurse=False))
+        for tensor_name, tensor in tensors:
+            sha1.update(f'{tensor_name}:{tuple(tensor.shape)}'.encode())
+    for source in sources.values():
+        sha1.update(source.encode())
+    return sha1.hexdigest()
+
+
+class ChannelUnitCache:
+    """On-disk cache of the configs of the channel units traced from models.
+
+    The config of the units traced from a model, namely
+    ``{unit_name: unit.config_template(with_init_args=True,
+    with_channels=True)}`` of the ``ChannelUnit`` s, is dumped to
+    ``{cache_dir}/{fingerprint}.json``, where the fingerprint is got by
+    :func:`get_model_fingerprint`.
+
+    Note:
+        Only rank 0 writes the cache, and a file is written to a temporary
+        path first and then renamed, so that a partially written file is
+        never loaded by other jobs.
+
+    Args:
+        cache_dir (str): The directory of the cache.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = osp.expanduser(cache_dir)
+        if get_rank() == 0:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get the cached units config, return None if missing."""
+        path = osp.join(self.cache_dir, f'{key}.json')
+        return fileio.load(path) if osp.isfile(path) else None
+
+    def put(self, key: str, units_config: Dict) -> None:
+        """Cache the units config."""
+        if get_rank() != 0:
+            return
+        path = osp.join(self.cache_dir, f'{key}.json')
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        fileio.dump(units_config, tmp_path, file_format='json')
+        os.replace(tmp_path, path)
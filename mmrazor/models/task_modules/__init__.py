@@ -1,8 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .delivery import *  # noqa: F401,F403
-from .estimators import ResourceEstimator
+from .estimators import (LUTResourceEstimator, ResourceEstimator,
+                         ResourceScreener)
 from .predictor import *  # noqa: F401,F403
 from .recorder import *  # noqa: F401,F403
 from .tracer import *  # noqa: F401,F403
 
-__all__ = ['ResourceEstimator']
+__all__ = ['ResourceEstimator', 'LUTResourceEstimator', 'ResourceScreener']
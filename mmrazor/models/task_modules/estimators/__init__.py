@@ -1,5 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .counters import *  # noqa: F401,F403
+from .lut_resource_estimator import LUTResourceEstimator
 from .resource_estimator import ResourceEstimator
+from .resource_screener import ResourceScreener
 
-__all__ = ['ResourceEstimator']
+__all__ = ['ResourceEstimator', 'LUTResourceEstimator', 'ResourceScreener']
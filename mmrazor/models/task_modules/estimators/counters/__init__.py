@@ -1,6 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .flops_params_counter import get_model_flops_params
-from .latency_counter import get_model_latency
+from .latency_counter import (get_latency_stats, get_model_latency,
+                              measure_latencies)
 from .op_counters import *  # noqa: F401,F403
 
-__all__ = ['get_model_flops_params', 'get_model_latency']
+__all__ = [
+    'get_model_flops_params', 'get_model_latency', 'get_latency_stats',
+    'measure_latencies'
+]
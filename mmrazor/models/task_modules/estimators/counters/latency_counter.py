@@ -1,11 +1,14 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import logging
 import time
-from typing import Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import torch
 from mmengine.logging import print_log
 
+LATENCY_STATISTICS = ('mean', 'p50', 'p90', 'p99')
+
 
 def get_model_latency(model: torch.nn.Module,
                       input_shape: Tuple = (1, 3, 224, 224),
@@ -14,9 +17,15 @@ def get_model_latency(model: torch.nn.Module,
                       max_iter: int = 100,
                       num_warmup: int = 5,
                       log_interval: int = 100,
-                      repeat_num: int = 1) -> Union[float, str]:
+                      repeat_num: int = 1,
+                      num_threads: Optional[int] = None,
+                      statistic: str = 'mean',
+                      units: Optional[Dict] = None) -> Union[float, str]:
     """Repeat speed measure for multi-times to get more precise results.
 
+    Both GPU and CPU are supported, the device is the same as the parameters
+    of ``model``.
+
     Args:
         model (torch.nn.Module): The measured model.
         input_shape (tuple): Input shape (including batchsize) used for
@@ -32,31 +41,42 @@ def get_model_latency(model: torch.nn.Module,
             Default to 100.
         repeat_num (Optional[int]): Num of times to repeat the measurement.
             Default to 1.
+        num_threads (Optional[int]): Num of threads used on CPU during the
+            measurement. If None, the current setting of torch is used.
+            Default to None.
+        statistic (str): The statistic of latencies of iterations, one of
+            'mean', 'p50', 'p90' and 'p99'. Default to 'mean'.
+        units (Optional[dict]): Dict that contains the unit of latency, which
+            overrides ``unit`` if given. Default to None.
 
     Returns:
         latency (Union[float, str]): The measured inference speed of the model.
             if ``as_strings=True``, it will return latency in string format.
     """
     assert repeat_num >= 1
+    assert statistic in LATENCY_STATISTICS, \
+        f'`statistic` should be one of {LATENCY_STATISTICS}.'
+    if units and 'latency' in units:
+        unit = units['latency']
 
-    fps_list = []
-
+    latency_list = []
     for _ in range(repeat_num):
-        fps_list.append(
-            _get_model_latency(model, input_shape, max_iter, num_warmup,
-                               log_interval))
+        latencies = _get_model_latencies(model, input_shape, max_iter,
+                                         num_warmup, log_interval,
+                                         num_threads)
+        latency_list.append(get_latency_stats(latencies)[statistic])
 
-    latency = round(1000 / fps_list[0], 1)
+    latency = round(latency_list[0], 1)
 
     if repeat_num > 1:
-        _fps_list = [round(fps, 1) for fps in fps_list]
-        times_per_img_list = [round(1000 / fps, 1) for fps in fps_list]
+        _latency_list = [round(t, 1) for t in latency_list]
+        _fps_list = [round(1000 / t, 1) for t in latency_list]
         _mean_fps = sum(_fps_list) / len(_fps_list)
-        mean_times_per_img = sum(times_per_img_list) / len(times_per_img_list)
+        mean_times_per_img = sum(_latency_list) / len(_latency_list)
         print_log(
             f'Overall fps: {_fps_list}[{_mean_fps:.1f}] img / s, '
             f'times per image: '
-            f'{times_per_img_list}[{mean_times_per_img:.1f}] ms/img',
+            f'{_latency_list}[{mean_times_per_img:.1f}] ms/img',
             logger='current',
             level=logging.DEBUG)
         latency = mean_times_per_img
@@ -67,12 +87,88 @@ def get_model_latency(model: torch.nn.Module,
     return latency
 
 
-def _get_model_latency(model: torch.nn.Module,
-                       input_shape: Tuple = (1, 3, 224, 224),
-                       max_iter: int = 100,
-                       num_warmup: int = 5,
-                       log_interval: int = 100) -> float:
-    """Measure inference speed on GPU devices.
+def get_latency_stats(latencies: List[float]) -> Dict[str, float]:
+    """Get the mean and the p50/p90/p99 percentiles of ``latencies``."""
+    latencies_array = np.array(latencies)
+    stats = dict(mean=float(latencies_array.mean()))
+    for percentile in (50, 90, 99):
+        stats[f'p{percentile}'] = float(
+            np.percentile(latencies_array, percentile))
+    return stats
+
+
+def measure_latencies(func: Callable,
+                      inputs: Tuple,
+                      max_iter: int = 100,
+                      num_warmup: int = 5,
+                      num_threads: Optional[int] = None,
+                      log_interval: int = 0) -> List[float]:
+    """Measure the latency of ``func(*inputs)`` in each iteration.
+
+    The inputs are pre-allocated and reused by all iterations. CUDA is
+    synchronized before and after each iteration if any input is on GPU.
+
+    Args:
+        func (Callable): The measured function, e.g. a model or an op.
+        inputs (tuple): The pre-allocated inputs of ``func``.
+        max_iter (int): Max iteration num for the measurement, including the
+            warm-up stage. Default to 100.
+        num_warmup (int): Iteration num for warm-up stage. Default to 5.
+        num_threads (Optional[int]): Num of threads used on CPU. If None, the
+            current setting of torch is used. Default to None.
+        log_interval (int): Interval num for logging the results, 0 means no
+            logging. Default to 0.
+
+    Returns:
+        List[float]: The latencies (ms) of the iterations after warm-up.
+    """
+    assert max_iter > num_warmup, \
+        '`max_iter` should be larger than `num_warmup`.'
+    is_cuda = any(
+        isinstance(input, torch.Tensor) and input.is_cuda for input in inputs)
+
+    origin_num_threads = torch.get_num_threads()
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+
+    latencies = []
+    try:
+        with torch.no_grad():
+            for i in range(max_iter):
+                if is_cuda:
+                    torch.cuda.synchronize()
+                start_time = time.perf_counter()
+
+                func(*inputs)
+
+                if is_cuda:
+                    torch.cuda.synchronize()
+                elapsed = time.perf_counter() - start_time
+
+                if i < num_warmup:
+                    continue
+                latencies.append(elapsed * 1000)
+                if log_interval > 0 and (i + 1) % log_interval == 0:
+                    mean_latency = sum(latencies) / len(latencies)
+                    print_log(
+                        f'Done image [{i + 1:<3}/ {max_iter}], '
+                        f'fps: {1000 / mean_latency:.1f} img / s, '
+                        f'times per image: {mean_latency:.1f} ms / img',
+                        logger='current',
+                        level=logging.DEBUG)
+    finally:
+        torch.set_num_threads(origin_num_threads)
+
+    return latencies
+
+
+def _get_model_latencies(model: torch.nn.Module,
+                         input_shape: Tuple = (1, 3, 224, 224),
+                         max_iter: int = 100,
+                         num_warmup: int = 5,
+                         log_interval: int = 100,
+                         num_threads: Optional[int] = None) -> List[float]:
+    """Measure the inference latencies of ``model`` on its device.
 
     Args:
         model (torch.nn.Module): The measured model.
@@ -84,52 +180,26 @@ def _get_model_latency(model: torch.nn.Module,
             Default to 5.
         log_interval (Optional[int]): Interval num for logging the results.
             Default to 100.
+        num_threads (Optional[int]): Num of threads used on CPU. If None, the
+            current setting of torch is used. Default to None.
 
     Returns:
-        fps (float): The measured inference speed of the model.
+        List[float]: The latencies (ms) of the iterations after warm-up.
     """
-    # the first several iterations may be very slow so skip them
-    pure_inf_time = 0.0
-    fps = 0.0
-    data = dict()
-    if next(model.parameters()).is_cuda:
-        device = 'cuda'
-    else:
-        raise NotImplementedError('To use cpu to test latency not supported.')
-
-    # benchmark with {max_iter} image and take the average
-    for i in range(1, max_iter):
-        if device == 'cuda':
-            data = torch.rand(input_shape).cuda()
-        torch.cuda.synchronize()
-        start_time = time.perf_counter()
-
-        with torch.no_grad():
-            model(data)
-
-        torch.cuda.synchronize()
-        elapsed = time.perf_counter() - start_time
-
-        if i >= num_warmup:
-            pure_inf_time += elapsed
-            if (i + 1) % log_interval == 0:
-                fps = (i + 1 - num_warmup) / pure_inf_time
-                print_log(
-                    f'Done image [{i + 1:<3}/ {max_iter}], '
-                    f'fps: {fps:.1f} img / s, '
-                    f'times per image: {1000 / fps:.1f} ms / img',
-                    logger='current',
-                    level=logging.DEBUG)
-
-        if (i + 1) == max_iter:
-            fps = (i + 1 - num_warmup) / pure_inf_time
-            print_log(
-                f'Overall fps: {fps:.1f} img / s, '
-                f'times per image: {1000 / fps:.1f} ms / img',
-                logger='current',
-                level=logging.DEBUG)
-            break
-
-        torch.cuda.empty_cache()
-
-    return fps
+    try:
+        device = next(model.parameters()).device
+    except StopIteration:
+        device = torch.device('cpu')
+    data = torch.rand(input_shape, device=device)
+
+    latencies = measure_latencies(model, (data, ), max_iter, num_warmup,
+                                  num_threads, log_interval)
+    stats = get_latency_stats(latencies)
+    print_log(
+        f'Overall fps: {1000 / stats["mean"]:.1f} img / s, '
+        f'times per image: {stats["mean"]:.1f} ms / img, '
+        f'p50/p90/p99: {stats["p50"]:.1f}/{stats["p90"]:.1f}/'
+        f'{stats["p99"]:.1f} ms',
+        logger='current',
+        level=logging.DEBUG)
+    return latencies
@@ -13,7 +13,6 @@ class ConvCounter(BaseCounter):
     def add_count_hook(module, input, output):
         """Calculate FLOPs and params based on the size of input & output."""
         # Can have multiple inputs, getting the first one
-        import pdb;pdb.set_trace()
         input = input[0]
 
         batch_size = input.shape[0]
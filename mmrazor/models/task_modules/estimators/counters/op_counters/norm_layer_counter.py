@@ -12,7 +12,6 @@ class BNCounter(BaseCounter):
     @staticmethod
     def add_count_hook(module, input, output):
         """Calculate FLOPs and params based on the size of input & output."""
-        import pdb;pdb.set_trace()
         input = input[0]
         batch_flops = np.prod(input.shape)
         if getattr(module, 'affine', False):
@@ -0,0 +1,695 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from mmrazor.registry import TASK_UTILS
+from .counters import get_latency_stats, get_model_latency, measure_latencies
+from .counters.flops_params_counter import (get_counter_type,
+                                            is_supported_instance,
+                                            params_units_convert)
+from .resource_estimator import ResourceEstimator
+
+
+def _get_num_channels(module: nn.Module, attr: str, default: int,
+                      cache: Dict[int, int]) -> int:
+    """Get the number of activated channels of ``module.mutable_attrs[attr]``.
+
+    The results are cached by the id of mutable, since one mutable channel is
+    usually shared by several dynamic ops (e.g. conv -> bn -> conv).
+    """
+    mutable_attrs = getattr(module, 'mutable_attrs', None)
+    if mutable_attrs is None or attr not in mutable_attrs:
+        return default
+    mutable = mutable_attrs[attr]
+    key = id(mutable)
+    if key not in cache:
+        num_channels = getattr(mutable, 'activated_channels', None)
+        if num_channels is None:
+            num_channels = mutable.current_mask.sum().item()
+        cache[key] = int(num_channels)
+    return cache[key]
+
+
+def _conv_flops_params(module: nn.Module, record: Dict,
+                       cache: Dict[int, int]) -> Tuple[float, int]:
+    """FLOPs and params of ``DynamicConvMixin``, same as ``ConvCounter``."""
+    in_channels = _get_num_channels(module, 'in_channels', module.in_channels,
+                                    cache)
+    out_channels = _get_num_channels(module, 'out_channels',
+                                     module.out_channels, cache)
+    kernel_dims = record['kernel_dims']
+    if 'kernel_size' in module.mutable_attrs:
+        kernel_size = module.mutable_attrs['kernel_size'].current_choice
+        kernel_dims = (kernel_size, ) * len(kernel_dims)
+
+    groups = module.groups
+    if groups == module.in_channels == module.out_channels:
+        # depth-wise conv, the static conv has `groups == in_channels`
+        groups = in_channels
+
+    conv_per_position_flops = \
+        int(np.prod(kernel_dims)) * in_channels * out_channels / groups
+    flops = conv_per_position_flops * record['out_elements']
+    params = conv_per_position_flops
+    if module.bias is not None:
+        flops += out_channels * record['out_elements']
+        params += out_channels
+    return flops, int(params)
+
+
+def _linear_flops_params(module: nn.Module, record: Dict,
+                         cache: Dict[int, int]) -> Tuple[float, int]:
+    """FLOPs and params of ``DynamicLinearMixin``, same as
+    ``LinearCounter``."""
+    in_features = _get_num_channels(module, 'in_features', module.in_features,
+                                    cache)
+    out_features = _get_num_channels(module, 'out_features',
+                                     module.out_features, cache)
+    flops = record['num_rows'] * in_features * out_features
+    params = in_features * out_features
+    if module.bias is not None:
+        params += out_features
+    return flops, params
+
+
+def _norm_flops_params(module: nn.Module, record: Dict,
+                       cache: Dict[int, int]) -> Tuple[float, int]:
+    """FLOPs and params of ``DynamicBatchNormMixin`` and
+    ``DynamicLayerNormMixin``, same as ``BNCounter``."""
+    num_features = _get_num_channels(module, 'num_features',
+                                     record['num_features'], cache)
+    flops = num_features * record['elements_per_feature']
+    params = 0
+    if record['affine']:
+        flops *= 2
+        params = 2 * num_features
+    return flops, params
+
+
+def _mha_flops_params(module: nn.Module, record: Dict,
+                      cache: Dict[int, int]) -> Tuple[float, int]:
+    """FLOPs and params of ``DynamicMultiheadAttention``.
+
+    The FLOPs include the q/k/v projections, the two attention matmuls and the
+    output projection.
+    """
+    embed_dims = _get_num_channels(module, 'embed_dims', module.embed_dims,
+                                   cache)
+    q_embed_dims = _get_num_channels(module, 'q_embed_dims',
+                                     module.q_embed_dims, cache)
+    num_tokens = record['num_tokens']
+
+    qkv_flops = 3 * num_tokens * embed_dims * q_embed_dims
+    attn_flops = 2 * num_tokens * num_tokens * q_embed_dims
+    proj_flops = num_tokens * q_embed_dims * embed_dims
+    flops = qkv_flops + attn_flops + proj_flops
+    params = 3 * (embed_dims * q_embed_dims + q_embed_dims) + \
+        q_embed_dims * embed_dims + embed_dims
+    return flops, params
+
+
+def _patch_embed_flops_params(module: nn.Module, record: Dict,
+                              cache: Dict[int, int]) -> Tuple[float, int]:
+    """FLOPs and params of ``DynamicPatchEmbed``."""
+    embed_dims = _get_num_channels(module, 'embed_dims', module.embed_dims,
+                                   cache)
+    conv_per_position_flops = record['kernel_elements'] * embed_dims
+    flops = conv_per_position_flops * record['out_elements']
+    params = conv_per_position_flops
+    if record['bias']:
+        flops += embed_dims * record['out_elements']
+        params += embed_dims
+    return flops, params
+
+
+def _static_flops_params(module: nn.Module, record: Dict,
+                         cache: Dict[int, int]) -> Tuple[float, int]:
+    """FLOPs and params of layers counted by the registered counters.
+
+    The FLOPs of parameter-free layers (e.g. activations and pooling) are
+    proportional to their input channels, so they are scaled by the activated
+    output channels of the dynamic layer producing their input. Other layers
+    are counted as recorded.
+    """
+    source = record.get('channel_source')
+    if source is None:
+        return record['flops'], record['params']
+    attr, num_channels, _ = source['out_channels']
+    activated_channels = _get_num_channels(source['module'], attr,
+                                           num_channels, cache)
+    flops = record['flops'] * activated_channels / num_channels
+    return flops, record['params']
+
+
+@TASK_UTILS.register_module()
+class LUTResourceEstimator(ResourceEstimator):
+    """Estimator for calculating the FLOPs and params of dynamic supernets
+    with a lookup table.
+
+    ``ResourceEstimator`` runs a full forward pass with counter hooks for
+    every estimation. For dynamic ops, the FLOPs and params are closed-form
+    functions of the activated channels, the kernel size and the spatial size,
+    and only the spatial size requires a forward pass. ``LUTResourceEstimator``
+    records the geometry of every layer with one forward pass the first time
+    a model is estimated, then computes the resources of the current subnet
+    in pure Python by reading the activated channels of the mutables.
+
+    Supported dynamic ops are ``DynamicConvMixin`` (including BigNAS/OFA
+    kernel size), ``DynamicLinearMixin``, ``DynamicBatchNormMixin``,
+    ``DynamicLayerNormMixin``, ``DynamicMultiheadAttention`` and
+    ``DynamicPatchEmbed``. Layers skipped by the depth of
+    ``DynamicSequential`` are not counted. Other layers with a registered
+    counter are counted with the resources recorded in the lookup table,
+    where the FLOPs of parameter-free layers (e.g. ``nn.ReLU`` and pooling)
+    are scaled by the activated output channels of the dynamic layer whose
+    output is their input, directly or through other parameter-free layers.
+    The inputs merged by tensor operations (e.g. the residual addition and
+    ``torch.cat``) have no such dynamic layer, and are counted as recorded.
+
+    If ``latency_lut`` is True, the latency is estimated with a per-layer
+    latency lookup table: each activated layer is converted to a standalone
+    op with its activated configuration (e.g. channels and kernel size),
+    which is measured only once and recorded, then the latencies of layers
+    are summed up for each subnet. Conv, linear and norm layers are measured
+    as static ``torch.nn`` ops, other layers are measured as they are.
+
+    Note:
+        The spatial sizes are recorded once, so mutables changing the input
+        resolution are not supported. Call :meth:`reset` after changing the
+        structure of the estimated model.
+
+    Note:
+        The latency lookup table ignores the overhead between layers (e.g.
+        the python overhead and the memory layout transforms) and the
+        latency of parameter-free layers is recorded with the input shape of
+        the supernet, so it is for ranking and screening subnets rather than
+        reporting the deployed latency.
+
+    Args:
+        input_shape (tuple): Input data's default shape, for calculating
+            resources consume. Defaults to (1, 3, 224, 224).
+        units (dict): Dict that contains converted FLOPs/params/latency units.
+            Default to dict(flops='M', params='M', latency='ms').
+        as_strings (bool): Output FLOPs/params/latency counts in a string
+            form. Default to False.
+        flops_params_cfg (dict): Cfg for estimating FLOPs and parameters.
+            Only ``input_shape``, ``input_constructor`` and
+            ``disabled_counters`` are used. Default to None.
+        latency_cfg (dict): Cfg for estimating latency. If ``latency_lut`` is
+            True, latency is estimated as long as ``latency_cfg`` is given
+            when building or estimating. Default to None.
+        latency_lut (bool): Whether to estimate latency with the per-layer
+            latency lookup table. Default to False.
+
+    Examples:
+        >>> estimator = LUTResourceEstimator(input_shape=(1, 3, 224, 224))
+        >>> model.set_subnet(subnet)
+        >>> estimator.estimate(model=model.architecture)
+        {'flops': 330.0, 'params': 3.2, 'latency': 0.0}
+    """
+
+    _lut_compute_funcs: Dict[str, Callable] = {
+        'mha': _mha_flops_params,
+        'patch_embed': _patch_embed_flops_params,
+        'conv': _conv_flops_params,
+        'linear': _linear_flops_params,
+        'norm': _norm_flops_params,
+        'static': _static_flops_params,
+    }
+
+    def __init__(
+        self,
+        input_shape: Tuple = (1, 3, 224, 224),
+        units: Dict = dict(flops='M', params='M', latency='ms'),
+        as_strings: bool = False,
+        flops_params_cfg: Optional[dict] = None,
+        latency_cfg: Optional[dict] = None,
+        latency_lut: bool = False,
+    ):
+        super().__init__(input_shape, units, as_strings, flops_params_cfg,
+                         latency_cfg)
+        self.latency_lut = latency_lut
+        self._tables: Dict[Tuple, List[Dict]] = dict()
+        self._latency_table: Dict[Tuple, float] = dict()
+
+    def reset(self) -> None:
+        """Drop all recorded lookup tables of models.
+
+        The latency lookup table is kept, since it is keyed by the
+        configurations of ops rather than models.
+        """
+        self._tables = dict()
+
+    def estimate(self,
+                 model: torch.nn.Module,
+                 flops_params_cfg: dict = None,
+                 latency_cfg: dict = None) -> Dict[str, Union[float, str]]:
+        """Estimate the resources(flops/params/latency) of the current subnet
+        of the given model.
+
+        Args:
+            model: The measured model.
+            flops_params_cfg (dict): Cfg for estimating FLOPs and parameters.
+                Default to None.
+            latency_cfg (dict): Cfg for estimating latency. Default to None.
+
+        Returns:
+            Dict[str, Union[float, str]]): A dict that contains the resource
+                results(FLOPs, params and latency).
+        """
+        if flops_params_cfg:
+            flops_params_cfg = {**self.flops_params_cfg, **flops_params_cfg}
+            self._check_flops_params_cfg(flops_params_cfg)
+        else:
+            flops_params_cfg = self.flops_params_cfg
+        flops_params_cfg = self._set_default_resource_params(
+            dict(flops_params_cfg))
+
+        table = self.get_table(model, flops_params_cfg)
+        flops, params = self.estimate_from_table(table)
+
+        units = flops_params_cfg['units']
+        if units is not None:
+            flops = params_units_convert(flops, units['flops'])
+            params = params_units_convert(params, units['params'])
+        if flops_params_cfg['as_strings']:
+            flops = str(flops) + (' ' + units['flops'] +
+                                  'FLOPs' if units else ' FLOPs')
+            params = str(params) + (' ' + units['params'] if units else '')
+
+        if latency_cfg or (self.latency_lut and self.latency_cfg):
+            latency_cfg = {**self.latency_cfg, **(latency_cfg or dict())}
+            self._check_latency_cfg(latency_cfg)
+            latency_cfg = self._set_default_resource_params(latency_cfg)
+            if self.latency_lut:
+                latency = self.estimate_latency_from_table(
+                    model, table, latency_cfg)
+                if latency_cfg['as_strings']:
+                    unit = units['latency'] if units else 'ms'
+                    latency = str(latency) + ' ' + unit  # type: ignore
+            else:
+                latency = get_model_latency(model, **latency_cfg)
+        else:
+            latency = '0.0 ms' if self.as_strings else 0.0  # type: ignore
+
+        return dict(flops=flops, params=params, latency=latency)
+
+    def get_table(self, model: nn.Module, flops_params_cfg: Dict) -> List:
+        """Get the lookup table of ``model``, build it if not recorded."""
+        key = (id(model), tuple(flops_params_cfg['input_shape']))
+        if key not in self._tables:
+            self._tables[key] = self.build_table(model, flops_params_cfg)
+        return self._tables[key]
+
+    @staticmethod
+    def estimate_from_table(table: List[Dict]) -> Tuple[float, int]:
+        """Sum up the FLOPs (per sample) and params of the layers in
+        ``table`` which are activated by the current subnet."""
+        flops, params = 0., 0
+        for layer_flops, layer_params in \
+                LUTResourceEstimator.estimate_layers(table):
+            flops += layer_flops
+            params += layer_params
+        return flops, params
+
+    @staticmethod
+    def estimate_layers(table: List[Dict]) -> List[Tuple[float, int]]:
+        """Get the FLOPs (per sample) and params of each layer in ``table``
+        with the current subnet, inactivated layers are zeros."""
+        cache: Dict[int, int] = dict()
+        results = []
+        for record in table:
+            if not LUTResourceEstimator._is_activated(record):
+                results.append((0., 0))
+            else:
+                compute_func = \
+                    LUTResourceEstimator._lut_compute_funcs[record['kind']]
+                results.append(compute_func(record['module'], record, cache))
+        return results
+
+    def estimate_latency_from_table(self, model: nn.Module, table: List[Dict],
+                                    latency_cfg: Dict) -> float:
+        """Sum up the latencies (ms) of the layers in ``table`` which are
+        activated by the current subnet.
+
+        The latency of each op configuration is measured only once and
+        recorded in the latency lookup table.
+        """
+        statistic = latency_cfg.get('statistic', 'mean')
+        measure_kwargs = {
+            k: latency_cfg[k]
+            for k in ['max_iter', 'num_warmup', 'num_threads']
+            if k in latency_cfg
+        }
+        measure_key = (statistic, ) + tuple(sorted(measure_kwargs.items()))
+
+        cache: Dict[int, int] = dict()
+        latency = 0.
+        training = model.training
+        model.eval()
+        try:
+            for record in table:
+                if 'input_shape' not in record or \
+                        not self._is_activated(record):
+                    continue
+                op_key, op, input = self._build_latency_op(record, cache)
+                key = op_key + measure_key
+                if key not in self._latency_table:
+                    latencies = measure_latencies(op, (input, ),
+                                                  **measure_kwargs)
+                    self._latency_table[key] = \
+                        get_latency_stats(latencies)[statistic]
+                latency += self._latency_table[key]
+        finally:
+            model.train(training)
+        return round(latency, 3)
+
+    @staticmethod
+    def _build_latency_op(
+            record: Dict,
+            cache: Dict[int, int]) -> Tuple[Tuple, Callable, torch.Tensor]:
+        """Build the standalone op and its input of the layer in
+        ``record`` with the current subnet.
+
+        Returns:
+            Tuple[Tuple, Callable, torch.Tensor]: The key of the op
+                configuration, the op and its input.
+        """
+        # Avoid circular import
+        from mmrazor.models.architectures.dynamic_ops import \
+            DynamicLayerNormMixin
+
+        module, kind = record['module'], record['kind']
+        input_shape = list(record['input_shape'])
+        op: nn.Module
+        if kind == 'conv':
+            in_channels = _get_num_channels(module, 'in_channels',
+                                            module.in_channels, cache)
+            out_channels = _get_num_channels(module, 'out_channels',
+                                             module.out_channels, cache)
+            kernel_dims = tuple(module.kernel_size)
+            padding = tuple(module.padding)
+            if 'kernel_size' in module.mutable_attrs:
+                kernel_size = \
+                    module.mutable_attrs['kernel_size'].current_choice
+                kernel_dims = (kernel_size, ) * len(kernel_dims)
+                padding = tuple((kernel_size - 1) // 2 * dilation
+                                for dilation in module.dilation)
+            groups = module.groups
+            if groups == module.in_channels == module.out_channels:
+                groups = in_channels
+            input_shape[1] = in_channels
+            config = (in_channels, out_channels, kernel_dims,
+                      tuple(module.stride), padding, tuple(module.dilation),
+                      groups, module.bias is not None)
+            conv_type = {
+                1: nn.Conv1d,
+                2: nn.Conv2d,
+                3: nn.Conv3d
+            }[len(kernel_dims)]
+            op = conv_type(
+                in_channels,
+                out_channels,
+                kernel_dims,
+                stride=module.stride,
+                padding=padding,
+                dilation=module.dilation,
+                groups=groups,
+                bias=module.bias is not None)
+        elif kind == 'linear':
+            in_features = _get_num_channels(module, 'in_features',
+                                            module.in_features, cache)
+            out_features = _get_num_channels(module, 'out_features',
+                                             module.out_features, cache)
+            input_shape[-1] = in_features
+            config = (in_features, out_features, module.bias is not None)
+            op = nn.Linear(
+                in_features, out_features, bias=module.bias is not None)
+        elif kind == 'norm':
+            num_features = _get_num_channels(module, 'num_features',
+                                             record['num_features'], cache)
+            config = (type(module).__name__, num_features, record['affine'])
+            if isinstance(module, DynamicLayerNormMixin):
+                input_shape[-1] = num_features
+                op = nn.LayerNorm(
+                    num_features, elementwise_affine=record['affine'])
+            else:
+                input_shape[1] = num_features
+                bn_type = {
+                    2: nn.BatchNorm1d,
+                    3: nn.BatchNorm1d,
+                    4: nn.BatchNorm2d,
+                    5: nn.BatchNorm3d
+                }[len(input_shape)]
+                op = bn_type(num_features, affine=record['affine'])
+        else:
+            # other layers are measured as they are.
+            if kind == 'mha':
+                input_shape[-1] = _get_num_channels(module, 'embed_dims',
+                                                    module.embed_dims, cache)
+            mutable_attrs = getattr(module, 'mutable_attrs', dict())
+            config = (id(module), ) + tuple(
+                str(mutable.current_choice)
+                for mutable in mutable_attrs.values())
+            op = module
+
+        device = record['input_device']
+        if op is not module:
+            op = op.to(device).eval()
+        input = torch.rand(input_shape, device=device)
+        key = (kind, config, tuple(input_shape))
+        return key, op, input
+
+    @staticmethod
+    def _is_activated(record: Dict) -> bool:
+        """Whether the layer is kept by all its parent dynamic sequentials."""
+        for sequential, index in record['depth_deps']:
+            depth = sequential.get_current_choice(sequential.mutable_depth)
+            if index >= depth:
+                return False
+        return True
+
+    @torch.no_grad()
+    def build_table(self, model: nn.Module,
+                    flops_params_cfg: Dict) -> List[Dict]:
+        """Record the geometry of each layer with one forward pass.
+
+        All ``DynamicSequential`` are temporarily set to their max depth, so
+        that every layer of the supernet is recorded.
+        """
+        table: List[Dict] = []
+        handles = []
+        batch_size = flops_params_cfg['input_shape'][0]
+        disabled_counters = flops_params_cfg.get('disabled_counters', [])
+
+        depth_deps: Dict[nn.Module, List] = dict()
+        self._collect_depth_deps(model, [], depth_deps)
+        # the dynamic layer producing each output, keyed by the id of the
+        # output and with a weak reference to check that it is still alive.
+        channel_sources: Dict[int, Tuple[weakref.ref, Dict]] = dict()
+
+        def register(module: nn.Module, kind: str) -> None:
+            record = dict(
+                module=module,
+                kind=kind,
+                depth_deps=depth_deps.get(module, []))
+
+            def hook(module, inputs, outputs):
+                self._record_geometry(record, module, inputs, outputs,
+                                      batch_size)
+                if kind != 'static':
+                    source = record
+                elif record['params'] == 0:
+                    source = self._record_channel_source(
+                        record, inputs, channel_sources)
+                else:
+                    source = None
+                if source is not None and isinstance(outputs, torch.Tensor):
+                    channel_sources[id(outputs)] = (weakref.ref(outputs),
+                                                    source)
+
+            handles.append(module.register_forward_hook(hook))
+            table.append(record)
+
+        def traverse(module: nn.Module) -> None:
+            kind = self._get_lut_kind(module)
+            if kind is not None:
+                register(module, kind)
+                return
+            if is_supported_instance(module):
+                if get_counter_type(module) not in disabled_counters:
+                    register(module, 'static')
+                return
+            for child in module.children():
+                traverse(child)
+
+        traverse(model)
+
+        # expand all dynamic sequentials to record every layer.
+        origin_depths = []
+        for sequential in self._get_dynamic_sequentials(model):
+            mutable_depth = sequential.mutable_depth
+            origin_depths.append((mutable_depth, mutable_depth.current_choice))
+            mutable_depth.current_choice = mutable_depth.max_choice
+
+        training = model.training
+        model.eval()
+        try:
+            input_constructor = flops_params_cfg.get('input_constructor')
+            if input_constructor:
+                model(**input_constructor(flops_params_cfg['input_shape']))
+            else:
+                try:
+                    param = next(model.parameters())
+                    batch = torch.ones(()).new_empty(
+                        tuple(flops_params_cfg['input_shape']),
+                        dtype=param.dtype,
+                        device=param.device)
+                except StopIteration:
+                    batch = torch.ones(()).new_empty(
+                        tuple(flops_params_cfg['input_shape']))
+                model(batch)
+        finally:
+            for handle in handles:
+                handle.remove()
+            for mutable_depth, depth in origin_depths:
+                mutable_depth.current_choice = depth
+            model.train(training)
+
+        # layers never called in forward are not counted.
+        return [record for record in table if 'recorded' in record]
+
+    @staticmethod
+    def _get_lut_kind(module: nn.Module) -> Optional[str]:
+        """Get the kind of closed-form formula used for ``module``."""
+        # Avoid circular import
+        from mmrazor.models.architectures.dynamic_ops import (
+            DynamicBatchNormMixin, DynamicConvMixin, DynamicLayerNormMixin,
+            DynamicLinearMixin, DynamicMultiheadAttention, DynamicPatchEmbed,
+            FuseConv2d)
+
+        if isinstance(module, DynamicMultiheadAttention):
+            return 'mha'
+        if isinstance(module, DynamicPatchEmbed):
+            return 'patch_embed'
+        if isinstance(module, DynamicConvMixin) and \
+                not isinstance(module, FuseConv2d):
+            return 'conv'
+        if isinstance(module, DynamicLinearMixin):
+            return 'linear'
+        if isinstance(module, (DynamicBatchNormMixin, DynamicLayerNormMixin)):
+            return 'norm'
+        return None
+
+    @staticmethod
+    def _record_geometry(record: Dict, module: nn.Module, inputs: Any,
+                         outputs: Any, batch_size: int) -> None:
+        """Record the geometry of ``module`` (per sample) in ``record``."""
+        kind = record['kind']
+        input = inputs[0] if len(inputs) > 0 else None
+        if isinstance(input, torch.Tensor):
+            record['input_shape'] = tuple(input.shape)
+            record['input_device'] = input.device
+        if kind == 'conv':
+            record['kernel_dims'] = tuple(module.kernel_size)
+            record['out_elements'] = int(np.prod(outputs.shape[2:]))
+            record['out_channels'] = ('out_channels', module.out_channels, 1)
+        elif kind == 'linear':
+            record['num_rows'] = int(np.prod(input.shape[:-1])) // batch_size
+            record['out_channels'] = ('out_features', module.out_features,
+                                      -1)
+        elif kind == 'norm':
+            # Avoid circular import
+            from mmrazor.models.architectures.dynamic_ops import \
+                DynamicLayerNormMixin
+            if isinstance(module, DynamicLayerNormMixin):
+                feature_dim = -1
+                affine = module.elementwise_affine
+            else:
+                feature_dim = 1
+                affine = module.affine
+            record['num_features'] = module.num_features
+            record['elements_per_feature'] = \
+                input.numel() // batch_size // input.size(feature_dim)
+            record['affine'] = bool(affine)
+            record['out_channels'] = ('num_features', module.num_features,
+                                      feature_dim)
+        elif kind == 'mha':
+            record['num_tokens'] = input.shape[1]
+            record['out_channels'] = ('embed_dims', module.embed_dims, -1)
+        elif kind == 'patch_embed':
+            projection = module.projection
+            record['kernel_elements'] = \
+                int(np.prod(projection.kernel_size)) * \
+                projection.in_channels // projection.groups
+            record['out_elements'] = outputs.shape[1]
+            record['bias'] = projection.bias is not None
+            record['out_channels'] = ('embed_dims', module.embed_dims, -1)
+        else:
+            counter = TASK_UTILS.build(
+                dict(type=get_counter_type(module), _scope_='mmrazor'))
+            module.__flops__, module.__params__ = 0, 0
+            counter.add_count_hook(module, inputs, outputs)
+            record['flops'] = module.__flops__ / batch_size
+            record['params'] = module.__params__
+            del module.__flops__, module.__params__
+        record['recorded'] = True
+
+    @staticmethod
+    def _record_channel_source(
+            record: Dict, inputs: Any,
+            channel_sources: Dict[int, Tuple[weakref.ref, Dict]]
+    ) -> Optional[Dict]:
+        """Record the dynamic layer producing the input of the
+        parameter-free layer in ``record`` as its channel source.
+
+        Returns:
+            dict, optional: The record of the dynamic layer, or None if the
+            input is not produced by a dynamic layer, or its channels do not
+            match the output channels of the dynamic layer.
+        """
+        input = inputs[0] if len(inputs) > 0 else None
+        if not isinstance(input, torch.Tensor) or input.dim() < 2:
+            return None
+        ref, source = channel_sources.get(id(input), (None, None))
+        if ref is None or ref() is not input:
+            return None
+        _, num_channels, dim = source['out_channels']
+        if input.size(dim) != num_channels:
+            return None
+        record['channel_source'] = source
+        return source
+
+    @staticmethod
+    def _get_dynamic_sequentials(model: nn.Module) -> List[nn.Module]:
+        """Get all ``DynamicSequential`` with mutable depth in ``model``."""
+        # Avoid circular import
+        from mmrazor.models.architectures.dynamic_ops import DynamicSequential
+        return [
+            module for module in model.modules()
+            if isinstance(module, DynamicSequential)
+            and 'depth' in module.mutable_attrs
+        ]
+
+    @staticmethod
+    def _collect_depth_deps(module: nn.Module, deps: List,
+                            depth_deps: Dict[nn.Module, List]) -> None:
+        """Collect the parent ``DynamicSequential`` (and the index in it) of
+        each module."""
+        # Avoid circular import
+        from mmrazor.models.architectures.dynamic_ops import DynamicSequential
+        depth_deps[module] = deps
+        if isinstance(module, DynamicSequential) and \
+                'depth' in module.mutable_attrs:
+            for index, child in enumerate(module.pure_modules()):
+                LUTResourceEstimator._collect_depth_deps(
+                    child, deps + [(module, index)], depth_deps)
+        else:
+            for child in module.children():
+                if child not in depth_deps:
+                    LUTResourceEstimator._collect_depth_deps(
+                        child, deps, depth_deps)
@@ -0,0 +1,270 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch.nn as nn
+
+from mmrazor.registry import TASK_UTILS
+from .lut_resource_estimator import LUTResourceEstimator
+
+
+def _units_convert(values: np.ndarray,
+                   units: Optional[str] = 'M',
+                   precision: int = 3) -> np.ndarray:
+    """Vectorized version of ``params_units_convert``."""
+    if units is None:
+        return values
+    if units == 'G':
+        return np.round(values / 10.**9, precision)
+    elif units == 'M':
+        return np.round(values / 10.**6, precision)
+    elif units == 'K':
+        return np.round(values / 10.**3, precision)
+    else:
+        raise ValueError(f'Unsupported units convert: {units}')
+
+
+@TASK_UTILS.register_module()
+class ResourceScreener:
+    """Screen a population of candidates with resources constraints in one
+    vectorized call.
+
+    A population is encoded as an ``N x D`` int matrix, where ``D`` is the
+    number of keys in the search space and each element is the index of the
+    choice, the same as the ``normal_vector`` of
+    :meth:`MetricPredictor.model2vector`.
+
+    When preparing, the lookup table of :class:`LUTResourceEstimator` is
+    probed to find the keys that each layer depends on. Layers depending on
+    the same keys are merged into one table indexed by the choices of these
+    keys, so the FLOPs and params of a population are computed by a few
+    NumPy gathers, without calling ``set_subnet`` for each candidate.
+
+    Note:
+        A layer usually depends on a few keys (e.g. the in/out channels,
+        the kernel size and the depth), and the size of its table is the
+        product of the numbers of choices of these keys, which is limited by
+        ``max_table_size``.
+
+    Args:
+        estimator_cfg (dict, optional): Config of the
+            :class:`LUTResourceEstimator`. Defaults to None.
+        search_space (dict, optional): The choices of each key in the subnet
+            dict. If None, it will be built from ``model.mutator`` when
+            preparing. Defaults to None.
+        max_table_size (int): The max size of a table. Defaults to 4096.
+        oversample_ratio (int): The number of samples to screen for each
+            required candidate in search loops. Defaults to 100.
+
+    Examples:
+        >>> screener = ResourceScreener()
+        >>> screener.prepare(model)
+        >>> matrix = screener.sample(10000)
+        >>> is_pass, results = screener.screen(matrix, dict(flops=(0, 330)))
+        >>> subnets = screener.decode(matrix[is_pass])
+    """
+
+    def __init__(self,
+                 estimator_cfg: Optional[Dict] = None,
+                 search_space: Optional[Dict[Any, List]] = None,
+                 max_table_size: int = 4096,
+                 oversample_ratio: int = 100) -> None:
+        estimator_cfg = dict() if estimator_cfg is None else estimator_cfg
+        if 'type' not in estimator_cfg:
+            estimator_cfg['type'] = 'mmrazor.LUTResourceEstimator'
+        self.estimator = TASK_UTILS.build(estimator_cfg)
+        if not isinstance(self.estimator, LUTResourceEstimator):
+            raise TypeError('ResourceScreener only supports '
+                            '`LUTResourceEstimator`, but got '
+                            f'`{type(self.estimator)}`.')
+
+        self.search_space = search_space
+        self.max_table_size = max_table_size
+        self.oversample_ratio = oversample_ratio
+
+        self.initialize = False
+        self._units: Optional[Dict] = None
+        self._constant = np.zeros(2)
+        self._tables: List[Tuple[Tuple[int, ...], np.ndarray]] = []
+
+    @property
+    def keys(self) -> List:
+        """Keys of the search space, in the order of columns."""
+        assert self.search_space is not None
+        return list(self.search_space.keys())
+
+    @property
+    def num_choices(self) -> List[int]:
+        """Numbers of choices of each key."""
+        assert self.search_space is not None
+        return [len(choices) for choices in self.search_space.values()]
+
+    @staticmethod
+    def get_search_space(search_groups: Dict) -> Dict[Any, List]:
+        """Get the search space from the search groups of a mutator."""
+        search_space = dict()
+        for key, group in search_groups.items():
+            choices = getattr(group[0], 'choices', None)
+            if choices is None:
+                choices = group[0].candidate_choices
+            search_space[key] = list(choices)
+        return search_space
+
+    def prepare(self,
+                model: nn.Module,
+                measured_model: Optional[nn.Module] = None) -> None:
+        """Build the tables of ``model``.
+
+        Note:
+            The subnet of ``model`` will be changed when probing, and set to
+            the base subnet (the one with the max FLOPs found by coordinate
+            ascent) at the end.
+
+        Args:
+            model (nn.Module): The supernet algorithm with ``set_subnet``.
+            measured_model (nn.Module, optional): The model to be measured.
+                Defaults to ``model.architecture``.
+        """
+        if measured_model is None:
+            measured_model = model.architecture
+        if self.search_space is None:
+            self.search_space = self.get_search_space(
+                model.mutator.search_groups)
+
+        flops_params_cfg = self.estimator._set_default_resource_params(
+            dict(self.estimator.flops_params_cfg))
+        table = self.estimator.get_table(measured_model, flops_params_cfg)
+        self._units = flops_params_cfg['units']
+
+        def layer_costs(row: List[int]) -> np.ndarray:
+            model.set_subnet(self.decode(np.array([row]))[0])
+            costs = self.estimator.estimate_layers(table)
+            return np.array(costs, dtype=np.float64).reshape(-1, 2)
+
+        # find a base subnet activating as many layers as possible, so that
+        # the dependencies of layers are not masked by the depth.
+        base = [num - 1 for num in self.num_choices]
+        for d, num in enumerate(self.num_choices):
+            total_flops = []
+            for i in range(num):
+                row = list(base)
+                row[d] = i
+                total_flops.append(layer_costs(row)[:, 0].sum())
+            base[d] = int(np.argmax(total_flops))
+        base_costs = layer_costs(base)
+
+        layer_deps: List[List[int]] = [[] for _ in range(len(base_costs))]
+        for d, num in enumerate(self.num_choices):
+            changed = np.zeros(len(base_costs), dtype=bool)
+            for i in range(num):
+                if i == base[d]:
+                    continue
+                row = list(base)
+                row[d] = i
+                changed |= np.any(layer_costs(row) != base_costs, axis=1)
+            for layer_id in np.nonzero(changed)[0]:
+                layer_deps[layer_id].append(d)
+
+        dep_groups: Dict[Tuple[int, ...], List[int]] = dict()
+        for layer_id, deps in enumerate(layer_deps):
+            dep_groups.setdefault(tuple(deps), []).append(layer_id)
+
+        self._constant = np.zeros(2)
+        self._tables = []
+        for deps, layer_ids in dep_groups.items():
+            if len(deps) == 0:
+                self._constant = base_costs[layer_ids].sum(axis=0)
+                continue
+            shape = tuple(self.num_choices[d] for d in deps)
+            if int(np.prod(shape)) > self.max_table_size:
+                raise ValueError(
+                    f'The table of keys {[self.keys[d] for d in deps]} '
+                    f'with shape {shape} exceeds `max_table_size` '
+                    f'{self.max_table_size}.')
+            dep_table = np.zeros(shape + (2, ))
+            for index in itertools.product(*[range(n) for n in shape]):
+                row = list(base)
+                for d, i in zip(deps, index):
+                    row[d] = i
+                dep_table[index] = layer_costs(row)[layer_ids].sum(axis=0)
+            self._tables.append((deps, dep_table))
+
+        model.set_subnet(self.decode(np.array([base]))[0])
+        self.initialize = True
+
+    def encode(self, subnets: List[Dict]) -> np.ndarray:
+        """Encode subnets to an ``N x D`` matrix of choice indices."""
+        matrix = np.zeros((len(subnets), len(self.keys)), dtype=np.int64)
+        for n, subnet in enumerate(subnets):
+            for d, (key, choices) in enumerate(self.search_space.items()):
+                matrix[n, d] = choices.index(subnet[key])
+        return matrix
+
+    def decode(self, matrix: np.ndarray) -> List[Dict]:
+        """Decode an ``N x D`` matrix of choice indices to subnets."""
+        subnets = []
+        for row in np.asarray(matrix).reshape(-1, len(self.keys)):
+            subnets.append({
+                key: choices[int(i)]
+                for i, (key, choices) in zip(row, self.search_space.items())
+            })
+        return subnets
+
+    def sample(self, num_samples: int) -> np.ndarray:
+        """Uniformly sample an ``N x D`` matrix of choice indices."""
+        return np.stack([
+            np.random.randint(num, size=num_samples)
+            for num in self.num_choices
+        ],
+                        axis=1)
+
+    def estimate(self, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """Estimate the FLOPs and params of an ``N x D`` matrix of choice
+        indices.
+
+        Returns:
+            Dict[str, np.ndarray]: The FLOPs and params vectors, whose units
+                are the same as the estimator.
+        """
+        assert self.initialize, \
+            '`prepare` is required to be called before estimating.'
+        matrix = np.asarray(matrix, dtype=np.int64).reshape(-1, len(self.keys))
+        costs = np.tile(self._constant, (len(matrix), 1))
+        for deps, dep_table in self._tables:
+            costs += dep_table[tuple(matrix[:, d] for d in deps)]
+
+        units = self._units
+        flops = _units_convert(costs[:, 0], units['flops'] if units else None)
+        params = _units_convert(costs[:, 1],
+                                units['params'] if units else None)
+        return dict(flops=flops, params=params)
+
+    def screen(
+        self, matrix: np.ndarray, constraints_range: Optional[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Check whether each candidate is in the constraints range.
+
+        Args:
+            matrix (np.ndarray): ``N x D`` matrix of choice indices.
+            constraints_range (Dict[str, Any], optional): Constraints of
+                ``flops`` and ``params``, in the same format as
+                :func:`check_subnet_resources`.
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, np.ndarray]]: The bool mask of passed
+                candidates and the resources vectors.
+        """
+        results = self.estimate(matrix)
+        is_pass = np.ones(len(results['flops']), dtype=bool)
+        if constraints_range is None:
+            return is_pass, results
+
+        for k, v in constraints_range.items():
+            if k not in results:
+                raise KeyError(f'Got unsupported constraint `{k}`, '
+                               f'only {list(results.keys())} are supported.')
+            if not isinstance(v, (list, tuple)):
+                v = (0, v)
+            is_pass &= (results[k] >= v[0]) & (results[k] <= v[1])
+        return is_pass, results
@@ -44,23 +44,16 @@ class CartsHandler(BaseHandler):
             numpy.array: predicted metric.
         """
         trees, features = self.model[0], self.model[1]
-        test_num, num_trees = len(test_data), len(trees)
+        test_data = np.asarray(test_data)
+        if test_data.ndim < 2:
+            test_data = test_data[None, :]
 
-        predict_labels = np.zeros((test_num, 1))
-        for i in range(test_num):
-            this_test_data = test_data[i, :]
-            predict_this_list = np.zeros(num_trees)
+        # each tree predicts all the samples at once.
+        predict_labels = np.zeros((len(trees), len(test_data)))
+        for j, (tree, feature) in enumerate(zip(trees, features)):
+            predict_labels[j] = tree.predict(test_data[:, feature])
 
-            for j, (tree, feature) in enumerate(zip(trees, features)):
-                predict_this_list[j] = tree.predict([this_test_data[feature]
-                                                     ])[0]
-
-            predict_this_list = np.sort(predict_this_list)
-            predict_this_list = predict_this_list[::-1]
-            this_predict = np.mean(predict_this_list)
-            predict_labels[i, 0] = this_predict
-
-        return predict_labels
+        return predict_labels.mean(axis=0)[:, None]
 
     @staticmethod
     def _make_decision_trees(train_data: np.array, train_label: np.array,
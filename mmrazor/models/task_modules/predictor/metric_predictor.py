@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Dict, List, Union
+import os.path as osp
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 
@@ -26,6 +27,8 @@ class MetricPredictor:
             Defaults to 2.
         handler_ckpt (str, optional): Path to handler's checkpoint. If given,
             predictor will load weights directly instead of handler training.
+            The training samples saved with it are also loaded, which are
+            required by :meth:`update`.
         encoding_type (str, optional): Type of how to encode the search space
             to integer bit-string. Defaults to `onehot`.
         score_key (str): Specify one metric in evaluation results to score
@@ -57,6 +60,8 @@ class MetricPredictor:
 
         self.score_key_list = [score_key] + ['anticipate']
         self.initialize = False
+        self.train_data: Optional[np.array] = None
+        self.train_label: Optional[np.array] = None
 
     def predict(self, model) -> Dict[str, float]:
         """Predict the evaluation metric of input model using the handler.
@@ -67,20 +72,44 @@ class MetricPredictor:
         Returns:
             Dict[str, float]: evaluation metric of the model.
         """
-        metric: Dict[str, float] = {}
+        fix_subnet, _ = export_fix_subnet(model)
+        return self.predict_batch([fix_subnet])[0]
+
+    def predict_batch(
+        self, subnets: List[Dict[str, Union[str, DumpChosen]]]
+    ) -> List[Dict[str, float]]:
+        """Predict the evaluation metrics of a batch of subnets.
+
+        The subnets are encoded into one matrix and predicted by the handler
+        in one call, without setting or exporting the model.
+
+        Args:
+            subnets (List[Dict[str, Union[str, DumpChosen]]]): input subnets.
+
+        Returns:
+            List[Dict[str, float]]: evaluation metrics of the subnets.
+        """
         assert self.initialize is True, (
             'Before predicting, evaluator is required to be executed first, '
             'cause the model of handler in predictor needs to be initialized.')
+        if len(subnets) == 0:
+            return []
 
-        if self.initialize:
-            model = export_fix_subnet(model)
-            data = self.preprocess(np.array([self.model2vector(model)]))
-            score = float(np.squeeze(self.handler.predict(data)))
-            if metric.get(self.score_key_list[0], None):
-                metric.update({self.score_key_list[1]: score})
-            else:
-                metric.update({self.score_key_list[0]: score})
-        return metric
+        data = self.encode(subnets)
+        scores = np.asarray(self.handler.predict(data)).reshape(-1)
+        return [{self.score_key_list[0]: float(score)} for score in scores]
+
+    def encode(self, subnets: List[Dict[str, Union[str, DumpChosen]]]
+               ) -> np.array:
+        """Encode subnets into a matrix, one row per subnet.
+
+        Args:
+            subnets (List[Dict[str, Union[str, DumpChosen]]]): input subnets.
+
+        Returns:
+            numpy.array: encoded matrix.
+        """
+        return self.preprocess([self.model2vector(s) for s in subnets])
 
     def model2vector(
             self, model: Dict[str, Union[str, DumpChosen]]) -> Dict[str, list]:
@@ -184,20 +213,68 @@ class MetricPredictor:
         """
         data = self.preprocess(data)
         self.handler.fit(data, label)
+        self.train_data, self.train_label = data, np.asarray(label)
+        self.initialize = True
+
+    def update(self, subnets: List[Dict[str, Union[str, DumpChosen]]],
+               label: np.array) -> None:
+        """Append newly validated subnets to the training set and refit the
+        handler on the whole set.
+
+        Handlers like :class:`MLPHandler` are refitted from their current
+        weights, so the update is incremental. If the handler is loaded from
+        a checkpoint, its training samples must have been saved with it.
+
+        Args:
+            subnets (List[Dict[str, Union[str, DumpChosen]]]): the validated
+                subnets.
+            label (numpy.array): the ground-truth metric of the subnets.
+        """
+        assert self.train_data is not None or not self.initialize, (
+            'The training samples of the handler loaded from '
+            f'`{self.handler_ckpt}` are not found, refitting would discard '
+            'the pretrained handler. Please save the checkpoint with '
+            '`save_checkpoint` after fitting, or disable refitting.')
+        data, label = self.encode(subnets), np.asarray(label)
+        if self.train_data is not None:
+            data = np.concatenate([self.train_data, data])
+            label = np.concatenate([self.train_label, label])
+        self.handler.fit(data, label)
+        self.train_data, self.train_label = data, label
         self.initialize = True
 
     def load_checkpoint(self) -> None:
-        """Load checkpoint for handler."""
+        """Load checkpoint for handler, and its training samples if saved."""
         self.handler.load(self.handler_ckpt)
+        samples_path = self._get_samples_path(self.handler_ckpt)
+        if osp.isfile(samples_path):
+            with np.load(samples_path) as samples:
+                self.train_data = samples['train_data']
+                self.train_label = samples['train_label']
         self.initialize = True
 
     def save_checkpoint(self, path: str) -> str:
         """Save checkpoint of handler and return saved path for diff suffix.
 
+        The training samples are saved in ``{checkpoint}.samples.npz`` next
+        to the checkpoint, so that the handler can be refitted on them after
+        loading.
+
         Args:
             path (str): save path for the handler.
 
         Returns:
             (str): specific checkpoint path of the current handler.
         """
-        return self.handler.save(path)
+        ckpt_path = self.handler.save(path)
+        if self.train_data is not None:
+            np.savez(
+                self._get_samples_path(ckpt_path),
+                train_data=self.train_data,
+                train_label=self.train_label)
+        return ckpt_path
+
+    @staticmethod
+    def _get_samples_path(ckpt_path: str) -> str:
+        """Get the path of the training samples saved with ``ckpt_path``."""
+        return f'{ckpt_path}.samples.npz'
@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from .cached_teacher_recorder import CachedTeacherRecorder, TeacherRecordCache
 from .function_inputs_recorder import FunctionInputsRecorder
 from .function_outputs_recorder import FunctionOutputsRecorder
 from .method_inputs_recorder import MethodInputsRecorder
@@ -7,9 +8,11 @@ from .module_inputs_recorder import ModuleInputsRecorder
 from .module_outputs_recorder import ModuleOutputsRecorder
 from .param_recorder import ParameterRecorder
 from .recorder_manager import RecorderManager
+from .shared_forward_manager import SharedForwardManager
 
 __all__ = [
     'FunctionOutputsRecorder', 'MethodOutputsRecorder',
     'ModuleOutputsRecorder', 'ParameterRecorder', 'RecorderManager',
-    'ModuleInputsRecorder', 'MethodInputsRecorder', 'FunctionInputsRecorder'
+    'ModuleInputsRecorder', 'MethodInputsRecorder', 'FunctionInputsRecorder',
+    'CachedTeacherRecorder', 'TeacherRecordCache', 'SharedForwardManager'
 ]
@@ -2,6 +2,7 @@
 from abc import ABCMeta, abstractmethod
 from typing import Any, List, Optional
 
+import torch
 from torch import nn
 
 
@@ -20,11 +21,35 @@ class BaseRecorder(metaclass=ABCMeta):
         The recorder will be lazily initialized in the ``RecorderManager`` by
         default. If you want to use the recorder without the
         ``RecorderManager``, you need to initialize it first.
+
+    Args:
+        source (str): The source of recorded data.
+        data_idx (int, optional): If given, only this element of each record
+            is stored, which should be a list or tuple. Defaults to None.
+        max_records (int, optional): The max number of records stored in a
+            context, the later ones are dropped. Defaults to None.
+        detach (bool): Whether to detach the recorded tensors, e.g. the
+            records of the teacher. Defaults to False.
+        dtype (str, optional): If given, floating recorded tensors are
+            converted to this dtype, e.g. 'float16'. Defaults to None.
+        channels_last (bool): Whether to convert 4-dim recorded tensors to
+            channels-last memory format. Defaults to False.
     """
 
-    def __init__(self, source: str) -> None:
+    def __init__(self,
+                 source: str,
+                 data_idx: Optional[int] = None,
+                 max_records: Optional[int] = None,
+                 detach: bool = False,
+                 dtype: Optional[str] = None,
+                 channels_last: bool = False) -> None:
 
         self._source = source
+        self.data_idx = data_idx
+        self.max_records = max_records
+        self.detach = detach
+        self.dtype = getattr(torch, dtype) if dtype is not None else None
+        self.channels_last = channels_last
         # Intermediate results are recorded in dictionary format according
         # to the data source.
         # One data source may generate multiple records, which need to be
@@ -58,6 +83,41 @@ class BaseRecorder(metaclass=ABCMeta):
         self.prepare_from_model(model)
         self._initialized = True
 
+    def record(self, data: Any, data_buffer: Optional[List] = None) -> None:
+        """Store ``data`` as a record with the storage options.
+
+        Args:
+            data (Any): The recorded data.
+            data_buffer (list, optional): The buffer to store the record. If
+                None, ``data_buffer`` of the recorder is used.
+                Defaults to None.
+        """
+        if data_buffer is None:
+            data_buffer = self._data_buffer
+        if self.max_records is not None and \
+                len(data_buffer) >= self.max_records:
+            return
+        if self.data_idx is not None:
+            data = data[self.data_idx]
+        data_buffer.append(self._process_data(data))
+
+    def _process_data(self, data: Any) -> Any:
+        """Apply the detach, dtype and memory format options to the tensors
+        in ``data``."""
+        if isinstance(data, torch.Tensor):
+            if self.detach:
+                data = data.detach()
+            if self.dtype is not None and data.is_floating_point():
+                data = data.to(self.dtype)
+            if self.channels_last and data.dim() == 4:
+                data = data.contiguous(memory_format=torch.channels_last)
+            return data
+        if isinstance(data, (list, tuple)) and not hasattr(data, '_fields'):
+            return type(data)(self._process_data(d) for d in data)
+        if isinstance(data, dict):
+            return {k: self._process_data(v) for k, v in data.items()}
+        return data
+
     def get_record_data(self,
                         record_idx: int = 0,
                         data_idx: Optional[int] = None) -> Any:
@@ -74,7 +134,17 @@ class BaseRecorder(metaclass=ABCMeta):
         Returns:
             Any: The type of the return value is undefined, and different
                 source data may have different types.
+
+        Note:
+            If ``data_idx`` of the recorder is set, the records are the
+            elements already, and ``data_idx`` here should be None or the
+            same as that of the recorder.
         """
+        if self.data_idx is not None and data_idx is not None:
+            assert data_idx == self.data_idx, \
+                f'Only the data_idx {self.data_idx} is recorded, but got ' \
+                f'{data_idx}.'
+            data_idx = None
         assert record_idx < len(self._data_buffer), \
             'record_idx is illegal. The length of data_buffer is ' \
             f'{len(self._data_buffer)}, but record_idx is ' \
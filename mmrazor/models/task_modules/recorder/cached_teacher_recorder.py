@@ -0,0 +1,280 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import glob
+import os
+import os.path as osp
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from mmengine import fileio
+from mmengine.dist import get_rank
+from torch import nn
+
+from mmrazor.registry import TASK_UTILS
+from .base_recorder import BaseRecorder
+
+
+class TeacherRecordCache:
+    """A memory-mapped store of the recorded teacher tensors of each sample.
+
+    The records are stored in chunks of ``chunk_size`` samples, one ``.npy``
+    file per record and chunk, which are memory-mapped and created lazily.
+    Each rank only writes into its own sub directory to avoid races, but the
+    records written by all ranks can be read.
+
+    Every record must be a tensor whose first dim is the batch dim, e.g. the
+    features or the logits of the teacher.
+
+    Args:
+        cache_dir (str): The directory of the store.
+        chunk_size (int): The number of samples in a chunk. Defaults to 1024.
+        fp16 (bool): Whether to store the records in float16.
+            Defaults to False.
+        topk (int, optional): If given, only the top k values of 2-dim
+            records (the logits) are stored. When loaded, the other logits
+            are filled with ``topk_fill_value``. Defaults to None.
+        topk_fill_value (float): The value of the logits out of top k, which
+            makes their probabilities almost 0. Defaults to -1e4.
+        index_key (str): The key of the sample index in data samples.
+            Defaults to 'sample_idx'.
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 chunk_size: int = 1024,
+                 fp16: bool = False,
+                 topk: Optional[int] = None,
+                 topk_fill_value: float = -1e4,
+                 index_key: str = 'sample_idx') -> None:
+        self.cache_dir = cache_dir
+        self.chunk_size = chunk_size
+        self.fp16 = fp16
+        self.topk = topk
+        self.topk_fill_value = topk_fill_value
+        self.index_key = index_key
+
+        self.rank_dir = osp.join(cache_dir, f'rank{get_rank()}')
+        os.makedirs(self.rank_dir, exist_ok=True)
+        # the memmaps opened before, keyed by path.
+        self._memmaps: Dict[str, np.memmap] = dict()
+        # the shape of each record (without the batch dim) of each recorder,
+        # and whether it is stored as top k.
+        self._meta: Dict[str, List[Tuple[List[int], bool]]] = dict()
+        self._rank_dirs = [self.rank_dir]
+
+    def get_indices(self, data_samples: Sequence) -> List[int]:
+        """Get the sample indices of a batch of data samples."""
+        indices = []
+        for data_sample in data_samples:
+            index = data_sample.get(self.index_key)
+            assert index is not None, \
+                f'`{self.index_key}` is required by the teacher record cache.'
+            indices.append(int(index))
+        return indices
+
+    def contains(self, indices: Sequence[int]) -> bool:
+        """Whether all the samples of ``indices`` are cached."""
+        return all(self._locate(index) is not None for index in indices)
+
+    def put(self, records: Dict[str, List[torch.Tensor]],
+            indices: Sequence[int]) -> None:
+        """Store the records of a batch.
+
+        Args:
+            records (Dict[str, List[torch.Tensor]]): The records of each
+                recorder, namely its ``data_buffer``.
+            indices (Sequence[int]): The sample indices of the batch.
+        """
+        self._update_meta(records)
+        for name, record_list in records.items():
+            for record_idx, record in enumerate(record_list):
+                assert isinstance(record, torch.Tensor) and \
+                    len(record) == len(indices), \
+                    'Only batched tensors can be cached, but the record ' \
+                    f'{record_idx} of `{name}` is not.'
+                key = f'{name}.{record_idx}'
+                record = record.detach()
+                dtype = torch.float16 if self.fp16 else torch.float32
+                if self._meta[name][record_idx][1]:
+                    values, topk_indices = record.topk(self.topk, dim=1)
+                    self._write(key, values.to(dtype), indices)
+                    self._write(f'{key}.indices', topk_indices.int(), indices)
+                else:
+                    self._write(key, record.to(dtype), indices)
+
+        # mark the samples as valid after all records are written.
+        for index in indices:
+            valid = self._open(self.rank_dir, 'valid',
+                               index // self.chunk_size, np.dtype(bool))
+            valid[index % self.chunk_size] = True
+        self._flush()
+
+    def get(self, indices: Sequence[int],
+            device: torch.device) -> Dict[str, List[torch.Tensor]]:
+        """Load the records of a batch, which must be cached.
+
+        Args:
+            indices (Sequence[int]): The sample indices of the batch.
+            device (torch.device): The device of the loaded records.
+
+        Returns:
+            Dict[str, List[torch.Tensor]]: The records of each recorder.
+        """
+        self._load_meta()
+        rank_dirs = [self._locate(index) for index in indices]
+        records = dict()
+        for name, meta in self._meta.items():
+            record_list = []
+            for record_idx, (shape, is_topk) in enumerate(meta):
+                key = f'{name}.{record_idx}'
+                if is_topk:
+                    values = self._read(rank_dirs, key, indices, device)
+                    topk_indices = self._read(rank_dirs, f'{key}.indices',
+                                              indices, device).long()
+                    record = values.new_full((len(indices), *shape),
+                                             self.topk_fill_value)
+                    record.scatter_(1, topk_indices, values)
+                else:
+                    record = self._read(rank_dirs, key, indices, device)
+                record_list.append(record.float())
+            records[name] = record_list
+        return records
+
+    def _update_meta(self, records: Dict[str, List[torch.Tensor]]) -> None:
+        """Save the meta of records when they are stored the first time."""
+        if all(name in self._meta for name in records):
+            return
+        for name, record_list in records.items():
+            self._meta[name] = [
+                (list(record.shape[1:]), self.topk is not None
+                 and record.dim() == 2 and record.size(1) > self.topk)
+                for record in record_list
+            ]
+        fileio.dump(self._meta, osp.join(self.rank_dir, 'meta.pkl'))
+
+    def _load_meta(self) -> None:
+        """Load the meta saved by any rank."""
+        if self._meta:
+            return
+        for path in glob.glob(osp.join(self.cache_dir, 'rank*', 'meta.pkl')):
+            self._meta = fileio.load(path)
+            return
+
+    def _locate(self, index: int) -> Optional[str]:
+        """Find the directory of the rank which has cached the sample."""
+        chunk, offset = divmod(index, self.chunk_size)
+        for refresh in (False, True):
+            if refresh:
+                # other ranks may start writing after the last search.
+                self._rank_dirs = [self.rank_dir] + sorted(
+                    set(glob.glob(osp.join(self.cache_dir, 'rank*'))) -
+                    {self.rank_dir})
+            for rank_dir in self._rank_dirs:
+                valid = self._open(rank_dir, 'valid', chunk)
+                if valid is not None and valid[offset]:
+                    return rank_dir
+        return None
+
+    def _open(self,
+              rank_dir: str,
+              key: str,
+              chunk: int,
+              dtype: Optional[np.dtype] = None,
+              shape: Tuple = ()) -> Optional[np.memmap]:
+        """Open the memmap of a chunk. If missing, it is created when
+        ``dtype`` is given, otherwise None is returned."""
+        path = osp.join(rank_dir, f'{key}.{chunk}.npy')
+        if path in self._memmaps:
+            return self._memmaps[path]
+        if osp.isfile(path):
+            mode = 'r+' if rank_dir == self.rank_dir else 'r'
+            memmap = np.load(path, mmap_mode=mode)
+        elif dtype is not None:
+            memmap = np.lib.format.open_memmap(
+                path,
+                mode='w+',
+                dtype=dtype,
+                shape=(self.chunk_size, *shape))
+        else:
+            return None
+        self._memmaps[path] = memmap
+        return memmap
+
+    def _write(self, key: str, data: torch.Tensor,
+               indices: Sequence[int]) -> None:
+        """Write the rows of a batch into the chunks of the current rank."""
+        data_array = data.cpu().numpy()
+        for row, index in zip(data_array, indices):
+            chunk, offset = divmod(index, self.chunk_size)
+            memmap = self._open(self.rank_dir, key, chunk, data_array.dtype,
+                                data_array.shape[1:])
+            memmap[offset] = row
+
+    def _read(self, rank_dirs: List[Optional[str]], key: str,
+              indices: Sequence[int], device: torch.device) -> torch.Tensor:
+        """Read the rows of a batch from the chunks of the given ranks."""
+        rows = []
+        for rank_dir, index in zip(rank_dirs, indices):
+            assert rank_dir is not None, f'Sample {index} is not cached.'
+            chunk, offset = divmod(index, self.chunk_size)
+            memmap = self._open(rank_dir, key, chunk)
+            rows.append(np.array(memmap[offset]))
+        return torch.from_numpy(np.stack(rows)).to(device)
+
+    def _flush(self) -> None:
+        """Flush the memmaps written by the current rank."""
+        for path, memmap in self._memmaps.items():
+            if path.startswith(self.rank_dir) and memmap.mode != 'r':
+                memmap.flush()
+
+
+@TASK_UTILS.register_module()
+class CachedTeacherRecorder(BaseRecorder):
+    """Recorder serving the teacher records from a
+    :class:`TeacherRecordCache` instead of calling the teacher.
+
+    It wraps a teacher recorder. In a context after :meth:`serve`, its
+    ``data_buffer`` is the served records, otherwise the wrapped recorder
+    records the teacher forward as usual.
+
+    Args:
+        recorder (BaseRecorder | dict): The wrapped recorder or its config.
+    """
+
+    def __init__(self, recorder: BaseRecorder) -> None:
+        if isinstance(recorder, dict):
+            recorder_cfg = dict(recorder)
+            recorder_cfg['type'] = recorder_cfg['type'] + 'Recorder'
+            recorder = TASK_UTILS.build(recorder_cfg)
+        super().__init__(recorder.source, data_idx=recorder.data_idx)
+        self.recorder = recorder
+        self._initialized = recorder._initialized
+        self._served_records: Optional[List] = None
+
+    def prepare_from_model(self, model: Optional[nn.Module] = None) -> None:
+        """Initialize the wrapped recorder."""
+        self.recorder.initialize(model)
+
+    def reset_data_buffer(self) -> None:
+        """Clear data in data_buffer of itself and the wrapped recorder."""
+        super().reset_data_buffer()
+        self.recorder.reset_data_buffer()
+
+    def serve(self, records: List) -> None:
+        """Serve ``records`` in the next context instead of recording."""
+        self._served_records = records
+
+    def __enter__(self):
+        """Enter the context manager."""
+        super().__enter__()
+        if self._served_records is None:
+            self.recorder.__enter__()
+        else:
+            self._data_buffer = list(self._served_records)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the context manager."""
+        if self._served_records is None:
+            self.recorder.__exit__(exc_type, exc_value, traceback)
+            self._data_buffer = self.recorder.data_buffer
+        self._served_records = None
@@ -65,7 +65,7 @@ class FunctionInputsRecorder(FunctionOutputsRecorder):
                     inputs.append(kwargs[keyword])
             # assume a func execute N times, there will be N inputs need to
             # save.
-            data_buffer.append(inputs)
+            self.record(inputs, data_buffer)
             return outputs
 
         return wrap_func
@@ -61,11 +61,16 @@ class FunctionOutputsRecorder(BaseRecorder):
         [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
         >>> r2.get_record_data(record_idx=2, data_idx=2)
         9
+
+    Note:
+        The module of the function is imported in the first context and
+        cached, later contexts only swap the function.
     """
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._check_valid_source(self.source)
+        self._imported_module: Optional[ModuleType] = None
 
     @staticmethod
     def _check_valid_source(source):
@@ -87,6 +92,18 @@ class FunctionOutputsRecorder(BaseRecorder):
         """Get the module name according to `func_path`."""
         return '.'.join(self.source.split('.')[:-1])
 
+    @property
+    def imported_module(self) -> ModuleType:
+        """ModuleType: The module of the function, which is imported once."""
+        if self._imported_module is None:
+            try:
+                mod = import_modules_from_strings(self.module_string)
+            except ImportError:
+                raise ImportError(
+                    f'{self.module_string} is not imported correctly.')
+            self._imported_module = mod
+        return self._imported_module
+
     def prepare_from_model(self, model: Optional[nn.Module] = None) -> None:
         """The `model` is useless in `FunctionOutputsRecorder`."""
         pass
@@ -106,7 +123,7 @@ class FunctionOutputsRecorder(BaseRecorder):
             outputs = origin_func(*args, **kwargs)
             # assume a func execute N times, there will be N outputs need to
             # save.
-            data_buffer.append(outputs)
+            self.record(outputs, data_buffer)
             return outputs
 
         return wrap_func
@@ -115,18 +132,12 @@ class FunctionOutputsRecorder(BaseRecorder):
         """Enter the context manager."""
         super().__enter__()
 
-        # import the function corrosponding module
-        try:
-            mod = import_modules_from_strings(self.module_string)
-        except ImportError:
-            raise ImportError(
-                f'{self.module_string} is not imported correctly.')
-
-        self.imported_module: ModuleType = mod
-
+        mod = self.imported_module
         assert hasattr(mod, self.func_name), \
             f'{self.func_name} is not in {self.module_string}.'
 
+        # the function is read in every context as it may be wrapped by
+        # other recorders or deliveries.
         origin_func = getattr(mod, self.func_name)
         if not isinstance(origin_func, FunctionType):
             raise TypeError(f'{self.func_name} should be a FunctionType '
@@ -137,9 +148,6 @@ class FunctionOutputsRecorder(BaseRecorder):
         # add record wrapper to origin function.
         record_func = self.func_record_wrapper(origin_func, self.data_buffer)
 
-        assert hasattr(mod, self.func_name), \
-            f'{self.func_name} is not in {self.module_string}.'
-
         # rewrite the origin function
         setattr(mod, self.func_name, record_func)
 
@@ -150,13 +158,16 @@ class FunctionOutputsRecorder(BaseRecorder):
         mod = self.imported_module
         origin_func = self.origin_func
 
-        assert hasattr(mod, self.func_name), \
-            f'{self.func_name} is not in {self.module_string}.'
-
         # restore the origin function
         setattr(mod, self.func_name, origin_func)
 
-        # self.imported_module and self.origin_func can not be pickled.
-        # Delete these two attributes to avoid errors when ema model is used.
-        del self.imported_module
+        # self.origin_func may not be pickled as it is replaced in the
+        # module. Delete it to avoid errors when ema model is used.
         del self.origin_func
+
+    def __getstate__(self) -> dict:
+        """The imported module can not be pickled, so it is dropped and
+        imported again after unpickling, e.g. in the ema model."""
+        state = self.__dict__.copy()
+        state['_imported_module'] = None
+        return state
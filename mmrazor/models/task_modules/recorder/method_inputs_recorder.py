@@ -77,7 +77,7 @@ class MethodInputsRecorder(MethodOutputsRecorder):
                     inputs.append(kwargs[keyword])
             # Assume a func execute N times, there will be N inputs need to
             # save.
-            data_buffer.append(inputs)
+            self.record(inputs, data_buffer)
             return outputs
 
         return wrap_method
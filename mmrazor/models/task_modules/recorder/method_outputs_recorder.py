@@ -138,7 +138,7 @@ class MethodOutputsRecorder(BaseRecorder):
             outputs = orgin_method(*args, **kwargs)
             # assume a func execute N times, there will be N outputs need to
             # save.
-            data_buffer.append(outputs)
+            self.record(outputs, data_buffer)
             return outputs
 
         return wrap_method
@@ -24,4 +24,4 @@ class ModuleInputsRecorder(ModuleOutputsRecorder):
             outputs : The output of the module.
         """
         if self.recording:
-            self.data_buffer.append(inputs)
+            self.record(inputs)
@@ -2,6 +2,7 @@
 from typing import Any, Optional, Tuple
 
 from torch import nn
+from torch.utils.hooks import RemovableHandle
 
 from mmrazor.registry import TASK_UTILS
 from .base_recorder import BaseRecorder
@@ -48,11 +49,18 @@ class ModuleOutputsRecorder(BaseRecorder):
             [tensor([[[[0.9534]]]])]
             >>> r2.get_record_data()
             tensor([[[[0.9534]]]])
+
+    Note:
+        The forward hook is only registered to the module in the context of
+        the recorder and removed on exit, so the forward outside the context,
+        e.g. in validation and inference, pays no hook overhead.
     """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._recording = False
+        self._module: Optional[nn.Module] = None
+        self._hook_handle: Optional[RemovableHandle] = None
 
     @property
     def recording(self) -> bool:
@@ -60,14 +68,15 @@ class ModuleOutputsRecorder(BaseRecorder):
         return self._recording
 
     def prepare_from_model(self, model: Optional[nn.Module] = None) -> None:
-        """Register Pytorch forward hook to corresponding module."""
+        """Find the module to register Pytorch forward hook to in the
+        context."""
 
         assert model is not None, 'model can not be None.'
 
         founded = False
         for name, module in model.named_modules():
             if name == self.source:
-                module.register_forward_hook(self.forward_hook)
+                self._module = module
                 founded = True
                 break
 
@@ -83,14 +92,20 @@ class ModuleOutputsRecorder(BaseRecorder):
             outputs : The output of the module.
         """
         if self._recording:
-            self.data_buffer.append(outputs)
+            self.record(outputs)
 
     def __enter__(self):
         """Enter the context manager."""
         super().__enter__()
         self._recording = True
+        assert self._module is not None
+        self._hook_handle = self._module.register_forward_hook(
+            self.forward_hook)
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Exit the context manager."""
         super().__exit__(exc_type, exc_value, traceback)
         self._recording = False
+        if self._hook_handle is not None:
+            self._hook_handle.remove()
+            self._hook_handle = None
@@ -105,6 +105,11 @@ class RecorderManager:
         for recorder in self.recorders.values():
             recorder.initialize(model)
 
+    def reset_data_buffer(self) -> None:
+        """Clear the data buffers of all recorders."""
+        for recorder in self.recorders.values():
+            recorder.reset_data_buffer()
+
     def __enter__(self):
         """Enter the context manager."""
         for recorder in self.recorders.values():
@@ -0,0 +1,176 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from torch import nn
+
+
+def _remove_wrapper_prefix(module: nn.Module, state_dict: Dict, prefix: str,
+                           local_metadata: Dict) -> None:
+    """Save the states of the wrapped module with its original keys."""
+    wrapped_prefix = prefix + 'module.'
+    for key in list(state_dict):
+        if key.startswith(wrapped_prefix):
+            state_dict[prefix + key[len(wrapped_prefix):]] = \
+                state_dict.pop(key)
+
+
+def _add_wrapper_prefix(state_dict: Dict, prefix: str, *args) -> None:
+    """Load the states saved with the original keys to the wrapped module."""
+    for key in list(state_dict):
+        if key.startswith(prefix):
+            state_dict[prefix + 'module.' + key[len(prefix):]] = \
+                state_dict.pop(key)
+
+
+class SharedForwardModule(nn.Module):
+    """Wrapper of a module shared by the teacher and the student, which
+    reuses its outputs in a distill step.
+
+    If ``sharing`` is True and the wrapped module is called with the same
+    input objects as before, the previous outputs are returned instead of
+    being recomputed, and the forward hooks of the wrapped module, e.g.
+    recorders, are called with them. The outputs are not reused if the
+    submodules have hooks, or if the wrapped module has forward pre-hooks,
+    since they can't be replayed. The outputs computed without grad are not
+    reused if the wrapped module has trainable parameters or the inputs
+    require grad, so the student pass still has the right grad.
+
+    The states are saved and loaded with the keys of the wrapped module, so
+    the checkpoints are the same as the ones without the wrapper.
+
+    Args:
+        module (nn.Module): The shared module.
+    """
+
+    def __init__(self, module: nn.Module) -> None:
+        super().__init__()
+        self.module = module
+        self.sharing = False
+        # outputs and inputs keyed by the ids of inputs. The inputs are held
+        # so that their ids are not reused.
+        self._cache: Dict[Tuple[int, ...], Tuple[Any, Tuple]] = dict()
+        self._register_state_dict_hook(_remove_wrapper_prefix)
+        self._register_load_state_dict_pre_hook(_add_wrapper_prefix)
+
+    def clear(self) -> None:
+        """Clear the reused outputs."""
+        self._cache = dict()
+
+    def forward(self, *args, **kwargs) -> Any:
+        if not self.sharing or kwargs or not self._replayable():
+            return self.module(*args, **kwargs)
+
+        key = tuple(id(arg) for arg in args)
+        if key in self._cache:
+            outputs = self._cache[key][0]
+            kwargs_hooks = getattr(self.module, '_forward_hooks_with_kwargs',
+                                   dict())
+            for hook_id, hook in list(self.module._forward_hooks.items()):
+                if hook_id in kwargs_hooks:
+                    result = hook(self.module, args, dict(), outputs)
+                else:
+                    result = hook(self.module, args, outputs)
+                if result is not None:
+                    outputs = result
+            return outputs
+
+        outputs = self.module(*args)
+        if torch.is_grad_enabled() or not self._requires_grad(args):
+            self._cache[key] = (outputs, args)
+        return outputs
+
+    def _replayable(self) -> bool:
+        """Whether the hooks called in the forward of the wrapped module can
+        be replayed with the reused outputs."""
+        if len(self.module._forward_pre_hooks) > 0:
+            return False
+        return not any(
+            len(m._forward_hooks) > 0 or len(m._forward_pre_hooks) > 0
+            for m in self.module.modules() if m is not self.module)
+
+    def _requires_grad(self, args: Tuple) -> bool:
+        """Whether the outputs of ``args`` require grad in the student."""
+        return any(p.requires_grad for p in self.module.parameters()) or \
+            any(isinstance(arg, torch.Tensor) and arg.requires_grad
+                for arg in args)
+
+
+class SharedForwardManager:
+    """Manager reusing the outputs of modules shared by the teacher and the
+    student in a distill step.
+
+    A module is shared if the same module object is in both the teacher and
+    the student, e.g. a frozen stem passed to both of them. When preparing,
+    the outermost shared modules are replaced by :class:`SharedForwardModule`
+    in both the teacher and the student. In the context of the manager, a
+    shared module called with the same input objects as before returns the
+    previous outputs. Since the outputs of a shared module are also the same
+    objects, the consecutive shared modules are all skipped in the second
+    pass.
+
+    Since the wrappers are registered modules rather than patched methods,
+    the models still work after deepcopy (e.g. EMA) and pickling.
+
+    Note:
+        The names of the parameters and modules in the shared modules get a
+        ``module.`` infix, e.g. ``backbone.stem.module.conv.weight``, while
+        the keys of the state dict are unchanged.
+    """
+
+    def __init__(self) -> None:
+        self._student: Optional[nn.Module] = None
+        self.shared_modules: List[SharedForwardModule] = list()
+
+    def prepare_from_student(self, model: nn.Module) -> None:
+        """Keep the student to find the modules shared with the teacher."""
+        self._student = model
+
+    def prepare_from_teacher(self, model: nn.Module) -> None:
+        """Find the outermost modules shared by the teacher and the student,
+        and replace them by :class:`SharedForwardModule` in both models."""
+        assert self._student is not None, \
+            '`prepare_from_student` should be called first.'
+        student, self._student = self._student, None
+        student_modules = {id(m) for m in student.modules()}
+        if id(model) in student_modules or any(
+                module is student for module in model.modules()):
+            # the teacher is in the student or the other way around, which
+            # is forwarded once.
+            return
+
+        shared_names: List[str] = list()
+        for name, module in list(model.named_modules()):
+            if id(module) not in student_modules:
+                continue
+            if any(name.startswith(f'{shared}.') for shared in shared_names):
+                continue
+            shared_names.append(name)
+            wrapper = SharedForwardModule(module)
+            self._replace_module(model, module, wrapper)
+            self._replace_module(student, module, wrapper)
+            self.shared_modules.append(wrapper)
+
+    @staticmethod
+    def _replace_module(model: nn.Module, module: nn.Module,
+                        wrapper: SharedForwardModule) -> None:
+        """Replace all the references of ``module`` in ``model`` by
+        ``wrapper``."""
+        for parent in list(model.modules()):
+            if parent is wrapper:
+                continue
+            for name, child in parent._modules.items():
+                if child is module:
+                    parent._modules[name] = wrapper
+
+    def __enter__(self):
+        """Enter the context manager."""
+        for module in self.shared_modules:
+            module.clear()
+            module.sharing = True
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the context manager."""
+        for module in self.shared_modules:
+            module.clear()
+            module.sharing = False
@@ -1,7 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
 import re
+import sys
 from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from mmengine import ConfigDict
 from torch.nn import Conv2d, Linear
@@ -9,8 +11,8 @@ from torch.nn.modules import GroupNorm
 from torch.nn.modules.batchnorm import _NormBase
 
 from mmrazor.registry import TASK_UTILS
-from .parsers import DEFAULT_BACKWARD_TRACER
-from .path import Path, PathList
+from .parsers import DEFAULT_BACKWARD_TRACER, DEFAULT_DAG_BACKWARD_PARSER
+from .path import Path, PathConcatNode, PathList, PathNode
 
 SUPPORT_MODULES = (Conv2d, Linear, _NormBase, GroupNorm)
 
@@ -22,9 +24,17 @@ class BackwardTracer:
     Args:
         loss_calculator (dict or Callable): Calculate the pseudo loss to trace
             the topology of a model.
+        dag_trace (bool): Whether to trace the backward graph as a DAG, which
+            visits each autograd node once instead of enumerating all the
+            paths from the loss. The traced ``PathList`` consists of the
+            paths from each node to its nearest parent nodes, which builds
+            the same ``ModuleGraph`` but does not support
+            ``PathList.find_nodes_parents`` with ``non_pass``. It is much
+            faster on models with many residual or dense connections.
+            Defaults to False.
     """
 
-    def __init__(self, loss_calculator):
+    def __init__(self, loss_calculator, dag_trace: bool = False):
         if isinstance(loss_calculator, (dict, ConfigDict)):
             loss_calculator = TASK_UTILS.build(loss_calculator)
 
@@ -33,6 +43,7 @@ class BackwardTracer:
         ), 'loss_calculator should be a dict, ConfigDict or ' \
            'callable object'
         self.loss_calculator = loss_calculator
+        self.dag_trace = dag_trace
 
     @property
     def backward_parser(self):
@@ -40,6 +51,12 @@ class BackwardTracer:
         parser."""
         return DEFAULT_BACKWARD_TRACER
 
+    @property
+    def dag_backward_parser(self):
+        """The mapping from the type of a backward op to the corresponding
+        parser used by :meth:`dag_backward_trace`."""
+        return DEFAULT_DAG_BACKWARD_PARSER
+
     def backward_trace(self, grad_fn, module2name, param2module, cur_path,
                        result_paths, visited, shared_module):
         """Trace the topology of all the ``NON_PASS_MODULE``."""
@@ -67,6 +84,97 @@ class BackwardTracer:
         else:
             result_paths.append(copy.deepcopy(cur_path))
 
+    def _parse_grad_fn(self, grad_fn, module2name,
+                       param2module) -> Tuple[Optional[PathNode], List]:
+        """Parse ``grad_fn`` into its node, which is None for the ops not in
+        ``dag_backward_parser``, and its parent grad_fns."""
+        # Delete the digit numbers after the name of the backward op as
+        # in `backward_trace`.
+        name = re.sub(r'[0-1]+', '', type(grad_fn).__name__)
+        parse_module = self.dag_backward_parser.get(name)
+        if parse_module is not None:
+            return parse_module(grad_fn, module2name, param2module)
+        # If the op is AccumulateGrad, parents is ().
+        return None, [parent[0] for parent in grad_fn.next_functions]
+
+    def dag_backward_trace(self, grad_fn, module2name,
+                           param2module) -> PathList:
+        """Trace the topology of all the ``NON_PASS_MODULE`` by visiting
+        each autograd node once.
+
+        The nearest nodes before each autograd node, namely its frontier, are
+        computed in post order with an explicit stack, so deep models don't
+        hit the recursion limit. A shared module is called by several
+        autograd nodes, so it is traced once for each call.
+
+        Returns:
+            PathList: The paths from each node to each of its nearest parent
+            nodes, or the path of the node only if it has no parent node.
+        """
+        grad_fn = grad_fn[0] if isinstance(grad_fn, (list, tuple)) else grad_fn
+
+        parsed: Dict = dict()
+        # the grad_fns of the nearest nodes before each grad_fn.
+        frontiers: Dict = dict()
+        # the node and the frontier of its parents of each traced grad_fn.
+        traced: Dict = dict()
+
+        def merge_frontiers(parents) -> List:
+            # an ordered set of the grad_fns.
+            merged: Dict = dict()
+            for parent in parents:
+                if parent is not None:
+                    merged.update(dict.fromkeys(frontiers[parent]))
+            return list(merged)
+
+        stack = [(grad_fn, False)] if grad_fn is not None else []
+        while stack:
+            cur_fn, expanded = stack.pop()
+            if not expanded:
+                if cur_fn in parsed:
+                    continue
+                parsed[cur_fn] = self._parse_grad_fn(cur_fn, module2name,
+                                                     param2module)
+                stack.append((cur_fn, True))
+                for parent in reversed(parsed[cur_fn][1]):
+                    if parent is not None and parent not in parsed:
+                        stack.append((parent, False))
+                continue
+
+            node, parents = parsed[cur_fn]
+            if node is None:
+                frontiers[cur_fn] = merge_frontiers(parents)
+                continue
+            if isinstance(node, PathConcatNode):
+                sub_path_lists = list()
+                for parent in parents:
+                    fns = merge_frontiers([parent])
+                    paths = [Path(traced[fn][0]) for fn in fns]
+                    sub_path_lists.append(PathList(paths or Path()))
+                node = PathConcatNode(node.name, sub_path_lists)
+            traced[cur_fn] = (node, merge_frontiers(parents))
+            frontiers[cur_fn] = [cur_fn]
+
+        # emit the paths from the loss in the order of `backward_trace`.
+        path_list = PathList()
+        emitted = set()
+        stack = list(reversed(frontiers.get(grad_fn, [])))
+        while stack:
+            cur_fn = stack.pop()
+            if cur_fn in emitted:
+                continue
+            emitted.add(cur_fn)
+            node, parent_fns = traced[cur_fn]
+            if isinstance(node, PathConcatNode) or len(parent_fns) == 0:
+                # the parents of a concat node are in its path lists.
+                path_list.append(Path(node))
+            else:
+                for parent_fn in parent_fns:
+                    path_list.append(Path([node, traced[parent_fn][0]]))
+            stack.extend(reversed(parent_fns))
+
+        return path_list
+
     def _trace_shared_module_hook(self, module, inputs, outputs):
         """Trace shared modules. Modules such as the detection head in
         RetinaNet which are visited more than once during :func:`forward` are
@@ -182,6 +290,15 @@ class BackwardTracer:
         # weight is False, we can not trace this module by parsing backward.
         self._set_all_requires_grad(model)
 
+        if self.dag_trace:
+            # shared modules need no special care in the dag trace.
+            pseudo_loss = self.loss_calculator(model)
+            self._restore_requires_grad(model)
+            module_path_list = self.dag_backward_trace(
+                pseudo_loss.grad_fn, module2name, param2module)
+            self._reset_norm_running_stats(model)
+            return module_path_list
+
         self._register_share_module_hook(model)
 
         pseudo_loss = self.loss_calculator(model)
@@ -193,8 +310,15 @@ class BackwardTracer:
 
         module_path_list = PathList()
 
-        self.backward_trace(pseudo_loss.grad_fn, module2name, param2module,
-                            Path(), module_path_list, visited, share_modules)
+        # `backward_trace` recurses on each autograd node of the paths.
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, int(pow(2, 20))))
+        try:
+            self.backward_trace(pseudo_loss.grad_fn, module2name,
+                                param2module, Path(), module_path_list,
+                                visited, share_modules)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
 
         self._reset_norm_running_stats(model)
 
@@ -1,9 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Tuple
 
 from .path import (Path, PathConcatNode, PathConvNode, PathDepthWiseConvNode,
-                   PathLinearNode, PathList, PathNormNode)
+                   PathLinearNode, PathList, PathNode, PathNormNode)
 
 
 def _is_leaf_grad_fn(grad_fn):
@@ -185,3 +185,84 @@ DEFAULT_BACKWARD_TRACER: Dict[str, Callable] = {
     'NativeBatchNormBackward': parse_norm,
     'NativeGroupNormBackward': parse_norm
 }
+
+
+def _get_module_and_name(leaf_grad_fn, module2name, param2module):
+    """Get the module and its name from the grad_fn of its parameter, which
+    may be followed by ops such as transpose."""
+    while not _is_leaf_grad_fn(leaf_grad_fn):
+        leaf_grad_fn = leaf_grad_fn.next_functions[0][0]
+    module = param2module[id(leaf_grad_fn.variable)]
+    return module, module2name[module]
+
+
+def dag_parse_conv(grad_fn, module2name,
+                   param2module) -> Tuple[PathNode, List]:
+    """Parse the backward of a conv layer into its node and parent grad_fns
+    without tracing the parents.
+
+    See :func:`parse_conv` for the layout of ``grad_fn.next_functions``.
+    """
+    module, name = _get_module_and_name(grad_fn.next_functions[1][0],
+                                        module2name, param2module)
+    if module.in_channels == module.groups:
+        node: PathNode = PathDepthWiseConvNode(name)
+    else:
+        node = PathConvNode(name)
+    return node, [grad_fn.next_functions[0][0]]
+
+
+def dag_parse_linear(grad_fn, module2name,
+                     param2module) -> Tuple[PathNode, List]:
+    """Parse the backward of a linear layer into its node and parent
+    grad_fns without tracing the parents.
+
+    See :func:`parse_linear` for the layout of ``grad_fn.next_functions``.
+    """
+    _, name = _get_module_and_name(
+        grad_fn.next_functions[-1][0].next_functions[0][0], module2name,
+        param2module)
+    return PathLinearNode(name), [grad_fn.next_functions[-2][0]]
+
+
+def dag_parse_cat(grad_fn, module2name,
+                  param2module) -> Tuple[PathNode, List]:
+    """Parse the backward of a concat operation into its node and parent
+    grad_fns without tracing the parents.
+
+    The ``path_lists`` of the returned node are empty, and they are filled
+    by the tracer with the nodes of the parents.
+    """
+    parents = grad_fn.next_functions
+    concat_id_list = [str(id(p)) for p in parents]
+    concat_id_list.sort()
+    concat_id = '_'.join(concat_id_list)
+    name = f'concat_{concat_id}'
+    return PathConcatNode(name, []), [p[0] for p in parents]
+
+
+def dag_parse_norm(grad_fn, module2name,
+                   param2module) -> Tuple[PathNode, List]:
+    """Parse the backward of a norm layer into its node and parent grad_fns
+    without tracing the parents."""
+    _, name = _get_module_and_name(grad_fn.next_functions[1][0], module2name,
+                                   param2module)
+    return PathNormNode(name), [grad_fn.next_functions[0][0]]
+
+
+DEFAULT_DAG_BACKWARD_PARSER: Dict[str, Callable] = {
+    'ConvolutionBackward': dag_parse_conv,
+    'SlowConv2DBackward': dag_parse_conv,
+    'ThnnConv2DBackward': dag_parse_conv,
+    'CudnnConvolutionBackward': dag_parse_conv,
+    'MkldnnConvolutionBackward': dag_parse_conv,
+    'SlowConvDilated2DBackward': dag_parse_conv,
+    'ThAddmmBackward': dag_parse_linear,
+    'AddmmBackward': dag_parse_linear,
+    'MmBackward': dag_parse_linear,
+    'CatBackward': dag_parse_cat,
+    'ThnnBatchNormBackward': dag_parse_norm,
+    'CudnnBatchNormBackward': dag_parse_norm,
+    'NativeBatchNormBackward': dag_parse_norm,
+    'NativeGroupNormBackward': dag_parse_norm
+}
@@ -1,13 +1,125 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 """Including modules for ChannelFlow to analyze channel dependency."""
-import copy
-import itertools
-import sys
-from typing import List, Set, Union
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
 
 from mmrazor.utils import IndexDict
 
-sys.setrecursionlimit(int(pow(2, 20)))
+
+class ChannelFlow:
+    """A ChannelFlow holds the channels of ChannelTensors as a disjoint set
+    on flat numpy arrays.
+
+    Each channel is an integer id. ``_parent`` is the union-find forest whose
+    roots are the minimal ids of their sets, so a union only links a larger
+    root to a smaller one, never creates cycles and can be applied to many
+    pairs of channels at once. ``_owner`` and ``_index`` record the
+    ChannelTensor allocating each channel and its index in that tensor.
+
+    Args:
+        capacity (int): The initial number of channels of the arrays, which
+            grow when needed. Defaults to 1024.
+    """
+
+    _current: Optional['ChannelFlow'] = None
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._parent = np.arange(capacity, dtype=np.int64)
+        self._owner = np.zeros(capacity, dtype=np.int64)
+        self._index = np.zeros(capacity, dtype=np.int64)
+        self.num_elems = 0
+        self.num_tensors = 0
+        self._set_info_cache: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def get_current(cls) -> 'ChannelFlow':
+        """Get the ChannelFlow where new ChannelTensors allocate channels."""
+        if cls._current is None:
+            cls._current = cls()
+        return cls._current
+
+    @classmethod
+    def reset_current(cls) -> 'ChannelFlow':
+        """Start a new ChannelFlow for new ChannelTensors, so the arrays of
+        the former one are freed with its ChannelTensors."""
+        cls._current = cls()
+        return cls._current
+
+    def allocate(self, num: int) -> np.ndarray:
+        """Allocate ``num`` channels of a new ChannelTensor and return their
+        ids."""
+        start, end = self.num_elems, self.num_elems + num
+        capacity = len(self._parent)
+        if end > capacity:
+            capacity = max(end, 2 * capacity)
+            parent = np.arange(capacity, dtype=np.int64)
+            parent[:start] = self._parent[:start]
+            self._parent = parent
+            self._owner = np.resize(self._owner, capacity)
+            self._index = np.resize(self._index, capacity)
+        self._owner[start:end] = self.num_tensors
+        self._index[start:end] = np.arange(num)
+        self.num_tensors += 1
+        self.num_elems = end
+        self.reset_cache()
+        return np.arange(start, end, dtype=np.int64)
+
+    def find(self, ids: np.ndarray) -> np.ndarray:
+        """Find the roots of ``ids`` and compress their paths."""
+        parent = self._parent
+        roots = parent[ids]
+        while True:
+            grand_parents = parent[roots]
+            if np.array_equal(grand_parents, roots):
+                break
+            roots = grand_parents
+        parent[ids] = roots
+        return roots
+
+    def union(self, ids1: np.ndarray, ids2: np.ndarray) -> None:
+        """Union the channels in ``ids1`` and ``ids2`` pairwise."""
+        while True:
+            roots1 = self.find(ids1)
+            roots2 = self.find(ids2)
+            diff = roots1 != roots2
+            if not diff.any():
+                break
+            low = np.minimum(roots1[diff], roots2[diff])
+            high = np.maximum(roots1[diff], roots2[diff])
+            # A root in several pairs is linked to the minimal one, and the
+            # other pairs are united in the next loop.
+            np.minimum.at(self._parent, high, low)
+            self.reset_cache()
+
+    def reset_cache(self) -> None:
+        """Reset the cached hashes and minimal indices of the sets."""
+        self._set_info_cache = None
+
+    def get_set_info(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the hashes and the minimal indices of the sets of ``ids``.
+
+        The hash of a set is the sum of the random keys of the ChannelTensors
+        owning its channels, so sets spanning the same ChannelTensors have the
+        same hash. The minimal index is the minimal index of the channels of
+        a set in their owning ChannelTensors.
+        """
+        if self._set_info_cache is None:
+            num_elems, num_tensors = self.num_elems, self.num_tensors
+            roots = self.find(np.arange(num_elems))
+            pairs = np.unique(roots * num_tensors + self._owner[:num_elems])
+            keys = np.random.default_rng(0).integers(
+                0, np.iinfo(np.int64).max, num_tensors,
+                dtype=np.int64).astype(np.uint64)
+            set_hash = np.zeros(num_elems, dtype=np.uint64)
+            np.add.at(set_hash, pairs // num_tensors,
+                      keys[pairs % num_tensors])
+            set_min_index = np.full(
+                num_elems, np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(set_min_index, roots, self._index[:num_elems])
+            self._set_info_cache = (set_hash[roots], set_min_index[roots])
+        elem_hash, elem_min_index = self._set_info_cache
+        return elem_hash[ids], elem_min_index[ids]
 
 
 class ChannelElem:
@@ -22,22 +134,18 @@ class ChannelElem:
                 ChannelElem belongs to.
             index_in_tensor (int): the index  in the owning_tensor.
         """
-        self._parent: Union[None, 'ChannelElem'] = None
-        self._subs: Set[ChannelElem] = set()
         self.owing_tensor = owning_tensor
         self.index_in_tensoor = index_in_tensor
-        self._hash_cache = None
-        self._min_elem_set_index_cache = None
+        self.flow = owning_tensor.flow
+        self.id = int(owning_tensor.ids[index_in_tensor])
 
     # channel elem operations
 
     @classmethod
     def union_two(cls, elem1: 'ChannelElem', elem2: 'ChannelElem'):
         """Bind two ChannelElems."""
-        root1 = elem1.root
-        root2 = elem2.root
-        if root1 is not root2:
-            root2._set_parent(root1)
+        assert elem1.flow is elem2.flow
+        elem1.flow.union(np.array([elem1.id]), np.array([elem2.id]))
 
     def union(self, elem: 'ChannelElem'):
         """Bind with anther ChannelElem."""
@@ -46,93 +154,63 @@ class ChannelElem:
     # hash related
 
     @property
-    def owing_elem_set(self):
-        """Get ChannelElem set representation."""
-        root = self.root
-        return root.subs
-
-    def reset_cache(self):
-        """Reset hash cache."""
-        self._hash_cache = None
-        self._min_elem_set_index_cache = None
-
-    @property
-    def elem_set_hash(self):
+    def elem_set_hash(self) -> int:
         """Get the hash of the owning ChannelElems set."""
-        if self._hash_cache is not None:
-            return self._hash_cache
-        else:
-            tensor_list = list(self.owing_elem_set)
-            tensor_set = set([elem.owing_tensor for elem in tensor_list])
-            frozen_set = frozenset(tensor_set)
-            hash = frozen_set.__hash__()
-            for elem in self.owing_elem_set:
-                assert elem._hash_cache is None
-                elem._hash_cache = hash
-            return hash
+        set_hash, _ = self.flow.get_set_info(np.array([self.id]))
+        return int(set_hash[0])
 
     @property
-    def min_elem_set_index(self):
+    def min_elem_set_index(self) -> int:
         """Minimal index in ChannelTensors."""
-        if self._min_elem_set_index_cache is not None:
-            return self._min_elem_set_index_cache
-        else:
-            elem_set = self.owing_elem_set
-            min_index = int(pow(2, 32))
-            for elem in elem_set:
-                min_index = min(min_index, elem.index_in_tensoor)
-            for elem in elem_set:
-                assert elem._min_elem_set_index_cache is None
-                elem._min_elem_set_index_cache = min_index
-            return min_index
+        _, min_index = self.flow.get_set_info(np.array([self.id]))
+        return int(min_index[0])
 
     # work as a disjoint set
 
     @property
     def root(self) -> 'ChannelElem':
         """Get root of the owing ChannelElem set."""
-        if self._parent is None:
-            return self
+        roots = self.flow.find(np.array([self.id]))
+        return ChannelTensor._from_ids(self.flow, roots)[0]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ChannelElem):
+            return self.flow is other.flow and self.id == other.id
         else:
-            root = self._parent.root
-            self._unset_parent()
-            self._set_parent(root)
-            return root
+            return False
 
-    @property
-    def subs(self):
-        """Get all Elements in the set."""
-        subs = copy.copy(self._subs)
-        subs.add(self)
-        for elem in self._subs:
-            subs = subs.union(elem.subs)
-        return subs
-
-    def _set_parent(self, parent: 'ChannelElem'):
-        """Set parent for the ChannelElem."""
-        assert self._parent is None
-        assert parent.root is not self
-        self._parent = parent
-        parent._subs.add(self)
-
-    def _unset_parent(self):
-        """Unset parent of the ChannelElem."""
-        assert self._parent is not None
-        old_parent = self._parent
-        old_parent._subs.remove(self)
-        self._parent = None
+    def __hash__(self) -> int:
+        return hash((id(self.flow), self.id))
 
 
 class ChannelTensor:
     """The ChannelTensor in ChannelFlow."""
 
-    def __init__(self, num_channel_elem: int) -> None:
+    def __init__(self,
+                 num_channel_elem: int,
+                 flow: Optional[ChannelFlow] = None) -> None:
         """ChannelTensor works as a proxy of a tensor.
 
         Args:
             num_channel_elem (int): number of channels(ChannelElems)
+            flow (ChannelFlow, optional): the ChannelFlow to allocate the
+                channels. Defaults to None, meaning the current one.
         """
-        self.elems = [ChannelElem(self, i) for i in range(num_channel_elem)]
+        self.flow = ChannelFlow.get_current() if flow is None else flow
+        self.ids = self.flow.allocate(num_channel_elem)
+
+    @classmethod
+    def _from_ids(cls, flow: ChannelFlow, ids: np.ndarray) -> 'ChannelTensor':
+        """Build a ChannelTensor of existing channels."""
+        tensor = cls.__new__(cls)
+        tensor.flow = flow
+        tensor.ids = ids
+        return tensor
+
+    @property
+    def elems(self) -> List[ChannelElem]:
+        """The ChannelElems of the ChannelTensor."""
+        return [ChannelElem(self, i) for i in range(len(self))]
 
     # tensor operations
 
@@ -144,24 +222,21 @@ class ChannelTensor:
     def union_two(cls, tensor1: 'ChannelTensor', tensor2: 'ChannelTensor'):
         """Bind two ChannelTensors."""
         assert len(tensor1) == len(tensor2), f'{len(tensor1)}!={len(tensor2)}'
-        for e1, e2 in zip(tensor1, tensor2):
-            ChannelElem.union_two(e1, e2)
+        assert tensor1.flow is tensor2.flow
+        tensor1.flow.union(tensor1.ids, tensor2.ids)
 
     @classmethod
     def cat(cls, tensors: List['ChannelTensor']):
         """Cat multiple ChannelTensors."""
-        elems = list(itertools.chain(*[t.elems for t in tensors]))
-        new_tensor = ChannelTensor(len(elems))
-        new_tensor.elems = elems
-        return new_tensor
+        flow = tensors[0].flow
+        assert all(tensor.flow is flow for tensor in tensors)
+        ids = np.concatenate([tensor.ids for tensor in tensors])
+        return cls._from_ids(flow, ids)
 
     def expand(self, expand_ratio: int):
         """Expand self ChannelTensor."""
-        new_tensor = ChannelTensor(expand_ratio * len(self))
-
-        for i in range(len(self)):
-            for j in range(expand_ratio):
-                self[i].union(new_tensor[i * expand_ratio + j])
+        new_tensor = ChannelTensor(expand_ratio * len(self), self.flow)
+        self.flow.union(np.repeat(self.ids, expand_ratio), new_tensor.ids)
         return new_tensor
 
     # hash operation
@@ -169,45 +244,41 @@ class ChannelTensor:
     @property
     def elems_hash_with_index(self):
         """Return hash of the ChannelElems in the ChannelTensor with index."""
-        elem_hashes = [(elem.elem_set_hash, elem.min_elem_set_index)
-                       for elem in self.elems]
-        return elem_hashes
+        set_hash, min_index = self.flow.get_set_info(self.ids)
+        return list(zip(set_hash.tolist(), min_index.tolist()))
 
     @property
     def elems_hash_dict(self):
         """Return hash of the ChannelElems in the ChannelTensor."""
-        elem_hash_with_index = self.elems_hash_with_index
         unit_dict = IndexDict()
-        start = 0
-        for e in range(1, len(self)):
-            if (elem_hash_with_index[e][0] != elem_hash_with_index[e - 1][0]
-                    or elem_hash_with_index[e][1] <
-                    elem_hash_with_index[e - 1][1]):
-
-                unit_dict[(start, e)] = elem_hash_with_index[start][0]
-                start = e
-        unit_dict[start, len(self)] = elem_hash_with_index[start][0]
+        if len(self) == 0:
+            return unit_dict
+        set_hash, min_index = self.flow.get_set_info(self.ids)
+        # a new unit starts where the hash changes or the index restarts.
+        is_start = (set_hash[1:] != set_hash[:-1]) | (
+            min_index[1:] < min_index[:-1])
+        starts = [0] + (np.nonzero(is_start)[0] + 1).tolist()
+        ends = starts[1:] + [len(self)]
+        for start, end in zip(starts, ends):
+            unit_dict[(start, end)] = int(set_hash[start])
         return unit_dict
 
     # work as a tensor
 
     def __getitem__(self, key: Union[int, slice]):
         if isinstance(key, int):
-            return self.elems[key]
+            return ChannelElem(self, key)
         elif isinstance(key, slice):
-            elems = self.elems[key]
-            tensor = ChannelTensor(len(elems))
-            tensor.elems = elems
-            return tensor
+            return ChannelTensor._from_ids(self.flow, self.ids[key])
         else:
             raise NotImplementedError()
 
     def __len__(self):
-        return len(self.elems)
+        return len(self.ids)
 
     def __iter__(self):
-        for e in self.elems:
-            yield e
+        for i in range(len(self)):
+            yield ChannelElem(self, i)
 
     def __add__(self, tensor: 'ChannelTensor'):
         return ChannelTensor.cat([self, tensor])
@@ -216,5 +287,4 @@ class ChannelTensor:
 
     def _reset_channel_elem_cache(self):
         """Reset hash of all ChannelElems in the ChannelTensor."""
-        for elem in self.elems:
-            elem.reset_cache()
+        self.flow.reset_cache()
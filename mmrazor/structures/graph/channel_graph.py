@@ -6,7 +6,7 @@ from torch.nn import Module
 
 from mmrazor.utils import print_log
 from .base_graph import BaseGraph
-from .channel_flow import ChannelTensor
+from .channel_flow import ChannelFlow, ChannelTensor
 from .channel_nodes import (ChannelDismatchError, ChannelNode, EndNode,
                             ExpandChannelNode, InputChannelNode,
                             default_channel_node_converter)
@@ -111,6 +111,8 @@ class ChannelGraph(ModuleGraph[ChannelNode]):
 
     def forward(self, num_input_channel=3):
         """Generate a ChanneelTensor and let it forwards through the graph."""
+        # the channels of the former forward are freed with their tensors.
+        ChannelFlow.reset_current()
         for node in self.topo_traverse():
             node.reset_channel_tensors()
         for i, node in enumerate(self.topo_traverse()):
@@ -1,5 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .candidate import Candidates
+from .candidate import CandidatePool, Candidates
 from .fix_subnet import export_fix_subnet, load_fix_subnet
 
-__all__ = ['load_fix_subnet', 'export_fix_subnet', 'Candidates']
+__all__ = [
+    'load_fix_subnet', 'export_fix_subnet', 'Candidates', 'CandidatePool'
+]
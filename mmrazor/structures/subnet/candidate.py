@@ -2,6 +2,8 @@
 from collections import UserList
 from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
+
 
 class Candidates(UserList):
     """The data structure of sampled candidate. The format is Union[Dict[str,
@@ -182,3 +184,352 @@ class Candidates(UserList):
         """
         self.data.sort(
             key=lambda x: list(x.values())[0][key_indicator], reverse=reverse)
+
+
+class CandidatePool:
+    """Array-backed pool of candidates.
+
+    Each subnet is encoded as a row of the int matrix :attr:`choices`, whose
+    elements are the indices of choices in ``search_space``, and its
+    score | flops | params | latency are stored in the float matrix
+    :attr:`indicators`. A value of -1 indicates that it has not been
+    estimated, the same as :class:`Candidates`.
+
+    Choices not in ``search_space`` are appended to it when encoding, so a
+    pool can be built with only the keys of subnets, or with nothing at all,
+    in which case the keys of the first added subnet are used.
+
+    Subnets with ``value_subnet`` and ``channel_subnet`` (the nested form
+    supported by :class:`Candidates`) are flattened to the keys
+    ``(name, key)`` when encoding, and nested again when decoding.
+
+    Args:
+        search_space (Dict[Any, List], optional): The choices of each key in
+            subnets. The order of keys is the order of columns.
+            Defaults to None.
+        choices (np.ndarray, optional): ``N x D`` matrix of choice indices.
+            Defaults to None.
+        indicators (np.ndarray, optional): ``N x 4`` matrix of indicators.
+            Defaults to None.
+
+    Examples:
+        >>> pool = CandidatePool({'1': ['c1', 'c2'], '2': ['c3', 'c4']})
+        >>> pool.append({'1': 'c2', '2': 'c3'})
+        >>> pool.choices
+        array([[1, 0]])
+        >>> pool.set_score(0, 100.)
+        >>> pool.scores
+        array([100.])
+        >>> pool[0]
+        {'1': 'c2', '2': 'c3'}
+    """
+    _indicators = Candidates._indicators
+    _nested_names = ('value_subnet', 'channel_subnet')
+
+    def __init__(self,
+                 search_space: Optional[Dict[Any, List]] = None,
+                 choices: Optional[np.ndarray] = None,
+                 indicators: Optional[np.ndarray] = None) -> None:
+        if search_space is None:
+            search_space = dict()
+        self.search_space = {k: list(v) for k, v in search_space.items()}
+        self._choice_index = [{
+            self._hashable(choice): i
+            for i, choice in enumerate(choices_)
+        } for choices_ in self.search_space.values()]
+
+        num_keys = len(self.search_space)
+        if choices is None:
+            choices = np.zeros((0, num_keys), dtype=np.int64)
+        self.choices = self._as_matrix(choices, num_keys, np.int64)
+        if indicators is None:
+            indicators = -np.ones((len(self.choices), len(self._indicators)))
+        self.indicators = self._as_matrix(indicators, len(self._indicators),
+                                          np.float64)
+        assert len(self.choices) == len(self.indicators)
+
+    @staticmethod
+    def _as_matrix(values: Any, num_columns: int, dtype: Any) -> np.ndarray:
+        """Convert ``values`` to a matrix with ``num_columns`` columns."""
+        values = np.asarray(values, dtype=dtype)
+        if num_columns == 0:
+            # the number of rows can't be inferred with zero columns.
+            return values.reshape(len(values), 0)
+        return values.reshape(-1, num_columns)
+
+    @staticmethod
+    def _hashable(choice: Any) -> Any:
+        """Make list choices (e.g. kernel sizes) hashable."""
+        return tuple(choice) if isinstance(choice, list) else choice
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def __getitem__(self, index):
+        """Get the subnet by an int index, or a sub pool by a slice, an index
+        array or a bool mask."""
+        if isinstance(index, (int, np.integer)):
+            return self.decode(self.choices[index:index + 1])[0]
+        # copy the sliced views, so that the sub pool is independent.
+        return CandidatePool(self.search_space, self.choices[index].copy(),
+                             self.indicators[index].copy())
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(num_candidates={len(self)}, '
+                f'keys={list(self.search_space.keys())})')
+
+    @property
+    def scores(self) -> np.ndarray:
+        """The scores of candidates."""
+        return self.indicators[:, 0]
+
+    def resources(self, key_indicator: str = 'flops') -> np.ndarray:
+        """The resources of candidates."""
+        assert key_indicator in ['flops', 'params', 'latency']
+        return self.indicators[:, self._indicators.index(key_indicator)]
+
+    @property
+    def subnets(self) -> List[Dict]:
+        """The subnets of candidates."""
+        return self.decode(self.choices)
+
+    def encode(self, subnets: List[Dict]) -> np.ndarray:
+        """Encode subnets to an ``N x D`` matrix of choice indices.
+
+        Choices not in ``search_space`` are appended to it. If the pool has
+        no keys yet, the keys of the first subnet are used.
+        """
+        subnets = [self._flatten(subnet) for subnet in subnets]
+        if len(self.search_space) == 0 and len(subnets) > 0:
+            assert len(self) == 0, 'Can not add keys to a non-empty pool.'
+            for key in subnets[0]:
+                self.search_space[key] = []
+                self._choice_index.append(dict())
+            self.choices = self.choices.reshape(0, len(self.search_space))
+        matrix = np.zeros((len(subnets), len(self.search_space)),
+                          dtype=np.int64)
+        for n, subnet in enumerate(subnets):
+            assert len(subnet) == len(self.search_space), \
+                f'Expect the keys {list(self.search_space)}, but got ' \
+                f'{list(subnet)}.'
+            for d, key in enumerate(self.search_space):
+                matrix[n, d] = self._encode_choice(d, key, subnet[key])
+        return matrix
+
+    def _encode_choice(self, d: int, key: Any, choice: Any) -> int:
+        """Get the index of ``choice`` of the ``d``-th key, and append it to
+        the search space if not found."""
+        choice_index = self._choice_index[d]
+        hashable_choice = self._hashable(choice)
+        if hashable_choice not in choice_index:
+            choice_index[hashable_choice] = len(self.search_space[key])
+            self.search_space[key].append(choice)
+        return choice_index[hashable_choice]
+
+    def decode(self, matrix: np.ndarray) -> List[Dict]:
+        """Decode an ``N x D`` matrix of choice indices to subnets."""
+        all_choices = list(self.search_space.values())
+        subnets = [{
+            key: all_choices[d][i]
+            for d, (key, i) in enumerate(zip(self.search_space, row))
+        } for row in matrix.tolist()]
+        if self._is_nested():
+            subnets = [self._nest(subnet) for subnet in subnets]
+        return subnets
+
+    @classmethod
+    def _flatten(cls, subnet: Dict) -> Dict:
+        """Flatten a subnet with ``value_subnet`` and ``channel_subnet`` to
+        a dict keyed by ``(name, key)``."""
+        if 'value_subnet' not in subnet:
+            return subnet
+        return {(name, key): choice
+                for name in cls._nested_names
+                for key, choice in subnet[name].items()}
+
+    @classmethod
+    def _nest(cls, subnet: Dict) -> Dict:
+        """The inverse of :meth:`_flatten`."""
+        nested_subnet: Dict[str, Dict] = {
+            name: dict()
+            for name in cls._nested_names
+        }
+        for (name, key), choice in subnet.items():
+            nested_subnet[name][key] = choice
+        return nested_subnet
+
+    def _is_nested(self) -> bool:
+        """Whether the keys are flattened from nested subnets."""
+        return len(self.search_space) > 0 and all(
+            isinstance(key, tuple) and len(key) == 2
+            and key[0] in self._nested_names for key in self.search_space)
+
+    def add(self,
+            choices: np.ndarray,
+            indicators: Optional[np.ndarray] = None) -> None:
+        """Add an ``N x D`` matrix of choice indices with their
+        indicators."""
+        choices = self._as_matrix(choices, len(self.search_space), np.int64)
+        if indicators is None:
+            indicators = -np.ones((len(choices), len(self._indicators)))
+        self.choices = np.concatenate([self.choices, choices])
+        self.indicators = np.concatenate([
+            self.indicators,
+            self._as_matrix(indicators, len(self._indicators), np.float64)
+        ])
+
+    def append(self, subnet: Dict) -> None:
+        """Append a subnet."""
+        self.add(self.encode([subnet]))
+
+    def extend(self, other: Union['CandidatePool', List[Dict]]) -> None:
+        """Extend with another pool or a list of subnets."""
+        if isinstance(other, CandidatePool):
+            if other.search_space == self.search_space:
+                self.add(other.choices, other.indicators)
+            elif len(other) > 0:
+                # the choices may be appended in different orders.
+                self.add(self.encode(other.subnets), other.indicators)
+        else:
+            self.add(self.encode(other))
+
+    def set_score(self, i: int, score: float) -> None:
+        """Set score to the specified subnet by index."""
+        self.set_resource(i, score, 'score')
+
+    def set_resource(self,
+                     i: int,
+                     resources: float,
+                     key_indicator: str = 'flops') -> None:
+        """Set resources to the specified subnet by index."""
+        assert key_indicator in self._indicators
+        self.indicators[i, self._indicators.index(key_indicator)] = resources
+
+    def update_resources(self, resources: list, start: int = 0) -> None:
+        """Update resources to the specified candidate."""
+        end = start + len(resources)
+        assert len(self) >= end, 'Check the number of candidate resources.'
+        for i, resource in enumerate(resources):
+            for key, value in resource.items():
+                self.set_resource(start + i, value, key)
+
+    def argsort(self,
+                key_indicator: str = 'score',
+                reverse: bool = True) -> np.ndarray:
+        """Get the stable sorting indices by a specific indicator."""
+        values = self.indicators[:, self._indicators.index(key_indicator)]
+        if reverse:
+            values = -values
+        return np.argsort(values, kind='stable')
+
+    def sort_by(self,
+                key_indicator: str = 'score',
+                reverse: bool = True) -> None:
+        """Sort by a specific indicator in descending order.
+
+        Args:
+            key_indicator (str): sort all candidates by key_indicator.
+                Defaults to 'score'.
+            reverse (bool): sort all candidates in descending order.
+        """
+        indices = self.argsort(key_indicator, reverse)
+        self.choices = self.choices[indices]
+        self.indicators = self.indicators[indices]
+
+    def top_k(self,
+              k: int,
+              key_indicator: str = 'score',
+              reverse: bool = True) -> 'CandidatePool':
+        """Get the sorted top k candidates by a specific indicator."""
+        k = min(k, len(self))
+        values = self.indicators[:, self._indicators.index(key_indicator)]
+        if reverse:
+            values = -values
+        if 0 < k < len(self):
+            indices = np.argpartition(values, k - 1)[:k]
+        else:
+            indices = np.arange(len(self))[:k]
+        indices = indices[np.argsort(values[indices], kind='stable')]
+        return self[indices]
+
+    def unique_indices(self) -> np.ndarray:
+        """Get the sorted indices of the first occurrence of each subnet."""
+        if len(self) == 0:
+            return np.arange(0)
+        _, indices = np.unique(self.choices, axis=0, return_index=True)
+        return np.sort(indices)
+
+    def unique(self) -> 'CandidatePool':
+        """Get the pool without duplicated subnets, in which the first
+        occurrence of each subnet is kept."""
+        return self[self.unique_indices()]
+
+    def dump(self, file: str) -> None:
+        """Dump to a compressed ``.npz`` file, in which the choices are
+        stored with the smallest int dtype."""
+        max_num_choices = max(
+            [len(v) for v in self.search_space.values()], default=1)
+        dtype = np.uint8 if max_num_choices <= 256 else np.int32
+        np.savez_compressed(
+            file,
+            choices=self.choices.astype(dtype),
+            indicators=self.indicators,
+            search_space=np.array(self.search_space, dtype=object))
+
+    @classmethod
+    def load(cls, file: str) -> 'CandidatePool':
+        """Load from a file dumped by :meth:`dump`."""
+        with np.load(file, allow_pickle=True) as data:
+            return cls(data['search_space'].item(), data['choices'],
+                       data['indicators'])
+
+    @classmethod
+    def from_candidates(
+            cls,
+            candidates: Candidates,
+            search_space: Optional[Dict[Any, List]] = None) -> 'CandidatePool':
+        """Convert :class:`Candidates` to :class:`CandidatePool`.
+
+        Args:
+            candidates (Candidates): The candidates to be converted, e.g. the
+                ones in ``search_epoch_*.pkl``.
+            search_space (Dict[Any, List], optional): The choices of each
+                key. If None, it is built from the appeared choices in
+                ``candidates``. The keys of nested subnets are
+                ``(name, key)``. Defaults to None.
+        """
+        subnets = candidates.subnets if len(candidates) > 0 else []
+        subnets = [cls._flatten(subnet) for subnet in subnets]
+        if search_space is None:
+            search_space = dict()
+            for subnet in subnets:
+                for key, choice in subnet.items():
+                    choices = search_space.setdefault(key, [])
+                    if choice not in choices:
+                        choices.append(choice)
+        # the indicators of nested subnets are duplicated in each part, so
+        # only the first part is read.
+        indicators = [[
+            next(iter(item.values())).get(key, -1) for key in cls._indicators
+        ] for item in candidates.data]
+        pool = cls(search_space)
+        if len(subnets) > 0:
+            pool.add(pool.encode(subnets), np.array(indicators))
+        return pool
+
+    def to_candidates(self) -> Candidates:
+        """Convert to :class:`Candidates`."""
+        data = []
+        for subnet, indicators in zip(self.subnets, self.indicators.tolist()):
+            indicators = dict(zip(self._indicators, indicators))
+            if self._is_nested():
+                data.append({
+                    name: {
+                        **subnet[name],
+                        **indicators
+                    }
+                    for name in self._nested_names
+                })
+            else:
+                data.append({str(subnet): indicators})
+        return Candidates(data)
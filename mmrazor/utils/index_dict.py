@@ -1,6 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from bisect import bisect_right
 from collections import OrderedDict
-from typing import Tuple, TypeVar
+from typing import List, Tuple, TypeVar
 
 VT = TypeVar('VT')  # Value type
 
@@ -17,22 +18,63 @@ class IndexDict(OrderedDict):
     1. ensure a key always is a index(Tuple[int,int]).
     1. ensure the the indexes are sorted by ascending order.
     2. ensure there is no overlap among indexes.
+
+    The starts and the ends of the indexes are also kept in two sorted lists,
+    so an overlap query or the position of a new index is found by bisection
+    in O(log n). Appending an index after all the existing ones is O(1), and
+    inserting one before k existing indexes moves those k keys to the end.
     """
 
+    def __init__(self, *args, **kwargs) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        super().__init__(*args, **kwargs)
+
     def __setitem__(self, __k: Tuple[int, int], __v):
         """set item."""
         start, end = __k
         assert start < end
         self._assert_no_over_lap(start, end)
+        position = bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._ends.insert(position, end)
         super().__setitem__(__k, __v)
-        self._sort()
+        for key in zip(self._starts[position + 1:],
+                       self._ends[position + 1:]):
+            self.move_to_end(key)
+
+    def __delitem__(self, __k: Tuple[int, int]) -> None:
+        """delete item."""
+        super().__delitem__(__k)
+        position = bisect_right(self._starts, __k[0]) - 1
+        del self._starts[position]
+        del self._ends[position]
+
+    def pop(self, __k: Tuple[int, int], *args):
+        """Remove the index and return its value."""
+        if not super().__contains__(__k):
+            return super().pop(__k, *args)
+        value = self[__k]
+        del self[__k]
+        return value
 
-    def _sort(self):
-        """sort the dict accorrding to index."""
-        items = sorted(self.items())
-        self.clear()
-        for k, v in items:
-            super().__setitem__(k, v)
+    def popitem(self, last: bool = True) -> Tuple[Tuple[int, int], VT]:
+        """Remove and return the last or the first index and its value."""
+        if len(self) == 0:
+            raise KeyError('dictionary is empty')
+        key = next(reversed(self)) if last else next(iter(self))
+        return key, self.pop(key)
+
+    def clear(self) -> None:
+        """Remove all indexes."""
+        super().clear()
+        self._starts.clear()
+        self._ends.clear()
+
+    def __reduce__(self):
+        """Rebuild the sorted lists by inserting the items when copied or
+        pickled, instead of restoring them from ``__dict__``."""
+        return self.__class__, (), None, None, iter(list(self.items()))
 
     def _assert_no_over_lap(self, start, end):
         """Assert the index [start,end) has no over lav with existed
@@ -46,12 +88,13 @@ class IndexDict(OrderedDict):
         else:
             self._assert_is_index(__o)
             start, end = __o
-            existed = False
-            for s, e in self.keys():
-                existed = (s <= start < e or s < end < e or
-                           (s < start and end < e)) or existed
-
-            return existed
+            position = bisect_right(self._starts, start)
+            # the index starting before ``start`` overlaps if it ends after
+            # ``start``, and the next one overlaps if it starts before ``end``.
+            if position > 0 and self._ends[position - 1] > start:
+                return True
+            return position < len(self._starts) and \
+                self._starts[position] < end
 
     def _assert_is_index(self, index):
         """Assert the index is an instance of Tuple[int,int]"""
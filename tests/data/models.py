@@ -731,6 +731,41 @@ class DynamicLinearModel(nn.Module):
             self.linear, mutable2, False)
 
 
+class DynamicTwoBranchModel(nn.Module):
+    """
+            x
+        conv_a  conv_b
+        relu_a  relu_b
+            cat
+          relu_cat
+            output
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.conv_a = DynamicConv2d(3, 8, 3, 1, 1)
+        self.conv_b = DynamicConv2d(3, 8, 3, 1, 1)
+        self.relu_a = nn.ReLU()
+        self.relu_b = nn.ReLU()
+        self.relu_cat = nn.ReLU()
+
+        MutableChannelUnit._register_channel_container(
+            self, MutableChannelContainer)
+        self.mutable_a = OneShotMutableChannel(8, candidate_choices=[1, 4, 8])
+        self.mutable_b = OneShotMutableChannel(8, candidate_choices=[2, 4, 8])
+        MutableChannelContainer.register_mutable_channel_to_module(
+            self.conv_a, self.mutable_a, True)
+        MutableChannelContainer.register_mutable_channel_to_module(
+            self.conv_b, self.mutable_b, True)
+
+    def forward(self, x):
+        # relu_a is executed after conv_b.
+        x_a = self.conv_a(x)
+        x_b = self.conv_b(x)
+        x = torch.cat([self.relu_a(x_a), self.relu_b(x_b)], dim=1)
+        return self.relu_cat(x)
+
+
 class DynamicAttention(nn.Module):
     """
         x 
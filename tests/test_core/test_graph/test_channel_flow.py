@@ -59,6 +59,31 @@ class TestChannelTensor(unittest.TestCase):
         self.assertUionedTensor(tensor_cat2[4:8], tensor1[4:8])
         self.assertUionedTensor(tensor_cat2[8:], tensor2)
 
+    def test_expand(self):
+        tensor1 = ChannelTensor(4)
+        tensor2 = tensor1.expand(2)
+        self.assertEqual(len(tensor2), 8)
+        self.assertUionedTensor(tensor2[0::2], tensor1)
+        self.assertUionedTensor(tensor2[1::2], tensor1)
+        self.assertNotEqual(tensor2[0].root, tensor2[2].root)
+
+    def test_elems_hash_dict(self):
+        tensor1 = ChannelTensor(8)
+        tensor2 = ChannelTensor(4)
+        tensor1[4:].union(tensor2)
+        hash_dict = tensor1.elems_hash_dict
+        self.assertEqual(list(hash_dict.keys()), [(0, 4), (4, 8)])
+        self.assertNotEqual(hash_dict[(0, 4)], hash_dict[(4, 8)])
+        self.assertEqual(tensor2.elems_hash_dict[(0, 4)],
+                         hash_dict[(4, 8)])
+
+        # the index restarts in a cat of two tensors with the same hash.
+        tensor3 = ChannelTensor(4)
+        tensor3.union(ChannelTensor(4))
+        tensor_cat = ChannelTensor.cat([tensor3, tensor3])
+        self.assertEqual(
+            list(tensor_cat.elems_hash_dict.keys()), [(0, 4), (4, 8)])
+
     def assertUionedTensor(self, tensor1: ChannelTensor,
                            tensor2: ChannelTensor):
         assert len(tensor1) == len(tensor2)
@@ -0,0 +1,91 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import tempfile
+from unittest import TestCase
+
+import torch
+from mmengine.structures import BaseDataElement
+from torch import nn
+
+from mmrazor.models.task_modules import (CachedTeacherRecorder,
+                                         ModuleOutputsRecorder,
+                                         TeacherRecordCache)
+
+
+class ToyModel(nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.fc = nn.Linear(4, 10)
+
+    def forward(self, x):
+        return self.fc(x)
+
+
+class TestTeacherRecordCache(TestCase):
+
+    def test_put_get(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = TeacherRecordCache(tmpdir, chunk_size=3)
+            data_samples = [
+                BaseDataElement(metainfo=dict(sample_idx=i)) for i in [5, 1]
+            ]
+            indices = cache.get_indices(data_samples)
+            self.assertEqual(indices, [5, 1])
+            self.assertFalse(cache.contains(indices))
+
+            logits = torch.randn(2, 10)
+            cache.put(dict(fc=[logits, logits * 2]), indices)
+            self.assertTrue(cache.contains(indices))
+            self.assertTrue(cache.contains([1]))
+            self.assertFalse(cache.contains([0, 1]))
+
+            # read by a new cache from the files.
+            records = TeacherRecordCache(
+                tmpdir, chunk_size=3).get([1, 5], torch.device('cpu'))
+            self.assertTrue(torch.allclose(records['fc'][0], logits[[1, 0]]))
+            self.assertTrue(
+                torch.allclose(records['fc'][1], logits[[1, 0]] * 2))
+
+    def test_fp16_topk(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = TeacherRecordCache(tmpdir, fp16=True, topk=3)
+            logits = torch.randn(2, 10)
+            cache.put(dict(fc=[logits]), [0, 1])
+            record = cache.get([0, 1], torch.device('cpu'))['fc'][0]
+            self.assertEqual(record.shape, logits.shape)
+            self.assertEqual(record.dtype, torch.float32)
+
+            values, indices = logits.topk(3, dim=1)
+            self.assertTrue(
+                torch.allclose(
+                    record.gather(1, indices), values, atol=1e-2))
+            self.assertEqual(int((record == -1e4).sum()), 2 * 7)
+
+
+class TestCachedTeacherRecorder(TestCase):
+
+    def test_serve(self):
+        model = ToyModel()
+        recorder = CachedTeacherRecorder(ModuleOutputsRecorder('fc'))
+        recorder.initialize(model)
+        self.assertEqual(recorder.source, 'fc')
+
+        inputs = torch.randn(2, 4)
+        with recorder:
+            outputs = model(inputs)
+        self.assertTrue(torch.equal(recorder.get_record_data(), outputs))
+
+        served = torch.randn(2, 10)
+        recorder.serve([served])
+        with recorder:
+            pass
+        self.assertTrue(torch.equal(recorder.get_record_data(), served))
+
+        # records the model again after serving once.
+        with recorder:
+            outputs = model(inputs)
+        self.assertTrue(torch.equal(recorder.get_record_data(), outputs))
+
+        recorder = CachedTeacherRecorder(dict(type='ModuleOutputs',
+                                              source='fc'))
+        self.assertIsInstance(recorder.recorder, ModuleOutputsRecorder)
@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import copy
 from unittest import TestCase
 
 from mmrazor.models.task_modules import FunctionOutputsRecorder
@@ -49,3 +50,11 @@ class TestFuncOutputsRecorder(TestCase):
         execute_toy_func(1)
         data = recorder.get_record_data()
         self.assertTrue(data == 1)
+
+        # the imported module is cached and dropped when copied.
+        self.assertIsNotNone(recorder._imported_module)
+        recorder_copy = copy.deepcopy(recorder)
+        self.assertIsNone(recorder_copy._imported_module)
+        with recorder_copy:
+            execute_toy_func(2)
+        self.assertTrue(recorder_copy.get_record_data() == 2)
@@ -42,9 +42,13 @@ class TestModuleOutputsRecorder(TestCase):
         model = ToyModel()
         recorder.initialize(model)
 
+        # the hook is only registered in the context.
+        self.assertEqual(len(model.conv2._forward_hooks), 0)
         with recorder:
             self.assertTrue(recorder.recording)
+            self.assertEqual(len(model.conv2._forward_hooks), 1)
             res = model(torch.randn(1, 1, 1, 1))
+        self.assertEqual(len(model.conv2._forward_hooks), 0)
 
         self.assertEquals(res, recorder.get_record_data())
 
@@ -73,3 +77,38 @@ class TestModuleOutputsRecorder(TestCase):
 
         _ = model(torch.randn(1, 1, 1, 1))
         self.assertTrue(len(recorder.data_buffer) == 0)
+
+    def test_storage_options(self):
+
+        model = ToyModel()
+        recorder = ModuleInputsRecorder(
+            'conv1', data_idx=0, max_records=1, detach=True, dtype='float16')
+        recorder.initialize(model)
+
+        tensor = torch.randn(1, 1, 1, 1, requires_grad=True)
+        with recorder:
+            _ = model(tensor * 2)
+            _ = model(tensor)
+
+        # only the first input tensor is stored.
+        self.assertEqual(len(recorder.data_buffer), 1)
+        record = recorder.get_record_data()
+        self.assertIsInstance(record, torch.Tensor)
+        self.assertTrue(torch.equal(record, recorder.get_record_data(
+            data_idx=0)))
+        with self.assertRaisesRegex(AssertionError, 'Only the data_idx 0'):
+            _ = recorder.get_record_data(data_idx=1)
+        self.assertFalse(record.requires_grad)
+        self.assertEqual(record.dtype, torch.float16)
+        self.assertTrue(torch.allclose(record.float(), tensor * 2, atol=1e-2))
+
+        recorder = ModuleOutputsRecorder('conv2', channels_last=True)
+        recorder.initialize(model)
+        with recorder:
+            _ = model(torch.randn(2, 1, 2, 2))
+        self.assertTrue(recorder.get_record_data().is_contiguous(
+            memory_format=torch.channels_last))
+        self.assertTrue(recorder.get_record_data().requires_grad)
+
+        recorder.reset_data_buffer()
+        self.assertEqual(len(recorder.data_buffer), 0)
@@ -56,3 +56,7 @@ class TestRecorderManager(TestCase):
         conv2_outputs = manager.recorders['r1'].get_record_data()
 
         self.assertEquals(res.sum(), method_outputs + conv2_outputs.sum())
+
+        manager.reset_data_buffer()
+        self.assertEqual(len(manager.recorders['r1'].data_buffer), 0)
+        self.assertEqual(len(manager.recorders['r2'].data_buffer), 0)
@@ -0,0 +1,137 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import copy
+import pickle
+from unittest import TestCase
+
+import torch
+from torch import nn
+
+from mmrazor.models.task_modules import (ModuleOutputsRecorder,
+                                         SharedForwardManager)
+from mmrazor.models.task_modules.recorder.shared_forward_manager import \
+    SharedForwardModule
+
+
+class CountedLinear(nn.Linear):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_calls = 0
+
+    def forward(self, x):
+        self.num_calls += 1
+        return super().forward(x)
+
+
+class ToyModel(nn.Module):
+
+    def __init__(self, stem):
+        super().__init__()
+        self.stem = stem
+        self.head = nn.Linear(4, 2)
+
+    def forward(self, x):
+        return self.head(self.stem(x))
+
+
+def build_stem():
+    return nn.Sequential(CountedLinear(4, 4), nn.ReLU())
+
+
+def build_models():
+    stem = build_stem()
+    student, teacher = ToyModel(stem), ToyModel(stem)
+    manager = SharedForwardManager()
+    manager.prepare_from_student(student)
+    manager.prepare_from_teacher(teacher)
+    return student, teacher, manager
+
+
+class TestSharedForwardManager(TestCase):
+
+    def test_prepare(self):
+        student, teacher, manager = build_models()
+        # only the outermost shared module is wrapped, in both models.
+        self.assertEqual(len(manager.shared_modules), 1)
+        self.assertIsInstance(student.stem, SharedForwardModule)
+        self.assertIs(student.stem, teacher.stem)
+        self.assertIs(student.stem, manager.shared_modules[0])
+
+        # the teacher is the student.
+        manager = SharedForwardManager()
+        manager.prepare_from_student(student)
+        manager.prepare_from_teacher(student)
+        self.assertEqual(len(manager.shared_modules), 0)
+
+    def test_state_dict(self):
+        student, _, _ = build_models()
+        model = ToyModel(build_stem())
+        self.assertEqual(list(student.state_dict()), list(model.state_dict()))
+
+        student.load_state_dict(model.state_dict())
+        self.assertTrue(
+            torch.equal(student.stem.module[0].weight, model.stem[0].weight))
+
+    def test_shared_forward(self):
+        stem = build_stem()
+        student, teacher = ToyModel(stem), ToyModel(stem)
+        # the recorder is initialized before wrapping, as in distillers.
+        recorder = ModuleOutputsRecorder('stem')
+        recorder.initialize(student)
+        manager = SharedForwardManager()
+        manager.prepare_from_student(student)
+        manager.prepare_from_teacher(teacher)
+
+        x = torch.randn(2, 4)
+        with manager:
+            teacher(x)
+            with recorder:
+                student_out = student(x)
+        self.assertEqual(stem[0].num_calls, 1)
+        # hooks of the shared module are called with the reused outputs.
+        self.assertEqual(len(recorder.data_buffer), 1)
+        student_out.sum().backward()
+        self.assertIsNotNone(stem[0].weight.grad)
+
+        # outputs without grad are not reused for trainable modules.
+        with manager:
+            with torch.no_grad():
+                teacher(x)
+            student(x)
+        self.assertEqual(stem[0].num_calls, 3)
+
+        # not reused if the hooks of submodules can't be replayed.
+        inner_recorder = ModuleOutputsRecorder('stem.module.0')
+        inner_recorder.initialize(student)
+        with manager:
+            teacher(x)
+            with inner_recorder:
+                student(x)
+        self.assertEqual(stem[0].num_calls, 5)
+        self.assertEqual(len(inner_recorder.data_buffer), 1)
+
+        # not reused out of the context.
+        teacher(x)
+        student(x)
+        self.assertEqual(stem[0].num_calls, 7)
+
+    def test_copy(self):
+        student, teacher, manager = build_models()
+        models = nn.ModuleDict(dict(student=student, teacher=teacher))
+
+        x = torch.randn(2, 4)
+        for copied in [
+                copy.deepcopy(models),
+                pickle.loads(pickle.dumps(models))
+        ]:
+            stem = copied['student'].stem
+            self.assertIs(stem, copied['teacher'].stem)
+            self.assertIsNot(stem.module, student.stem.module)
+
+            # the copied models run their own modules.
+            stem.sharing = True
+            copied['teacher'](x)
+            copied['student'](x)
+            stem.sharing = False
+            self.assertEqual(stem.module[0].num_calls, 1)
+            self.assertEqual(student.stem.module[0].num_calls, 0)
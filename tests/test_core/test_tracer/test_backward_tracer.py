@@ -10,6 +10,7 @@ from mmrazor.models.task_modules import (BackwardTracer, Path, PathConcatNode,
                                          PathConvNode, PathDepthWiseConvNode,
                                          PathLinearNode, PathList,
                                          PathNormNode)
+from mmrazor.structures.graph import ModuleGraph
 
 NONPASS_NODES = (PathConvNode, PathLinearNode, PathConcatNode)
 PASS_NODES = (PathNormNode, PathDepthWiseConvNode)
@@ -100,6 +101,24 @@ class ResBlock(Module):
         return x3
 
 
+class DeepResModel(Module):
+
+    def __init__(self, num_blocks=200) -> None:
+        super().__init__()
+
+        self.stem = nn.Conv2d(3, 8, 1)
+        self.convs = nn.ModuleList(
+            [nn.Conv2d(8, 8, 1) for _ in range(num_blocks)])
+        self.bns = nn.ModuleList(
+            [nn.BatchNorm2d(8) for _ in range(num_blocks)])
+
+    def forward(self, x: Tensor) -> Tensor:
+        x = self.stem(x)
+        for conv, bn in zip(self.convs, self.bns):
+            x = x + torch.relu(bn(conv(x)))
+        return x
+
+
 class ToyCNNPseudoLoss:
 
     def __init__(self, input_shape=(2, 3, 16, 16)):
@@ -198,6 +217,36 @@ class TestBackwardTracer(TestCase):
         assert nonpass2parents['op4'] == nonpass2parents['op5'] == \
                nonpass2parents['op6'] == nonpass2parents['op7']
 
+    def test_dag_trace(self) -> None:
+
+        def get_edges(model, dag_trace):
+            tracer = BackwardTracer(
+                loss_calculator=ToyCNNPseudoLoss(), dag_trace=dag_trace)
+            graph = ModuleGraph.init_from_backward_tracer(model, tracer)
+            return {(prev.name, node.name)
+                    for node in graph for prev in node.prev_nodes}
+
+        # the same graph is built from the paths traced as a dag.
+        for Model in [ResBlock, MultiConcatModel, MultiConcatModel2]:
+            model = Model()
+            self.assertEqual(
+                get_edges(model, True), get_edges(model, False))
+
+        path_list = BackwardTracer(
+            loss_calculator=ToyCNNPseudoLoss(),
+            dag_trace=True).trace(ResBlock())
+        self.assertIn(Path([PathConvNode('op3'), PathNormNode('bn1')]),
+                      path_list.paths)
+        self.assertIn(Path(PathConvNode('op1')), path_list.paths)
+
+        # deep residual models don't hit the recursion limit.
+        model = DeepResModel()
+        path_list = BackwardTracer(
+            loss_calculator=ToyCNNPseudoLoss(),
+            dag_trace=True).trace(model)
+        self.assertIn(Path([PathConvNode('convs.199'), PathConvNode('stem')]),
+                      path_list.paths)
+
     def test_repr(self):
         toy_node = PathConvNode('op1')
         assert repr(toy_node) == 'PathConvNode(\'op1\')'
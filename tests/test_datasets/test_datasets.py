@@ -79,6 +79,32 @@ class Test_CRD_CIFAR10(TestCase):
         dataset = dataset_class(**cfg)
         self.assertEqual(dataset.dataset.CLASSES, ('bus', 'car'))
 
+    def test_contrast_info(self):
+        dataset_class = DATASETS.get(self.DATASET_TYPE)
+        ori_cfg = {
+            **self.ORI_DEFAULT_ARGS, 'type': self.ORI_DATASET_TYPE,
+            '_scope_': 'mmcls'
+        }
+        for percent in [1., 0.5]:
+            cfg = {
+                'dataset': ori_cfg,
+                'neg_num': 3,
+                'percent': percent,
+                'sample_mode': 'random'
+            }
+            dataset = dataset_class(**cfg)
+            gt_labels = dataset.gt_labels
+            for idx in range(len(dataset)):
+                if dataset.num_negatives[gt_labels[idx]] == 0:
+                    continue
+                idxs = dataset._get_contrast_info(dict(),
+                                                  idx)['contrast_sample_idxs']
+                self.assertEqual(len(idxs), 4)
+                self.assertEqual(gt_labels[idxs[0]], gt_labels[idx])
+                # negative samples are never in the same class.
+                for neg_idx in idxs[1:]:
+                    self.assertNotEqual(gt_labels[neg_idx], gt_labels[idx])
+
     @classmethod
     def tearDownClass(cls):
         cls.tmpdir.cleanup()
@@ -0,0 +1,77 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import copy
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import torch
+from mmengine import ConfigDict
+
+from mmrazor.models import FpnTeacherDistill
+from .toy_models import ToyFpnTeacher, ToyStudent
+
+
+class TestFpnTeacherDistill(TestCase):
+
+    def setUp(self):
+        recorders_cfg = ConfigDict(
+            conv=dict(type='ModuleOutputs', source='conv'))
+
+        self.alg_kwargs = ConfigDict(
+            architecture=dict(type='ToyStudent'),
+            teacher=dict(type='ToyFpnTeacher'),
+            distiller=dict(
+                type='ConfigurableDistiller',
+                student_recorders=recorders_cfg,
+                teacher_recorders=recorders_cfg,
+                distill_losses=dict(loss_toy=dict(type='ToyDistillLoss')),
+                loss_forward_mappings=dict(
+                    loss_toy=dict(
+                        arg1=dict(from_student=True, recorder='conv'),
+                        arg2=dict(from_student=False, recorder='conv')))))
+
+    def test_loss(self):
+        img = torch.randn(1, 3, 1, 1)
+
+        # the frozen teacher only extracts features without grad.
+        alg = FpnTeacherDistill(**self.alg_kwargs)
+        alg.teacher.forward = MagicMock(wraps=alg.teacher.forward)
+        alg.teacher.extract_feat = MagicMock(wraps=alg.teacher.extract_feat)
+        losses = alg(img, mode='loss')
+        self.assertIn('distill.loss_toy', losses)
+        self.assertIn('student.loss', losses)
+        self.assertNotIn('teacher.loss', losses)
+        alg.teacher.extract_feat.assert_called_once_with(img)
+        alg.teacher.forward.assert_not_called()
+        self.assertFalse(
+            alg.distiller.get_record('conv', False).requires_grad)
+
+        alg_kwargs = copy.deepcopy(self.alg_kwargs)
+        alg_kwargs['teacher_trainable'] = True
+        alg = FpnTeacherDistill(**alg_kwargs)
+        alg.teacher.extract_feat = MagicMock(wraps=alg.teacher.extract_feat)
+        losses = alg(img, mode='loss')
+        self.assertIn('distill.loss_toy', losses)
+        alg.teacher.extract_feat.assert_called_once_with(img)
+        self.assertTrue(alg.distiller.get_record('conv', False).requires_grad)
+
+    def test_share_forward(self):
+        img = torch.randn(1, 3, 1, 1)
+        student, teacher = ToyStudent(), ToyFpnTeacher()
+        teacher.conv = student.conv
+        student.conv.forward = MagicMock(wraps=student.conv.forward)
+
+        alg_kwargs = copy.deepcopy(self.alg_kwargs)
+        alg_kwargs['architecture'] = student
+        alg_kwargs['teacher'] = teacher
+        alg_kwargs['teacher_trainable'] = True
+        alg_kwargs['distiller']['share_forward'] = True
+        alg = FpnTeacherDistill(**alg_kwargs)
+
+        # the student reuses the outputs of the shared conv.
+        losses = alg(img, mode='loss')
+        self.assertEqual(student.conv.module.forward.call_count, 1)
+        self.assertTrue(
+            torch.equal(
+                alg.distiller.get_record('conv', True),
+                alg.distiller.get_record('conv', False)))
+        self.assertIn('distill.loss_toy', losses)
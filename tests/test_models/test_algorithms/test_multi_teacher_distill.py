@@ -0,0 +1,135 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import copy
+from unittest import TestCase
+
+import torch
+from mmengine import ConfigDict
+
+from mmrazor.models.algorithms import MultiTeacherDistill
+from .toy_models import ToyStudent  # noqa: F401
+
+
+class TestMultiTeacherDistill(TestCase):
+
+    def setUp(self):
+        student_recorders = ConfigDict(
+            conv=dict(type='ModuleOutputs', source='conv'))
+        teacher_recorders = ConfigDict(
+            conv1=dict(type='ModuleOutputs', source='teacher1.conv'),
+            conv2=dict(type='ModuleOutputs', source='teacher2.conv'),
+            conv3=dict(type='ModuleOutputs', source='teacher3.conv'))
+        self.alg_kwargs = ConfigDict(
+            architecture=dict(type='ToyStudent'),
+            teachers=dict(
+                teacher1=dict(type='ToyTeacher'),
+                teacher2=dict(type='ToyTeacher'),
+                teacher3=dict(type='ToyTeacher')),
+            distiller=dict(
+                type='ConfigurableDistiller',
+                student_recorders=student_recorders,
+                teacher_recorders=teacher_recorders,
+                distill_losses=dict(
+                    loss_toy1=dict(type='ToyDistillLoss'),
+                    loss_toy2=dict(type='ToyDistillLoss'),
+                    loss_toy3=dict(type='ToyDistillLoss')),
+                loss_forward_mappings=dict(
+                    loss_toy1=dict(
+                        arg1=dict(from_student=True, recorder='conv'),
+                        arg2=dict(from_student=False, recorder='conv1')),
+                    loss_toy2=dict(
+                        arg1=dict(from_student=True, recorder='conv'),
+                        arg2=dict(from_student=False, recorder='conv2')),
+                    loss_toy3=dict(
+                        arg1=dict(from_student=True, recorder='conv'),
+                        arg2=dict(from_student=False, recorder='conv3')))))
+
+    def test_init(self):
+        alg = MultiTeacherDistill(**copy.deepcopy(self.alg_kwargs))
+        self.assertEqual(len(alg.teachers), 3)
+        self.assertEqual(alg.loss_teachers['loss_toy2'], {'teacher2'})
+
+        alg_kwargs = copy.deepcopy(self.alg_kwargs)
+        alg_kwargs.teachers.teacher1 = 'teacher'
+        with self.assertRaisesRegex(TypeError,
+                                    'teacher should be a `dict` or'):
+            _ = MultiTeacherDistill(**alg_kwargs)
+
+        alg_kwargs = copy.deepcopy(self.alg_kwargs)
+        alg_kwargs.distiller.teacher_recorders.conv1.source = 'conv'
+        with self.assertRaisesRegex(AssertionError, 'not in the model'):
+            _ = MultiTeacherDistill(**alg_kwargs)
+
+    def test_loss(self):
+        img = torch.randn(1, 3, 1, 1)
+
+        alg = MultiTeacherDistill(**copy.deepcopy(self.alg_kwargs))
+        losses = alg(img, mode='loss')
+        self.assertIn('student.loss', losses)
+        for i in range(1, 4):
+            self.assertIn(f'distill.loss_toy{i}', losses)
+
+        for teacher_sampler in ['round_robin', 'random']:
+            alg = MultiTeacherDistill(
+                num_active_teachers=2,
+                teacher_sampler=teacher_sampler,
+                parallel_teachers=True,
+                **copy.deepcopy(self.alg_kwargs))
+            for _ in range(3):
+                losses = alg(img, mode='loss')
+                distill_keys = [k for k in losses if k.startswith('distill')]
+                self.assertEqual(len(distill_keys), 2)
+
+        # round robin runs every teacher in turn.
+        alg = MultiTeacherDistill(
+            num_active_teachers=1, **copy.deepcopy(self.alg_kwargs))
+        for i in range(1, 4):
+            self.assertEqual(alg.sample_teachers(), [f'teacher{i}'])
+
+    def test_rescale_losses(self):
+        img = torch.randn(1, 3, 1, 1)
+        alg = MultiTeacherDistill(
+            num_active_teachers=1, **copy.deepcopy(self.alg_kwargs))
+        losses = alg(img, mode='loss')
+        student_out = alg.student.conv(img)
+        teacher_out = alg.teachers['teacher1'].conv(img)
+        self.assertTrue(
+            torch.allclose(losses['distill.loss_toy1'],
+                           (student_out + teacher_out) * 3))
+
+    def test_rescale_multi_teacher_losses(self):
+        img = torch.randn(1, 3, 1, 1)
+        alg_kwargs = copy.deepcopy(self.alg_kwargs)
+        alg_kwargs.teachers.teacher4 = dict(type='ToyTeacher')
+        distiller = alg_kwargs.distiller
+        distiller.teacher_recorders.conv4 = dict(
+            type='ModuleOutputs', source='teacher4.conv')
+        distiller.distill_losses = dict(loss_pair=dict(type='ToyDistillLoss'))
+        distiller.loss_forward_mappings = dict(
+            loss_pair=dict(
+                arg1=dict(from_student=False, recorder='conv1'),
+                arg2=dict(from_student=False, recorder='conv2')))
+
+        # round robin runs [teacher1, teacher2] in every other step.
+        alg = MultiTeacherDistill(
+            num_active_teachers=2, **copy.deepcopy(alg_kwargs))
+        self.assertEqual(alg.loss_active_freqs['loss_pair'], 0.5)
+        losses = alg(img, mode='loss')
+        teacher_out1 = alg.teachers['teacher1'].conv(img)
+        teacher_out2 = alg.teachers['teacher2'].conv(img)
+        self.assertTrue(
+            torch.allclose(losses['distill.loss_pair'],
+                           (teacher_out1 + teacher_out2) * 2))
+        losses = alg(img, mode='loss')
+        self.assertNotIn('distill.loss_pair', losses)
+
+        alg = MultiTeacherDistill(
+            num_active_teachers=2,
+            teacher_sampler='random',
+            **copy.deepcopy(alg_kwargs))
+        self.assertAlmostEqual(alg.loss_active_freqs['loss_pair'], 1 / 6)
+
+        # teacher2 and teacher3 never run together with round robin.
+        distiller.loss_forward_mappings['loss_pair']['arg1'][
+            'recorder'] = 'conv3'
+        with self.assertRaisesRegex(AssertionError, 'never active together'):
+            _ = MultiTeacherDistill(num_active_teachers=2, **alg_kwargs)
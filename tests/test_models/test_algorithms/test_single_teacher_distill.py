@@ -1,9 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
+import tempfile
 from unittest import TestCase
+from unittest.mock import MagicMock
 
 import torch
 from mmengine import ConfigDict
+from mmengine.structures import BaseDataElement
 
 from mmrazor.models import SingleTeacherDistill
 from .toy_models import ToyStudent
@@ -75,3 +78,50 @@ class TestSingleTeacherDistill(TestCase):
         self.assertIn('distill.loss_toy', losses)
         self.assertIn('student.loss', losses)
         self.assertIn('teacher.loss', losses)
+
+    def test_loss_with_teacher_cache(self):
+
+        recorders_cfg = ConfigDict(
+            conv=dict(type='ModuleOutputs', source='conv'))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            alg_kwargs = ConfigDict(
+                architecture=dict(type='ToyStudent'),
+                teacher=dict(type='ToyTeacher'),
+                teacher_cache_cfg=dict(cache_dir=tmpdir),
+                distiller=dict(
+                    type='ConfigurableDistiller',
+                    student_recorders=recorders_cfg,
+                    teacher_recorders=recorders_cfg,
+                    distill_losses=dict(loss_toy=dict(type='ToyDistillLoss')),
+                    loss_forward_mappings=dict(
+                        loss_toy=dict(
+                            arg1=dict(from_student=True, recorder='conv'),
+                            arg2=dict(from_student=False, recorder='conv')))))
+
+            img = torch.randn(2, 3, 1, 1)
+            data_samples = [
+                BaseDataElement(metainfo=dict(sample_idx=i)) for i in range(2)
+            ]
+
+            alg = SingleTeacherDistill(**alg_kwargs)
+            alg.teacher.forward = MagicMock(wraps=alg.teacher.forward)
+            losses = alg(img, data_samples, mode='loss')
+            self.assertIn('distill.loss_toy', losses)
+            self.assertEqual(alg.teacher.forward.call_count, 1)
+            teacher_record = alg.distiller.get_record('conv', False)
+
+            # the teacher is not called when the records are cached.
+            cached_losses = alg(img, data_samples, mode='loss')
+            self.assertEqual(alg.teacher.forward.call_count, 1)
+            self.assertTrue(
+                torch.allclose(
+                    alg.distiller.get_record('conv', False), teacher_record))
+            self.assertTrue(
+                torch.allclose(cached_losses['distill.loss_toy'],
+                               losses['distill.loss_toy']))
+
+            alg_kwargs_ = copy.deepcopy(alg_kwargs)
+            alg_kwargs_['teacher_trainable'] = True
+            with self.assertRaisesRegex(AssertionError, 'trainable'):
+                _ = SingleTeacherDistill(**alg_kwargs_)
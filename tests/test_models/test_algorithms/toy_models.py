@@ -34,6 +34,13 @@ class ToyTeacher(ToyStudent):
         super().__init__()
 
 
+@MODELS.register_module()
+class ToyFpnTeacher(ToyStudent):
+
+    def extract_feat(self, batch_inputs):
+        return self.conv(batch_inputs)
+
+
 @MODELS.register_module()
 class ToyOFDStudent(BaseModel):
 
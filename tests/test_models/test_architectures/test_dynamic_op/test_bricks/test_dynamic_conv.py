@@ -72,6 +72,37 @@ class TestDynamicConv2d(TestCase):
 
         assert torch.equal(out1, out2)
 
+    def test_dynamic_conv2d_channel_index(self) -> None:
+        d_conv2d = DynamicConv2d(
+            in_channels=4, out_channels=10, kernel_size=3, bias=True)
+        mutable_in_channels = SquentialMutableChannel(4)
+        mutable_out_channels = SquentialMutableChannel(10)
+        d_conv2d.register_mutable_attr('in_channels', mutable_in_channels)
+        d_conv2d.register_mutable_attr('out_channels', mutable_out_channels)
+
+        # sequential channels are sliced as views.
+        mutable_in_channels.current_choice = 3
+        mutable_out_channels.current_choice = 6
+        weight, bias, _ = d_conv2d.get_dynamic_params()
+        assert weight.shape == (6, 3, 3, 3)
+        assert weight.data_ptr() == d_conv2d.weight.data_ptr()
+        assert bias.data_ptr() == d_conv2d.bias.data_ptr()
+
+        # other channels are selected by masks.
+        d_conv2d = DynamicConv2d(
+            in_channels=4, out_channels=10, kernel_size=3, bias=True)
+        mutable_in_channels = SquentialMutableChannel(4)
+        mutable_in_channels.current_choice = 3
+        mutable_out_channels = SimpleMutableChannel(10)
+        d_conv2d.register_mutable_attr('in_channels', mutable_in_channels)
+        d_conv2d.register_mutable_attr('out_channels', mutable_out_channels)
+        out_mask = torch.zeros(10).bool()
+        out_mask[[1, 3, 5]] = True
+        mutable_out_channels.current_choice = out_mask
+        weight, bias, _ = d_conv2d.get_dynamic_params()
+        assert torch.equal(weight, d_conv2d.weight[out_mask][:, :3])
+        assert torch.equal(bias, d_conv2d.bias[out_mask])
+
 
 def mock_layeri_choice(d_conv2d: FuseConv2d) -> None:
     # mock selected out channel proxy for `FuseConv2d`
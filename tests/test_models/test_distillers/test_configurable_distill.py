@@ -1,8 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
+import torch
 from mmengine import ConfigDict
+from torch import nn
 
 from mmrazor.models import ConfigurableDistiller
 
@@ -65,3 +68,121 @@ class TestConfigurableDistiller(TestCase):
         with self.assertRaisesRegex(TypeError,
                                     'from_student should be a bool'):
             _ = ConfigurableDistiller(**distiller_kwargs_)
+
+    def test_fuse_losses(self):
+        student = nn.Sequential(nn.Conv2d(3, 3, 1))
+        teacher = nn.Sequential(nn.Conv2d(3, 3, 1))
+        recorders_cfg = dict(conv=dict(type='ModuleOutputs', source='0'))
+        pool = dict(
+            type='TorchFunctionalConnector',
+            function_name='avg_pool2d',
+            func_args=dict(kernel_size=2))
+        distiller_kwargs = dict(
+            student_recorders=recorders_cfg,
+            teacher_recorders=recorders_cfg,
+            connectors=dict(pool=pool),
+            distill_losses=dict(
+                loss_a=dict(type='ToyDistillLoss'),
+                loss_b=dict(type='ToyDistillLoss')),
+            loss_forward_mappings=dict(
+                loss_a=dict(
+                    arg1=dict(
+                        from_student=True, recorder='conv', connector='pool'),
+                    arg2=dict(
+                        from_student=False, recorder='conv',
+                        connector='pool')),
+                loss_b=dict(
+                    arg1=dict(
+                        from_student=True, recorder='conv', connector='pool'),
+                    arg2=dict(
+                        from_student=False, recorder='conv',
+                        connector='pool'))))
+
+        x = torch.randn(1, 3, 4, 4)
+        all_losses = list()
+        for fuse_losses in [False, True]:
+            distiller = ConfigurableDistiller(
+                fuse_losses=fuse_losses, **copy.deepcopy(distiller_kwargs))
+            distiller.prepare_from_student(student)
+            distiller.prepare_from_teacher(teacher)
+            connector = distiller.connectors['pool']
+            connector.forward = MagicMock(wraps=connector.forward)
+            with distiller.student_recorders, distiller.teacher_recorders:
+                student(x)
+                teacher(x)
+            all_losses.append(distiller.compute_distill_losses())
+            # the connector is called once for each record if fused.
+            num_calls = 2 if fuse_losses else 4
+            self.assertEqual(connector.forward.call_count, num_calls)
+
+        self.assertEqual(distiller.loss_plan.num_records, 2)
+        for name in ['loss_a', 'loss_b']:
+            self.assertTrue(torch.equal(all_losses[0][name],
+                                        all_losses[1][name]))
+
+    def test_compile_losses_torch_version(self):
+        distiller_kwargs = dict(
+            student_recorders=dict(
+                conv=dict(type='ModuleOutputs', source='0')),
+            teacher_recorders=dict(
+                conv=dict(type='ModuleOutputs', source='0')),
+            distill_losses=dict(loss=dict(type='ToyDistillLoss')),
+            loss_forward_mappings=dict(
+                loss=dict(
+                    arg1=dict(from_student=True, recorder='conv'),
+                    arg2=dict(from_student=False, recorder='conv'))))
+        with patch.object(torch, '__version__', '1.13.1'):
+            with self.assertRaisesRegex(AssertionError, 'torch 2.0'):
+                ConfigurableDistiller(
+                    fuse_losses=True,
+                    compile_losses=True,
+                    **copy.deepcopy(distiller_kwargs))
+
+    def test_fuse_losses_new_record_after_connector(self):
+        student = nn.Sequential(nn.Conv2d(3, 3, 1), nn.Conv2d(3, 3, 1))
+        teacher = nn.Sequential(nn.Conv2d(3, 3, 1), nn.Conv2d(3, 3, 1))
+        recorders_cfg = dict(
+            conv0=dict(type='ModuleOutputs', source='0'),
+            conv1=dict(type='ModuleOutputs', source='1'))
+        pool = dict(
+            type='TorchFunctionalConnector',
+            function_name='avg_pool2d',
+            func_args=dict(kernel_size=2))
+        # ``loss_b`` uses records first used after the connector steps of
+        # ``loss_a``.
+        distiller_kwargs = dict(
+            student_recorders=recorders_cfg,
+            teacher_recorders=recorders_cfg,
+            connectors=dict(pool=pool),
+            distill_losses=dict(
+                loss_a=dict(type='ToyDistillLoss'),
+                loss_b=dict(type='ToyDistillLoss')),
+            loss_forward_mappings=dict(
+                loss_a=dict(
+                    arg1=dict(
+                        from_student=True, recorder='conv0', connector='pool'),
+                    arg2=dict(
+                        from_student=False, recorder='conv0',
+                        connector='pool')),
+                loss_b=dict(
+                    arg1=dict(from_student=True, recorder='conv1'),
+                    arg2=dict(from_student=False, recorder='conv1'))))
+
+        x = torch.randn(1, 3, 4, 4)
+        all_losses = list()
+        for fuse_losses in [False, True]:
+            distiller = ConfigurableDistiller(
+                fuse_losses=fuse_losses, **copy.deepcopy(distiller_kwargs))
+            distiller.prepare_from_student(student)
+            distiller.prepare_from_teacher(teacher)
+            with distiller.student_recorders, distiller.teacher_recorders:
+                student(x)
+                teacher(x)
+            all_losses.append(distiller.compute_distill_losses())
+
+        self.assertEqual(distiller.loss_plan.num_records, 4)
+        self.assertEqual(all_losses[1]['loss_a'].shape, (1, 3, 2, 2))
+        self.assertEqual(all_losses[1]['loss_b'].shape, (1, 3, 4, 4))
+        for name in ['loss_a', 'loss_b']:
+            self.assertTrue(torch.equal(all_losses[0][name],
+                                        all_losses[1][name]))
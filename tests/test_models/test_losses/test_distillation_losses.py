@@ -1,13 +1,79 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import threading
 from unittest import TestCase
+from unittest.mock import patch
 
 import torch
+import torch.distributed as dist
 from mmengine.structures import BaseDataElement
 
 from mmrazor import digit_version
 from mmrazor.models import (ABLoss, ActivationLoss, ATLoss, CRDLoss, DKDLoss,
                             FBKDLoss, FTLoss, InformationEntropyLoss,
                             KDSoftCELoss, OFDLoss, OnehotLikeLoss, PKDLoss)
+from mmrazor.models.losses.crd_loss import (ContrastMemory,
+                                            ShardedContrastMemory)
+
+
+class _SimulatedCollectives:
+    """Simulate ``dist.all_to_all_single`` and ``dist.all_gather`` between
+    ranks running in threads, whose ranks are set in ``local.rank``."""
+
+    def __init__(self, world_size: int) -> None:
+        self.world_size = world_size
+        self.barrier = threading.Barrier(world_size, timeout=30)
+        self.inputs = [None] * world_size
+        self.local = threading.local()
+
+    def __call__(self,
+                 output,
+                 input,
+                 output_split_sizes=None,
+                 input_split_sizes=None,
+                 **kwargs):
+        rank = self.local.rank
+        if input_split_sizes is None:
+            input_split_sizes = [len(input) // self.world_size
+                                 ] * self.world_size
+        self.inputs[rank] = input.split(input_split_sizes)
+        self.barrier.wait()
+        output.copy_(torch.cat([splits[rank] for splits in self.inputs]))
+        self.barrier.wait()
+
+    def all_gather(self, tensor_list, tensor, **kwargs):
+        self.inputs[self.local.rank] = tensor
+        self.barrier.wait()
+        for output, input in zip(tensor_list, self.inputs):
+            output.copy_(input)
+        self.barrier.wait()
+
+    def run(self, func, *rank_args):
+        """Run ``func(rank, *args)`` in a thread per rank and return the
+        results."""
+        outputs = [None] * self.world_size
+        errors = []
+
+        def run_rank(rank):
+            self.local.rank = rank
+            try:
+                outputs[rank] = func(rank, *[arg[rank] for arg in rank_args])
+            except Exception as e:
+                errors.append(e)
+                self.barrier.abort()
+
+        with patch.object(dist, 'all_to_all_single', self), \
+                patch.object(dist, 'all_gather', self.all_gather):
+            threads = [
+                threading.Thread(target=run_rank, args=(rank, ))
+                for rank in range(self.world_size)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+        return outputs
 
 
 class TestLosses(TestCase):
@@ -98,6 +164,133 @@ class TestLosses(TestCase):
         crd_loss_num_1 = crd_loss.forward(s_feat_1, t_feat_1, data_samples_1)
         assert crd_loss_num_1 != torch.tensor(0.0)
 
+    def test_crd_loss_sharded_memory(self):
+        crd_loss = CRDLoss(
+            neg_num=5,
+            sample_n=10,
+            dim_out=6,
+            sharded_memory=True,
+            memory_dtype='float16')
+        self.assertEqual(crd_loss.contrast.memory_v1.dtype, torch.float16)
+        self.assertIn('contrast.memory_v1', crd_loss.state_dict())
+
+        data_samples = self._mock_crd_data_sample(torch.arange(5))
+        memory_v1 = crd_loss.contrast.memory_v1.clone()
+        loss = crd_loss.forward(self.feats_1d, self.feats_1d, data_samples)
+        self.assertTrue(loss.numel() == 1)
+        self.assertTrue(loss.isfinite().all())
+        self.assertTrue((crd_loss.contrast.norm_constants > 0).all())
+        # only the rows of the batch are updated.
+        self.assertFalse(
+            torch.equal(crd_loss.contrast.memory_v1[:5], memory_v1[:5]))
+        self.assertTrue(
+            torch.equal(crd_loss.contrast.memory_v1[5:], memory_v1[5:]))
+
+        # the given contrast samples are used.
+        out_s, _ = crd_loss.contrast(self.feats_1d, self.feats_1d,
+                                     torch.arange(5),
+                                     torch.arange(4).repeat(5, 1) + 6)
+        self.assertEqual(out_s.shape, (5, 4, 1))
+
+    def test_crd_sharded_memory_all_to_all(self):
+        world_size, n_sample, dim_out, neg_sample = 2, 10, 6, 3
+        reference = ContrastMemory(dim_out, n_sample, neg_sample)
+        # the normalization constants depend on the batch of each rank.
+        reference.params[2:4] = 1.
+
+        memories = []
+        for rank in range(world_size):
+            with patch(
+                    'mmrazor.models.losses.crd_loss.get_dist_info',
+                    return_value=(rank, world_size)):
+                memory = ShardedContrastMemory(dim_out, n_sample, neg_sample)
+            memory.memory_v1.copy_(reference.memory_v1[rank::world_size])
+            memory.memory_v2.copy_(reference.memory_v2[rank::world_size])
+            memory.norm_constants.fill_(1.)
+            memories.append(memory)
+
+        # uneven batches, whose samples are owned by both ranks.
+        idx = [torch.tensor([0, 3, 5]), torch.tensor([8, 7])]
+        sample_idx = []
+        for rank_idx in idx:
+            rank_sample_idx = torch.randint(n_sample,
+                                            (len(rank_idx), neg_sample + 1))
+            rank_sample_idx[:, 0] = rank_idx
+            sample_idx.append(rank_sample_idx)
+        feat_s = [torch.randn(len(i), dim_out) * 0.1 for i in idx]
+        feat_t = [torch.randn(len(i), dim_out) * 0.1 for i in idx]
+
+        collectives = _SimulatedCollectives(world_size)
+        outputs = collectives.run(lambda rank, *args: memories[rank](*args),
+                                  feat_s, feat_t, idx, sample_idx)
+
+        # the fetched rows are the same as the unsharded memory.
+        ref_out_s, ref_out_t = reference(
+            torch.cat(feat_s), torch.cat(feat_t), torch.cat(idx),
+            torch.cat(sample_idx))
+        out_s, out_t = [torch.cat(out) for out in zip(*outputs)]
+        self.assertTrue(torch.allclose(out_s, ref_out_s))
+        self.assertTrue(torch.allclose(out_t, ref_out_t))
+
+        # the updated rows are the same as the unsharded memory.
+        for rank, memory in enumerate(memories):
+            self.assertTrue(
+                torch.allclose(memory.memory_v1,
+                               reference.memory_v1[rank::world_size]))
+            self.assertTrue(
+                torch.allclose(memory.memory_v2,
+                               reference.memory_v2[rank::world_size]))
+
+    def test_crd_sharded_memory_state_dict(self):
+        world_size, n_sample, dim_out, neg_sample = 2, 5, 6, 3
+
+        def build_memories():
+            memories = []
+            for rank in range(world_size):
+                with patch(
+                        'mmrazor.models.losses.crd_loss.get_dist_info',
+                        return_value=(rank, world_size)):
+                    memories.append(
+                        ShardedContrastMemory(dim_out, n_sample, neg_sample))
+            return memories
+
+        memories = build_memories()
+        self.assertEqual([len(m.memory_v1) for m in memories], [3, 2])
+        collectives = _SimulatedCollectives(world_size)
+
+        # the whole memory banks are gathered on every rank.
+        state_dicts = collectives.run(
+            lambda rank: memories[rank].state_dict())
+        for state_dict in state_dicts:
+            self.assertEqual(state_dict['memory_v1'].shape,
+                             (n_sample, dim_out))
+            for rank, memory in enumerate(memories):
+                self.assertTrue(
+                    torch.equal(state_dict['memory_v1'][rank::world_size],
+                                memory.memory_v1))
+                self.assertTrue(
+                    torch.equal(state_dict['memory_v2'][rank::world_size],
+                                memory.memory_v2))
+
+        # each rank loads back its own rows after resuming.
+        resumed = build_memories()
+        for memory in resumed:
+            memory.load_state_dict(state_dicts[0])
+        for memory, resumed_memory in zip(memories, resumed):
+            self.assertTrue(
+                torch.equal(memory.memory_v1, resumed_memory.memory_v1))
+            self.assertTrue(
+                torch.equal(memory.memory_v2, resumed_memory.memory_v2))
+        self.assertEqual(state_dicts[0]['memory_v1'].shape,
+                         (n_sample, dim_out))
+
+        # the memory banks of another number of samples are rejected.
+        with self.assertRaisesRegex(RuntimeError, 'size mismatch'):
+            resumed[0].load_state_dict(
+                dict(
+                    state_dicts[0],
+                    memory_v1=torch.rand(n_sample + 1, dim_out)))
+
     def test_dkd_loss(self):
         dkd_loss_cfg = dict(loss_weight=1.0)
         dkd_loss = DKDLoss(**dkd_loss_cfg)
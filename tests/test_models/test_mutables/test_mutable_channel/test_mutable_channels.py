@@ -3,7 +3,8 @@ import unittest
 
 import torch
 
-from mmrazor.models.mutables import (SimpleMutableChannel,
+from mmrazor.models.mutables import (MutableChannelContainer,
+                                     SimpleMutableChannel,
                                      SquentialMutableChannel)
 
 
@@ -31,3 +32,24 @@ class TestMutableChannels(unittest.TestCase):
         self.assertEqual(channel.activated_channels, 1)
         channel.fix_chosen()
         channel.dump_chosen()
+
+    def test_current_slice(self):
+        mutable_channel = SquentialMutableChannel(4)
+        mutable_channel.current_choice = 3
+        self.assertEqual(mutable_channel.current_slice, slice(0, 3))
+        self.assertEqual((mutable_channel * 2).current_slice, slice(0, 6))
+        self.assertIsNone(SimpleMutableChannel(4).current_slice)
+
+        container = MutableChannelContainer(8)
+        mutable_channel1 = SquentialMutableChannel(4)
+        container.register_mutable(mutable_channel, 0, 4)
+        container.register_mutable(mutable_channel1, 4, 8)
+        mutable_channel1.current_choice = 0
+        self.assertEqual(container.current_slice, slice(0, 3))
+        mutable_channel.current_choice = 4
+        mutable_channel1.current_choice = 2
+        self.assertEqual(container.current_slice, slice(0, 6))
+        # the mask is not a prefix.
+        mutable_channel.current_choice = 3
+        self.assertIsNone(container.current_slice)
+        self.assertEqual(container.current_mask.sum().item(), 5)
@@ -1,7 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
+import tempfile
 import unittest
 from typing import Union
+from unittest.mock import patch
 
 import torch
 
@@ -126,6 +128,30 @@ class TestChannelMutator(unittest.TestCase):
         self.assertDictEqual(config1, config)
         self._test_a_mutator(mutator1, model1)
 
+    def test_unit_cache(self):
+        model = backward_passed_library.include_models()[0]()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            model0 = copy.deepcopy(model)
+            mutator0 = ChannelMutator(unit_cache_dir=cache_dir)
+            mutator0.prepare_from_supernet(model0)
+            config = mutator0.config_template(
+                with_unit_init_args=True, with_channels=True)
+
+            # the second mutator initializes units without tracing.
+            model1 = copy.deepcopy(model)
+            mutator1 = ChannelMutator(unit_cache_dir=cache_dir)
+            with patch.object(
+                    ChannelMutator,
+                    '_prepare_from_tracer',
+                    side_effect=RuntimeError('traced')):
+                mutator1.prepare_from_supernet(model1)
+            config1 = mutator1.config_template(
+                with_unit_init_args=True, with_channels=True)
+
+        self.assertDictEqual(config1, config)
+        self._test_a_mutator(mutator1, model1)
+
     def test_models_with_predefined_dynamic_op(self):
         for Model in [
                 DynamicLinearModel,
@@ -1,9 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-
+import os.path as osp
+import tempfile
 from collections import UserList
 from unittest import TestCase
 
-from mmrazor.structures import Candidates
+from mmrazor.structures import CandidatePool, Candidates
 
 
 class TestCandidates(TestCase):
@@ -150,3 +151,130 @@ class TestCandidates(TestCase):
         self.assertEqual(candidates.scores, [98., 99., 100.])
         candidates.sort_by(key_indicator='flops', reverse=False)
         self.assertEqual(candidates.scores, [100., 99., 98.])
+
+
+class TestCandidatePool(TestCase):
+
+    def setUp(self) -> None:
+        self.search_space = {
+            '1': ['choice1', 'choice2'],
+            '2': ['choice3', 'choice4'],
+            'kernel': [[3, 3], [5, 5]]
+        }
+        self.subnet1 = {'1': 'choice1', '2': 'choice4', 'kernel': [5, 5]}
+        self.subnet2 = {'1': 'choice2', '2': 'choice3', 'kernel': [3, 3]}
+
+    def test_append_and_access(self):
+        pool = CandidatePool(self.search_space)
+        self.assertEqual(len(pool), 0)
+        pool.append(self.subnet1)
+        pool.extend([self.subnet2])
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.choices.tolist(), [[0, 1, 1], [1, 0, 0]])
+        self.assertEqual(pool[1], self.subnet2)
+        self.assertEqual(pool.subnets, [self.subnet1, self.subnet2])
+        self.assertEqual(pool.scores.tolist(), [-1, -1])
+
+        pool.set_score(0, 99.)
+        pool.update_resources([{'flops': 50.}, {'latency': 4.}])
+        self.assertEqual(pool.scores.tolist(), [99., -1])
+        self.assertEqual(pool.resources('flops').tolist(), [50., -1])
+        self.assertEqual(pool.resources('latency').tolist(), [-1, 4.])
+
+        sub_pool = pool[pool.scores > 0]
+        self.assertEqual(sub_pool.subnets, [self.subnet1])
+        pool.extend(sub_pool)
+        self.assertEqual(len(pool), 3)
+
+    def test_encode_new_choices(self):
+        # the keys are taken from the first subnet if not given.
+        pool = CandidatePool()
+        pool.append(self.subnet1)
+        self.assertEqual(list(pool.search_space), ['1', '2', 'kernel'])
+        pool.append(self.subnet2)
+        self.assertEqual(pool.choices.tolist(), [[0, 0, 0], [1, 1, 1]])
+        self.assertEqual(pool.subnets, [self.subnet1, self.subnet2])
+        with self.assertRaises(AssertionError):
+            pool.append({'1': 'choice1'})
+
+        # pools with choices appended in different orders are re-encoded.
+        other = CandidatePool(self.search_space)
+        other.extend([self.subnet2, self.subnet1])
+        other.set_score(0, 99.)
+        pool.extend(other)
+        self.assertEqual(pool.subnets, [self.subnet1, self.subnet2] * 2)
+        self.assertEqual(pool.scores.tolist(), [-1, -1, 99., -1])
+
+        # sub pools don't share the indicators.
+        sub_pool = pool[:2]
+        sub_pool.set_score(0, 100.)
+        self.assertEqual(pool.scores[0], -1)
+
+    def test_sort_and_top_k(self):
+        pool = CandidatePool(self.search_space)
+        pool.extend([self.subnet1, self.subnet2, self.subnet1])
+        for i, score in enumerate([98., 100., 99.]):
+            pool.set_score(i, score)
+
+        top_k = pool.top_k(2)
+        self.assertEqual(top_k.scores.tolist(), [100., 99.])
+        self.assertEqual(top_k.subnets, [self.subnet2, self.subnet1])
+        self.assertEqual(len(pool.top_k(5)), 3)
+
+        pool.sort_by(key_indicator='score', reverse=False)
+        self.assertEqual(pool.scores.tolist(), [98., 99., 100.])
+
+        unique_pool = pool.unique()
+        self.assertEqual(unique_pool.scores.tolist(), [98., 100.])
+
+    def test_convert_and_dump(self):
+        candidates = Candidates([self.subnet1, self.subnet2])
+        candidates.set_resource(0, 99., 'score')
+        candidates.set_resource(1, 50., 'flops')
+
+        pool = CandidatePool.from_candidates(candidates, self.search_space)
+        self.assertEqual(pool.subnets, [self.subnet1, self.subnet2])
+        self.assertEqual(pool.scores.tolist(), [99., -1])
+        self.assertEqual(pool.to_candidates().subnets, candidates.subnets)
+        self.assertEqual(pool.to_candidates().resources('flops'), [-1, 50.])
+
+        # the search space is built from the candidates if not given.
+        pool = CandidatePool.from_candidates(candidates)
+        self.assertEqual(pool.subnets, candidates.subnets)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file = osp.join(tmpdir, 'candidates.npz')
+            pool.dump(file)
+            loaded_pool = CandidatePool.load(file)
+        self.assertEqual(loaded_pool.subnets, pool.subnets)
+        self.assertEqual(loaded_pool.scores.tolist(), pool.scores.tolist())
+
+    def test_convert_nested_candidates(self):
+        subnet1 = dict(
+            value_subnet={'0': 4, '1': 2}, channel_subnet={0: 64, 1: 32})
+        subnet2 = dict(
+            value_subnet={'0': 2, '1': 2}, channel_subnet={0: 32, 1: 32})
+        candidates = Candidates([
+            {name: dict(part, score=score)
+             for name, part in subnet.items()}
+            for subnet, score in [(subnet1, 99.), (subnet2, 98.)]
+        ])
+
+        pool = CandidatePool.from_candidates(candidates)
+        self.assertEqual(len(pool.search_space), 4)
+        self.assertIn(('channel_subnet', 0), pool.search_space)
+        self.assertEqual(pool.subnets, [subnet1, subnet2])
+        self.assertEqual(pool.scores.tolist(), [99., 98.])
+        pool.append(subnet1)
+        self.assertEqual(len(pool.unique()), 2)
+
+        converted = pool.to_candidates()
+        self.assertEqual(converted.subnets, pool.subnets)
+        self.assertEqual(converted.data[0]['value_subnet']['score'], 99.)
+        self.assertEqual(converted.data[0]['channel_subnet']['score'], 99.)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file = osp.join(tmpdir, 'candidates.npz')
+            pool.dump(file)
+            loaded_pool = CandidatePool.load(file)
+        self.assertEqual(loaded_pool.subnets, pool.subnets)
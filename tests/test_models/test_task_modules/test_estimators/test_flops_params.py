@@ -2,16 +2,20 @@
 import copy
 from unittest import TestCase
 
+import numpy as np
 import pytest
 import torch
 from mmcv.cnn.bricks import Conv2dAdaptivePadding
 from torch import Tensor
 from torch.nn import Conv2d, Module, Parameter
 
-from mmrazor.models import OneShotMutableModule, ResourceEstimator
+from mmrazor.models import (LUTResourceEstimator, OneShotMutableModule,
+                            ResourceEstimator, ResourceScreener)
 from mmrazor.models.task_modules.estimators.counters import BaseCounter
 from mmrazor.registry import MODELS, TASK_UTILS
 from mmrazor.structures import export_fix_subnet
+from tests.data.models import (DynamicAttention, DynamicLinearModel,
+                               DynamicTwoBranchModel)
 
 _FIRST_STAGE_MUTABLE = dict(
     type='OneShotMutableOP',
@@ -234,3 +238,136 @@ class TestResourceEstimator(TestCase):
 
         self.assertEqual(flops_count, flops_count_after_estimate)
         self.assertEqual(params_count, params_count_after_estimate)
+
+
+class TestLUTResourceEstimator(TestCase):
+
+    def test_estimate(self) -> None:
+        # parameter-free layers (``nn.ReLU`` and ``nn.AdaptiveAvgPool2d``)
+        # are counted with the activated channels of the layers before them.
+        flops_params_cfg = dict(input_shape=(1, 3, 32, 32))
+        lut_estimator = LUTResourceEstimator(
+            flops_params_cfg=flops_params_cfg)
+        model = DynamicLinearModel()
+        mutable1 = model.net[0].mutable_attrs['out_channels']
+        mutable2 = model.net[3].mutable_attrs['out_channels']
+
+        for choice1, choice2 in [(8, 16), (4, 8), (1, 2)]:
+            for mutable in mutable1.mutable_channels.values():
+                mutable.current_choice = choice1
+            for mutable in mutable2.mutable_channels.values():
+                mutable.current_choice = choice2
+
+            results = lut_estimator.estimate(model)
+            _, sliced_model = export_fix_subnet(model, slice_weight=True)
+            subnet_results = estimator.estimate(
+                sliced_model, flops_params_cfg=flops_params_cfg)
+            self.assertEqual(results['flops'], subnet_results['flops'])
+            self.assertEqual(results['params'], subnet_results['params'])
+
+        # the table is recorded only once.
+        self.assertEqual(len(lut_estimator._tables), 1)
+        lut_estimator.reset()
+        self.assertEqual(len(lut_estimator._tables), 0)
+
+    def test_estimate_branches(self) -> None:
+        # parameter-free layers are counted with the activated channels of
+        # the layers producing their inputs, rather than executed before.
+        flops_params_cfg = dict(input_shape=(1, 3, 8, 8))
+        lut_estimator = LUTResourceEstimator(
+            flops_params_cfg=flops_params_cfg)
+        model = DynamicTwoBranchModel()
+        lut_estimator.estimate(model)
+        table = next(iter(lut_estimator._tables.values()))
+        names = {module: name for name, module in model.named_modules()}
+        records = {names[record['module']]: record for record in table}
+        self.assertIs(records['relu_a']['channel_source'], records['conv_a'])
+        self.assertIs(records['relu_b']['channel_source'], records['conv_b'])
+        # the merged input is counted as recorded.
+        self.assertNotIn('channel_source', records['relu_cat'])
+
+        for choice_a, choice_b in [(8, 8), (1, 4), (4, 2)]:
+            model.mutable_a.current_choice = choice_a
+            model.mutable_b.current_choice = choice_b
+            layer_flops = {
+                names[record['module']]: flops
+                for record, (flops, _) in zip(
+                    table, lut_estimator.estimate_layers(table))
+            }
+            self.assertEqual(layer_flops['relu_a'], choice_a * 8 * 8)
+            self.assertEqual(layer_flops['relu_b'], choice_b * 8 * 8)
+            self.assertEqual(layer_flops['relu_cat'], 16 * 8 * 8)
+
+    def test_estimate_depth(self) -> None:
+        lut_estimator = LUTResourceEstimator()
+        model = DynamicAttention()
+
+        model.mutable_depth.current_choice = 2
+        results_depth2 = lut_estimator.estimate(model)
+        model.mutable_depth.current_choice = 1
+        results_depth1 = lut_estimator.estimate(model)
+        self.assertGreater(results_depth2['flops'], results_depth1['flops'])
+        self.assertGreater(results_depth2['params'], results_depth1['params'])
+
+        # the depth is restored after recording the table.
+        lut_estimator.reset()
+        lut_estimator.estimate(model)
+        self.assertEqual(model.mutable_depth.current_choice, 1)
+
+
+class _DynamicLinearAlgorithm(Module):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.architecture = DynamicLinearModel()
+
+    def set_subnet(self, subnet) -> None:
+        for idx, key in [(0, 'net.0'), (3, 'net.3')]:
+            mutable = self.architecture.net[idx].mutable_attrs['out_channels']
+            for mutable_channel in mutable.mutable_channels.values():
+                mutable_channel.current_choice = subnet[key]
+
+
+class TestResourceScreener(TestCase):
+
+    def test_screen(self) -> None:
+        flops_params_cfg = dict(input_shape=(1, 3, 32, 32))
+        search_space = {'net.0': [1, 4, 8], 'net.3': [2, 8, 16]}
+        screener = ResourceScreener(
+            estimator_cfg=dict(flops_params_cfg=flops_params_cfg),
+            search_space=search_space)
+        lut_estimator = LUTResourceEstimator(
+            flops_params_cfg=flops_params_cfg)
+        algorithm = _DynamicLinearAlgorithm()
+        screener.prepare(algorithm)
+
+        subnets = [{
+            'net.0': choice1,
+            'net.3': choice2
+        } for choice1 in search_space['net.0']
+                   for choice2 in search_space['net.3']]
+        matrix = screener.encode(subnets)
+        self.assertEqual(matrix.shape, (9, 2))
+        self.assertEqual(screener.decode(matrix), subnets)
+
+        results = screener.estimate(matrix)
+        for i, subnet in enumerate(subnets):
+            algorithm.set_subnet(subnet)
+            subnet_results = lut_estimator.estimate(algorithm.architecture)
+            self.assertAlmostEqual(results['flops'][i],
+                                   subnet_results['flops'])
+            self.assertAlmostEqual(results['params'][i],
+                                   subnet_results['params'])
+
+        max_flops = float(np.median(results['flops']))
+        is_pass, _ = screener.screen(matrix, dict(flops=max_flops))
+        self.assertTrue(
+            np.array_equal(is_pass, results['flops'] <= max_flops))
+        is_pass, _ = screener.screen(matrix, None)
+        self.assertTrue(is_pass.all())
+        with pytest.raises(KeyError):
+            screener.screen(matrix, dict(latency=10))
+
+        matrix = screener.sample(100)
+        self.assertEqual(matrix.shape, (100, 2))
+        self.assertTrue((matrix < 3).all())
@@ -0,0 +1,82 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import torch
+from torch import nn
+
+from mmrazor.models import LUTResourceEstimator
+from mmrazor.models.task_modules.estimators.counters import (
+    get_latency_stats, get_model_latency, measure_latencies)
+from tests.data.models import DynamicLinearModel
+
+
+class TestLatencyCounter(TestCase):
+
+    def test_get_model_latency_cpu(self) -> None:
+        model = nn.Conv2d(3, 8, 3)
+        latency = get_model_latency(
+            model,
+            input_shape=(1, 3, 16, 16),
+            max_iter=10,
+            num_warmup=2,
+            num_threads=1)
+        self.assertIsInstance(latency, float)
+        self.assertGreaterEqual(latency, 0.)
+
+        latency = get_model_latency(
+            model,
+            input_shape=(1, 3, 16, 16),
+            max_iter=10,
+            num_warmup=2,
+            statistic='p90',
+            as_strings=True,
+            units=dict(latency='ms'))
+        self.assertTrue(latency.endswith(' ms'))
+
+        with self.assertRaises(AssertionError):
+            get_model_latency(model, statistic='p95')
+
+    def test_measure_latencies(self) -> None:
+        num_threads = torch.get_num_threads()
+        latencies = measure_latencies(
+            nn.ReLU(), (torch.rand(1, 8), ),
+            max_iter=10,
+            num_warmup=3,
+            num_threads=1)
+        self.assertEqual(len(latencies), 7)
+        # the number of threads is restored.
+        self.assertEqual(torch.get_num_threads(), num_threads)
+
+        stats = get_latency_stats([1., 2., 3., 4.])
+        self.assertEqual(stats['mean'], 2.5)
+        self.assertEqual(stats['p50'], 2.5)
+        self.assertLessEqual(stats['p90'], stats['p99'])
+
+
+class TestLUTLatency(TestCase):
+
+    def test_estimate_latency(self) -> None:
+        estimator = LUTResourceEstimator(
+            flops_params_cfg=dict(input_shape=(1, 3, 16, 16)),
+            latency_cfg=dict(max_iter=4, num_warmup=1),
+            latency_lut=True)
+        model = DynamicLinearModel()
+        mutable = model.net[0].mutable_attrs['out_channels']
+
+        results = estimator.estimate(model)
+        self.assertGreater(results['latency'], 0.)
+        num_ops = len(estimator._latency_table)
+        self.assertGreater(num_ops, 0)
+
+        # the same configuration is measured only once.
+        estimator.estimate(model)
+        self.assertEqual(len(estimator._latency_table), num_ops)
+
+        for mutable_channel in mutable.mutable_channels.values():
+            mutable_channel.current_choice = 4
+        estimator.estimate(model)
+        self.assertGreater(len(estimator._latency_table), num_ops)
+
+        # the latency lookup table is kept after reset.
+        estimator.reset()
+        self.assertGreater(len(estimator._latency_table), num_ops)
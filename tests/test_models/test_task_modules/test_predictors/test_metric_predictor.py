@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
 import tempfile
 from unittest import TestCase
 
@@ -75,6 +77,39 @@ class TestMetricPredictorWithGP(TestCase):
         self.assertIsInstance(metrics, dict)
         self.assertGreater(metrics['accuracy_top-1'], 0.0)
 
+    def test_update(self):
+        inputs, labels = self.generate_data()
+        self.predictor.fit(inputs, labels)
+
+        # the new samples are appended to the training set.
+        self.predictor.update([{0: 'conv2'}], [0.5])
+        self.assertEqual(len(self.predictor.train_data), 4)
+        self.assertEqual(self.predictor.train_label.tolist(),
+                         labels.tolist() + [0.5])
+        self.assertEqual(len(self.predictor.predict_batch([{0: 'conv2'}])), 1)
+
+        # the training samples are saved and loaded with the handler.
+        ckpt_path = self.predictor.save_checkpoint(
+            osp.join(self.temp_dir, 'predictor'))
+        predictor_cfg = dict(
+            type='MetricPredictor',
+            handler_cfg=dict(type='GaussProcessHandler'),
+            search_groups=self.search_groups,
+            handler_ckpt=ckpt_path)
+        predictor = TASK_UTILS.build(predictor_cfg)
+        predictor.load_checkpoint()
+        np.testing.assert_array_equal(predictor.train_data,
+                                      self.predictor.train_data)
+        predictor.update([{0: 'conv3'}], [0.8])
+        self.assertEqual(len(predictor.train_data), 5)
+
+        # refitting a loaded handler without its samples is not allowed.
+        os.remove(f'{ckpt_path}.samples.npz')
+        predictor = TASK_UTILS.build(predictor_cfg)
+        predictor.load_checkpoint()
+        with self.assertRaisesRegex(AssertionError, 'training samples'):
+            predictor.update([{0: 'conv3'}], [0.8])
+
 
 class TestMetricPredictorWithCart(TestCase):
 
@@ -115,6 +150,21 @@ class TestMetricPredictorWithCart(TestCase):
         self.assertIsInstance(metrics, dict)
         self.assertGreater(metrics['accuracy_top-1'], 0.0)
 
+    def test_predict_batch(self):
+        inputs, labels = self.generate_data()
+        self.predictor.fit(inputs, labels)
+
+        batch_metrics = self.predictor.predict_batch(self.candidates)
+        self.assertEqual(len(batch_metrics), len(self.candidates))
+        data = self.predictor.encode(self.candidates)
+        self.assertEqual(data.shape[0], len(self.candidates))
+        for i, metrics in enumerate(batch_metrics):
+            # the same as predicting the samples one by one.
+            score = float(np.squeeze(self.predictor.handler.predict(
+                data[i:i + 1])))
+            self.assertAlmostEqual(metrics['accuracy_top-1'], score)
+        self.assertEqual(self.predictor.predict_batch([]), [])
+
 
 class TestMetricPredictorWithRBF(TestCase):
 
@@ -15,7 +15,7 @@ from torch.utils.data import DataLoader, Dataset
 from mmrazor.engine import EvolutionSearchLoop
 from mmrazor.models import OneShotMutableOP
 from mmrazor.registry import LOOPS
-from mmrazor.structures import Candidates
+from mmrazor.structures import CandidatePool, Candidates
 
 
 def collate_fn(data_batch):
@@ -122,7 +122,8 @@ class TestEvolutionSearchLoop(TestCase):
         loop_cfg.init_candidates = init_candidates_path
         loop = LOOPS.build(loop_cfg)
         self.assertIsInstance(loop, EvolutionSearchLoop)
-        self.assertEqual(loop.candidates, fake_candidates)
+        self.assertIsInstance(loop.candidates, CandidatePool)
+        self.assertEqual(loop.candidates.subnets, fake_candidates.subnets)
 
     @patch('mmrazor.structures.subnet.fix_subnet.load_fix_subnet')
     @patch('mmrazor.structures.subnet.fix_subnet.export_fix_subnet')
@@ -194,11 +195,13 @@ class TestEvolutionSearchLoop(TestCase):
         loop.update_candidate_pool = MagicMock()
         loop.val_candidate_pool = MagicMock()
 
-        mutation_candidates = Candidates([fake_subnet] * loop.num_mutation)
+        mutation_candidates = CandidatePool()
+        mutation_candidates.extend([fake_subnet] * loop.num_mutation)
         for i in range(loop.num_mutation):
             mutation_candidates.set_resource(i, 0.1 + 0.1 * i, 'flops')
             mutation_candidates.set_resource(i, 99 + i, 'score')
-        crossover_candidates = Candidates([fake_subnet] * loop.num_crossover)
+        crossover_candidates = CandidatePool()
+        crossover_candidates.extend([fake_subnet] * loop.num_crossover)
         for i in range(loop.num_crossover):
             crossover_candidates.set_resource(i, 0.1 + 0.1 * i, 'flops')
             crossover_candidates.set_resource(i, 99 + i, 'score')
@@ -206,7 +209,8 @@ class TestEvolutionSearchLoop(TestCase):
             MagicMock(return_value=mutation_candidates)
         loop.gen_crossover_candidates = \
             MagicMock(return_value=crossover_candidates)
-        loop.candidates = Candidates([fake_subnet] * 4)
+        loop.candidates = CandidatePool()
+        loop.candidates.extend([fake_subnet] * 4)
         mock_flops.return_value = (0.5, 101)
         torch.save = MagicMock()
         loop.run()
@@ -219,10 +223,13 @@ class TestEvolutionSearchLoop(TestCase):
         # test resuming search
         loop_cfg.resume_from = os.path.join(
             self.temp_dir, f'search_epoch_{loop._max_epochs-1}.pkl')
+        searcher_resume = fileio.load(loop_cfg.resume_from)
+        self.assertIsInstance(searcher_resume['top_k_candidates'], Candidates)
         loop = LOOPS.build(loop_cfg)
         self.runner.rank = 0
         loop.run()
         self.assertEqual(loop._max_epochs, 1)
+        self.assertIsInstance(loop.top_k_candidates, CandidatePool)
 
 
 class TestEvolutionSearchLoopWithPredictor(TestCase):
@@ -280,7 +287,8 @@ class TestEvolutionSearchLoopWithPredictor(TestCase):
         loop_cfg.init_candidates = init_candidates_path
         loop = LOOPS.build(loop_cfg)
         self.assertIsInstance(loop, EvolutionSearchLoop)
-        self.assertEqual(loop.candidates, fake_candidates)
+        self.assertIsInstance(loop.candidates, CandidatePool)
+        self.assertEqual(loop.candidates.subnets, fake_candidates.subnets)
 
     @patch('mmrazor.structures.subnet.fix_subnet.load_fix_subnet')
     @patch('mmrazor.structures.subnet.fix_subnet.export_fix_subnet')
@@ -356,11 +364,13 @@ class TestEvolutionSearchLoopWithPredictor(TestCase):
         loop.update_candidate_pool = MagicMock()
         loop.val_candidate_pool = MagicMock()
 
-        mutation_candidates = Candidates([fake_subnet] * loop.num_mutation)
+        mutation_candidates = CandidatePool()
+        mutation_candidates.extend([fake_subnet] * loop.num_mutation)
         for i in range(loop.num_mutation):
             mutation_candidates.set_resource(i, 0.1 + 0.1 * i, 'flops')
             mutation_candidates.set_resource(i, 99 + i, 'score')
-        crossover_candidates = Candidates([fake_subnet] * loop.num_crossover)
+        crossover_candidates = CandidatePool()
+        crossover_candidates.extend([fake_subnet] * loop.num_crossover)
         for i in range(loop.num_crossover):
             crossover_candidates.set_resource(i, 0.1 + 0.1 * i, 'flops')
             crossover_candidates.set_resource(i, 99 + i, 'score')
@@ -368,7 +378,8 @@ class TestEvolutionSearchLoopWithPredictor(TestCase):
             MagicMock(return_value=mutation_candidates)
         loop.gen_crossover_candidates = \
             MagicMock(return_value=crossover_candidates)
-        loop.candidates = Candidates([fake_subnet] * 4)
+        loop.candidates = CandidatePool()
+        loop.candidates.extend([fake_subnet] * 4)
 
         mock_flops.return_value = (0.5, 101)
         mock_model2vector.return_value = dict(
@@ -388,3 +399,32 @@ class TestEvolutionSearchLoopWithPredictor(TestCase):
         self.runner.rank = 0
         loop.run()
         self.assertEqual(loop._max_epochs, 1)
+
+    def test_refit_predictor(self):
+        loop_cfg = copy.deepcopy(self.train_cfg)
+        loop_cfg.runner = self.runner
+        loop_cfg.dataloader = self.dataloader
+        loop_cfg.evaluator = self.evaluator
+        loop_cfg.num_refit_samples = 2
+        loop = LOOPS.build(loop_cfg)
+        self.runner.rank = 0
+        loop._epoch = 1
+
+        subnets = [{'1': f'choice{i}'} for i in range(4)]
+        loop.candidates = CandidatePool()
+        loop.candidates.extend(subnets)
+        loop.use_predictor = True
+        loop.predictor = MagicMock()
+        loop.predictor.predict_batch = MagicMock(
+            return_value=[{'bbox_mAP': float(i)} for i in range(4)])
+        loop.predictor.train_label = [0.] * 6
+        loop._val_candidate = MagicMock(return_value={'bbox_mAP': 50.})
+        loop.model.set_subnet = MagicMock()
+        loop.update_candidates_scores()
+
+        # the top 2 predicted candidates are validated and used to refit.
+        self.assertEqual(loop._val_candidate.call_count, 2)
+        refit_subnets, refit_labels = loop.predictor.update.call_args[0]
+        self.assertEqual(refit_subnets, [subnets[3], subnets[2]])
+        self.assertEqual(refit_labels, [50., 50.])
+        self.assertEqual(loop.candidates.scores.tolist(), [0., 1., 50., 50.])
@@ -0,0 +1,73 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import tempfile
+from unittest import TestCase
+
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from mmrazor.engine.runner.utils import (CachedBatchLoader,
+                                         build_cached_batch_loader)
+
+
+class ToyDataset(Dataset):
+
+    def __init__(self):
+        self.num_loaded = 0
+
+    def __len__(self):
+        return 10
+
+    def __getitem__(self, index):
+        self.num_loaded += 1
+        return dict(
+            inputs=torch.full((3, 4, 4), index, dtype=torch.uint8),
+            data_samples=index)
+
+
+class TestCachedBatchLoader(TestCase):
+
+    def _check_replay(self, loader, dataset, num_batches):
+        self.assertEqual(len(loader), num_batches)
+        first_batches = list(loader)
+        num_loaded = dataset.num_loaded
+        for _ in range(2):
+            batches = list(loader)
+            self.assertEqual(len(batches), num_batches)
+            for batch, first_batch in zip(batches, first_batches):
+                self.assertTrue(
+                    torch.equal(batch['inputs'], first_batch['inputs']))
+                self.assertEqual(batch['inputs'].dtype, torch.uint8)
+                self.assertTrue(
+                    torch.equal(batch['data_samples'],
+                                first_batch['data_samples']))
+        # the dataset is not loaded again.
+        self.assertEqual(dataset.num_loaded, num_loaded)
+
+    def test_cache_in_memory(self):
+        dataset = ToyDataset()
+        loader = CachedBatchLoader(DataLoader(dataset, batch_size=4))
+        self.assertIs(loader.dataset, dataset)
+        self.assertFalse(loader.is_cached)
+        self._check_replay(loader, dataset, 3)
+        self.assertTrue(loader.is_cached)
+
+        loader = CachedBatchLoader(
+            DataLoader(ToyDataset(), batch_size=4), max_batches=2)
+        self._check_replay(loader, loader.dataset, 2)
+
+        loader.clear()
+        self.assertFalse(loader.is_cached)
+
+    def test_cache_in_files(self):
+        dataset = ToyDataset()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            loader = build_cached_batch_loader(
+                DataLoader(dataset, batch_size=4), dict(cache_dir=tmpdir),
+                'val')
+            self._check_replay(loader, dataset, 3)
+            cache_dir = os.path.join(tmpdir, 'val', 'rank0')
+            self.assertEqual(len(os.listdir(cache_dir)), 6)
+
+            loader.clear()
+            self.assertEqual(len(os.listdir(cache_dir)), 0)
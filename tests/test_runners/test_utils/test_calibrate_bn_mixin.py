@@ -16,9 +16,13 @@ class ToyModel(nn.Module):
         super().__init__()
 
         self.bn = nn.BatchNorm2d(3)
+        self.scale = 1.
+
+    def set_subnet(self, subnet: dict) -> None:
+        self.scale = subnet['scale']
 
     def forward(self, x: Tensor) -> Tensor:
-        return self.bn(x)
+        return self.bn(x * self.scale)
 
     def test_step(self, x: Tensor) -> None:
         self(x)
@@ -73,6 +77,31 @@ class TestCalibrateBNMixin(TestCase):
                               loop.runner.model.bn.running_mean)
         assert torch.allclose(calibrated_var, loop.runner.model.bn.running_var)
 
+    def test_recalibrate(self) -> None:
+        dataloader = self.prepare_dataloader(
+            random_nums=200, x_shape=(3, 8, 8))
+        loop = ToyValLoop()
+        model = loop.runner.model
+        ori_mean = model.bn.running_mean.clone()
+        subnets = [dict(scale=1.), dict(scale=2.)]
+        all_stats = loop.recalibrate(subnets, dataloader, 200,
+                                     model.set_subnet)
+        self.assertEqual(len(all_stats), 2)
+        # the stats of the model are restored.
+        assert torch.equal(model.bn.running_mean, ori_mean)
+        self.assertEqual(model.bn.momentum, 0.1)
+
+        data = dataloader.dataset.data
+        for subnet, stats in zip(subnets, all_stats):
+            loop.load_bn_statistics(stats)
+            scaled_data = data * subnet['scale']
+            assert torch.allclose(
+                model.bn.running_mean, scaled_data.mean((0, 2, 3)), atol=1e-3)
+            assert torch.allclose(
+                model.bn.running_var,
+                scaled_data.var((0, 2, 3), unbiased=True),
+                rtol=1e-3)
+
     def prepare_dataloader(
         self,
         random_nums: int = 2000,
@@ -33,6 +33,9 @@ def test_check_subnet_resources(mock_model, mock_estimator):
         constraints_range,
     )
     assert is_pass is True
+    # the subnet is estimated in place, without exporting or copying.
+    mock_model.set_subnet.assert_called_with(fake_subnet)
+    mock_estimator.estimate.assert_called_with(model=mock_model.architecture)
 
     # constraints_range is not None
     # architecturte is BaseDetector
@@ -0,0 +1,95 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import tempfile
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+import torch.nn as nn
+from mmengine.evaluator import BaseMetric, Evaluator
+from torch.utils.data import DataLoader, Dataset
+
+from mmrazor.engine.runner.utils import (build_local_dataloader,
+                                         val_subnets_sharded)
+
+
+class ToyDataset(Dataset):
+
+    def __len__(self):
+        return 8
+
+    def __getitem__(self, index):
+        return torch.tensor(float(index))
+
+
+class ToyMetric(BaseMetric):
+    default_prefix = 'toy'
+
+    def process(self, data_batch, data_samples):
+        self.results.extend(float(data) for data in data_samples)
+
+    def compute_metrics(self, results):
+        return dict(mean=sum(results) / len(results))
+
+
+class ToyAlgorithm(nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.scale = 1.
+
+    def set_subnet(self, subnet):
+        self.scale = subnet['scale']
+
+    def val_step(self, data_batch):
+        return data_batch * self.scale
+
+
+def _run_sharded_eval(rank, world_size, init_file):
+    dist.init_process_group(
+        'gloo',
+        init_method=f'file://{init_file}',
+        rank=rank,
+        world_size=world_size)
+
+    # the dataloader is sharded across ranks by default.
+    dataloader = DataLoader(
+        ToyDataset(),
+        batch_size=2,
+        sampler=list(range(rank, len(ToyDataset()), world_size)))
+    dataloader = build_local_dataloader(dataloader)
+    algorithm = ToyAlgorithm()
+    subnets = [dict(scale=float(s)) for s in [1, 2, 3, 2, 5]]
+    metrics = val_subnets_sharded(algorithm, algorithm, subnets, dataloader,
+                                  Evaluator(ToyMetric()))
+
+    expected = [3.5 * subnet['scale'] for subnet in subnets]
+    assert [m['toy/mean'] for m in metrics] == expected
+    dist.destroy_process_group()
+
+
+def test_build_local_dataloader():
+    dataloader = DataLoader(ToyDataset(), batch_size=2, sampler=[0, 1])
+    local_dataloader = build_local_dataloader(dataloader)
+    assert len(local_dataloader) == 4
+    assert local_dataloader.batch_size == 2
+
+    local_dataloader = build_local_dataloader(dataloader, num_samples=3)
+    indices = list(local_dataloader.sampler)
+    assert len(indices) == 3
+    assert indices == list(
+        build_local_dataloader(dataloader, num_samples=3).sampler)
+
+
+def test_val_subnets_sharded():
+    # without distributed
+    algorithm = ToyAlgorithm()
+    dataloader = DataLoader(ToyDataset(), batch_size=4)
+    metrics = val_subnets_sharded(algorithm, algorithm, [dict(scale=2.)],
+                                  dataloader, Evaluator(ToyMetric()))
+    assert metrics == [{'toy/mean': 7.}]
+
+    # sharded across 2 ranks with gloo backend.
+    with tempfile.TemporaryDirectory() as tmpdir:
+        init_file = os.path.join(tmpdir, 'dist_init')
+        mp.spawn(_run_sharded_eval, args=(2, init_file), nprocs=2)
@@ -0,0 +1,59 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import tempfile
+
+import torch.nn as nn
+
+from mmrazor.engine.runner.utils import SubnetEvalCache, get_model_identity
+
+
+def test_subnet_eval_cache():
+    subnet1 = {'a': 1, 'b': 'k3'}
+    subnet2 = {'b': 'k3', 'a': 1}
+    subnet3 = {'a': 2, 'b': 'k3'}
+
+    # the hash is independent of the order of keys.
+    assert SubnetEvalCache.hash_subnet(subnet1) == \
+        SubnetEvalCache.hash_subnet(subnet2)
+    assert SubnetEvalCache.hash_subnet(subnet1) != \
+        SubnetEvalCache.hash_subnet(subnet3)
+
+    # in-memory tier with LRU eviction
+    cache = SubnetEvalCache(max_size=1)
+    assert cache.get(subnet1) is None
+    cache.put(subnet1, {'accuracy/top1': 50.})
+    assert cache.get(subnet2) == {'accuracy/top1': 50.}
+    cache.put(subnet3, {'accuracy/top1': 60.})
+    assert len(cache) == 1
+    assert cache.get(subnet1) is None
+    assert cache.get_batch([subnet1, subnet3]) == [
+        None, {
+            'accuracy/top1': 60.
+        }
+    ]
+    assert cache.num_hits == 1 and cache.num_misses == 1
+
+    # the results are isolated by the model id.
+    cache.model_id = 'another'
+    assert cache.get(subnet3) is None
+
+    # on-disk tier is reused by another cache.
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = SubnetEvalCache(cache_dir=tmpdir, model_id='ckpt')
+        cache.put(subnet1, {'accuracy/top1': 50.})
+        resumed_cache = SubnetEvalCache(cache_dir=tmpdir, model_id='ckpt')
+        assert resumed_cache.get_batch([subnet2, subnet3]) == [{
+            'accuracy/top1': 50.
+        }, None]
+        resumed_cache.model_id = 'another'
+        assert resumed_cache.get(subnet1) is None
+
+
+def test_get_model_identity():
+    model1 = nn.Linear(3, 4)
+    model2 = nn.Linear(3, 4)
+    model2.load_state_dict(model1.state_dict())
+    assert get_model_identity(model1) == get_model_identity(model2)
+
+    nn.init.zeros_(model2.bias)
+    nn.init.ones_(model1.bias)
+    assert get_model_identity(model1) != get_model_identity(model2)
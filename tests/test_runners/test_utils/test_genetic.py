@@ -1,5 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from mmrazor.engine.runner.utils import crossover
+import numpy as np
+
+from mmrazor.engine.runner.utils import batch_crossover, crossover
 
 
 def test_crossover():
@@ -13,3 +15,15 @@ def test_crossover():
 
     assert type(result) == type(fake_random_subnet1)
     assert len(result) == len(fake_random_subnet1)
+
+
+def test_batch_crossover():
+    matrix1 = np.zeros((10, 50), dtype=np.int64)
+    matrix2 = np.ones((10, 50), dtype=np.int64)
+
+    result = batch_crossover(matrix1, matrix2)
+    assert result.shape == matrix1.shape
+    assert np.isin(result, [0, 1]).all()
+
+    assert (batch_crossover(matrix1, matrix2, prob=0.) == 0).all()
+    assert (batch_crossover(matrix1, matrix2, prob=1.) == 1).all()
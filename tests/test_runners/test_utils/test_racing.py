@@ -0,0 +1,86 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import torch
+import torch.nn as nn
+from mmengine.evaluator import BaseMetric, Evaluator
+from torch.utils.data import DataLoader, Dataset
+
+from mmrazor.engine.runner.utils import val_subnets_racing
+
+
+class ToyDataset(Dataset):
+
+    def __len__(self):
+        return 32
+
+    def __getitem__(self, index):
+        return torch.tensor(1.)
+
+
+class ToyMetric(BaseMetric):
+    default_prefix = 'toy'
+
+    def process(self, data_batch, data_samples):
+        self.results.extend(float(data) for data in data_samples)
+
+    def compute_metrics(self, results):
+        return dict(mean=sum(results) / len(results))
+
+
+class ToyAlgorithm(nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.scale = 1.
+
+    def set_subnet(self, subnet):
+        self.scale = subnet['scale']
+
+    def val_step(self, data_batch):
+        return data_batch * self.scale
+
+
+def test_val_subnets_racing():
+    algorithm = ToyAlgorithm()
+    dataloader = DataLoader(ToyDataset(), batch_size=2)
+    evaluator = Evaluator(ToyMetric())
+    subnets = [dict(scale=float(s)) for s in [1, 4, 2, 3]]
+
+    metrics, is_full, num_saved_batches = val_subnets_racing(
+        algorithm,
+        algorithm,
+        subnets,
+        dataloader,
+        evaluator,
+        score_key='toy/mean',
+        top_k=2,
+        num_init_batches=2)
+    # the scores are constant, so the worse ones are dropped at the first
+    # checkpoint.
+    assert is_full == [False, True, False, True]
+    assert [m['toy/mean'] for m in metrics] == [1., 4., 2., 3.]
+    assert num_saved_batches == 2 * (len(dataloader) - 2)
+
+    # the candidates are compared with the reference scores.
+    metrics, is_full, _ = val_subnets_racing(
+        algorithm,
+        algorithm,
+        subnets,
+        dataloader,
+        evaluator,
+        score_key='toy/mean',
+        top_k=2,
+        ref_scores=[5., 6.],
+        num_init_batches=2)
+    assert not any(is_full)
+
+    # nothing is dropped if the number of subnets is not larger than top k.
+    metrics, is_full, num_saved_batches = val_subnets_racing(
+        algorithm,
+        algorithm,
+        subnets[:2],
+        dataloader,
+        evaluator,
+        score_key='toy/mean',
+        top_k=2)
+    assert all(is_full) and num_saved_batches == 0
+    assert len(evaluator.metrics[0].results) == 0
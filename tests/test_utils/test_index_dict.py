@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import copy
 import unittest
 
 from mmrazor.utils.index_dict import IndexDict
@@ -14,3 +15,30 @@ class TestIndexDict(unittest.TestCase):
         self.assertSequenceEqual(list(dict.keys()), [(1, 3), (4, 5)])
         with self.assertRaisesRegex(AssertionError, 'overlap'):
             dict[2, 3] = 3
+
+    def test_overlap(self):
+        dict = IndexDict()
+        dict[(2, 4)] = 1
+        dict[(6, 8)] = 2
+
+        for index in [(2, 4), (3, 5), (1, 3), (0, 10), (1, 7), (5, 7)]:
+            self.assertIn(index, dict)
+        for index in [(0, 2), (4, 6), (8, 9)]:
+            self.assertNotIn(index, dict)
+
+    def test_remove(self):
+        dict = IndexDict()
+        for i in [3, 0, 2, 1]:
+            dict[(i, i + 1)] = i
+
+        self.assertEqual(dict.pop((2, 3)), 2)
+        self.assertNotIn((2, 3), dict)
+        self.assertEqual(dict.popitem(), ((3, 4), 3))
+        del dict[(0, 1)]
+        self.assertSequenceEqual(list(dict.keys()), [(1, 2)])
+
+        dict[(0, 1)] = 0
+        copied = copy.deepcopy(dict)
+        copied[(2, 3)] = 2
+        self.assertSequenceEqual(
+            list(copied.keys()), [(0, 1), (1, 2), (2, 3)])
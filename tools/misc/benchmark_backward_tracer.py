@@ -0,0 +1,123 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os.path as osp
+import sys
+import time
+
+import torch
+
+from mmrazor.models import backbones
+from mmrazor.models.task_modules import BackwardTracer
+from mmrazor.structures.graph import ModuleGraph
+from mmrazor.utils import register_all_modules
+
+# deep residual, multi-branch and dense backbones in the
+# `mmrazor/models/backbones` zoo.
+BACKBONES = {
+    'resnet50': dict(type='ResNet', depth=50),
+    'resnet152': dict(type='ResNet', depth=152),
+    'resnext50': dict(type='ResNeXt', depth=50),
+    'seresnet50': dict(type='SEResNet', depth=50),
+    'res2net50': dict(type='Res2Net', depth=50),
+    'regnetx_400mf': dict(type='RegNet', arch='regnetx_400mf'),
+    'mobilenet_v2': dict(type='MobileNetV2'),
+    'shufflenet_v2': dict(type='ShuffleNetV2'),
+    'densenet121': dict(type='DenseNet', arch='121'),
+    'hrnet_w18': dict(type='HRNet', arch='w18'),
+}
+
+# the toy models in `tests/data/models.py`.
+TEST_MODELS = [
+    'SingleLineModel', 'ResBlock', 'AddCatModel', 'ConcatModel',
+    'MultiConcatModel', 'MultiConcatModel2', 'GroupWiseConvModel', 'Xmodel',
+    'MultipleUseModel', 'Icep', 'ExpandLineModel', 'MultiBindModel',
+    'DwConvModel'
+]
+
+
+class PseudoLoss:
+    """Sum all the output tensors of a backbone as the pseudo loss."""
+
+    def __init__(self, input_shape):
+        self.input_shape = input_shape
+
+    def __call__(self, model):
+        outputs = model(torch.rand(self.input_shape))
+        if isinstance(outputs, torch.Tensor):
+            outputs = [outputs]
+        return sum(output.sum() for output in outputs)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark BackwardTracer with and without dag_trace')
+    parser.add_argument(
+        '--models',
+        nargs='+',
+        default=list(BACKBONES) + TEST_MODELS,
+        help='names of the backbones or the models in tests/data/models.py')
+    parser.add_argument(
+        '--input-size', type=int, default=64, help='size of pseudo images')
+    parser.add_argument(
+        '--num-iters', type=int, default=3, help='num of timed iterations')
+    parser.add_argument(
+        '--skip-path-trace',
+        action='store_true',
+        help='only trace with `dag_trace=True`, as tracing all the paths may '
+        'take minutes or hit the recursion limit on deep models')
+    args = parser.parse_args()
+    return args
+
+
+def build_model(name):
+    if name in BACKBONES:
+        cfg = BACKBONES[name].copy()
+        return getattr(backbones, cfg.pop('type'))(**cfg)
+    # tests/data/models.py is not in the package.
+    repo_root = osp.dirname(osp.dirname(osp.dirname(osp.abspath(__file__))))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+    from tests.data import models
+    return getattr(models, name)()
+
+
+def benchmark(model, loss_calculator, dag_trace, num_iters):
+    """Return the mean time of tracing and building the module graph, and
+    the edges of the graph."""
+    tracer = BackwardTracer(loss_calculator, dag_trace=dag_trace)
+    trace_times = []
+    for _ in range(num_iters):
+        start_time = time.perf_counter()
+        graph = ModuleGraph.init_from_backward_tracer(model, tracer)
+        trace_times.append(time.perf_counter() - start_time)
+    edges = {(prev.name, node.name)
+             for node in graph for prev in node.prev_nodes}
+    return sum(trace_times) / len(trace_times), edges
+
+
+def main():
+    register_all_modules(False)
+    args = parse_args()
+
+    for name in args.models:
+        model = build_model(name)
+        loss_calculator = PseudoLoss(
+            (2, 3, args.input_size, args.input_size))
+
+        dag_time, dag_edges = benchmark(model, loss_calculator, True,
+                                        args.num_iters)
+        msg = f'{name}: dag trace {dag_time * 1000:.1f} ms'
+        if not args.skip_path_trace:
+            try:
+                path_time, path_edges = benchmark(model, loss_calculator,
+                                                  False, args.num_iters)
+                msg += f', path trace {path_time * 1000:.1f} ms, ' \
+                    f'speedup {path_time / dag_time:.1f}x, ' \
+                    f'same graph: {path_edges == dag_edges}'
+            except RecursionError:
+                msg += ', path trace hits the recursion limit'
+        print(msg)
+
+
+if __name__ == '__main__':
+    main()
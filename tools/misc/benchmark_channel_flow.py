@@ -0,0 +1,85 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os.path as osp
+import sys
+import time
+import tracemalloc
+
+from mmrazor.models.task_modules import BackwardTracer
+from mmrazor.structures.graph import ModuleGraph
+from mmrazor.structures.graph.channel_graph import ChannelGraph
+from mmrazor.structures.graph.channel_nodes import \
+    default_channel_node_converter
+from mmrazor.utils import register_all_modules
+
+# the models in `tests/data/models.py`.
+TEST_MODELS = [
+    'SingleLineModel', 'ResBlock', 'AddCatModel', 'ConcatModel',
+    'MultiConcatModel', 'MultiConcatModel2', 'GroupWiseConvModel', 'Xmodel',
+    'MultipleUseModel', 'Icep', 'ExpandLineModel', 'MultiBindModel',
+    'DwConvModel'
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the speed and the memory of analyzing the '
+        'channel dependency with ChannelGraph')
+    parser.add_argument(
+        '--models',
+        nargs='+',
+        default=TEST_MODELS,
+        help='names of the models in tests/data/models.py')
+    parser.add_argument(
+        '--num-iters', type=int, default=10, help='num of timed iterations')
+    args = parser.parse_args()
+    return args
+
+
+def build_model(name):
+    # tests/data/models.py is not in the package.
+    repo_root = osp.dirname(osp.dirname(osp.dirname(osp.abspath(__file__))))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+    from tests.data import models
+    return getattr(models, name)()
+
+
+def analyze(module_graph):
+    """Forward ChannelTensors through the graph and generate the configs of
+    the channel units."""
+    channel_graph = ChannelGraph.copy_from(module_graph,
+                                           default_channel_node_converter)
+    channel_graph.forward()
+    return channel_graph.generate_units_config()
+
+
+def main():
+    register_all_modules(False)
+    args = parse_args()
+
+    tracer = BackwardTracer(
+        dict(type='ImageClassifierPseudoLoss', input_shape=(2, 3, 32, 32)),
+        dag_trace=True)
+    for name in args.models:
+        module_graph = ModuleGraph.init_from_backward_tracer(
+            build_model(name), tracer)
+
+        analyze_times = []
+        for _ in range(args.num_iters):
+            start_time = time.perf_counter()
+            units_config = analyze(module_graph)
+            analyze_times.append(time.perf_counter() - start_time)
+
+        tracemalloc.start()
+        analyze(module_graph)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        mean_time = sum(analyze_times) / len(analyze_times) * 1000
+        print(f'{name}: {len(units_config)} units, {mean_time:.1f} ms, '
+              f'peak memory {peak_memory / 1024:.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+
+import torch
+from mmengine.config import Config, DictAction
+from mmengine.runner import Runner
+
+from mmrazor.registry import MODELS
+from mmrazor.utils import register_all_modules
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the train step time of a distill config')
+    parser.add_argument('config', help='train config file path')
+    parser.add_argument(
+        '--num-iters', type=int, default=50, help='num of timed iterations')
+    parser.add_argument(
+        '--num-warmup', type=int, default=5, help='num of warm-up iterations')
+    parser.add_argument(
+        '--share-forward',
+        action='store_true',
+        help='reuse the outputs of modules shared by the teacher and the '
+        'student, namely `model.distiller.share_forward=True`')
+    parser.add_argument(
+        '--cfg-options',
+        nargs='+',
+        action=DictAction,
+        help='override some settings in the used config, the key-value pair '
+        'in xxx=yyy format will be merged into config file.')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    register_all_modules(False)
+    args = parse_args()
+
+    cfg = Config.fromfile(args.config)
+    if args.cfg_options is not None:
+        cfg.merge_from_dict(args.cfg_options)
+    if args.share_forward:
+        cfg.model.distiller.share_forward = True
+    # the checkpoint of teacher doesn't affect the step time.
+    cfg.model.pop('teacher_ckpt', None)
+
+    model = MODELS.build(cfg.model)
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = model.to(device)
+    model.train()
+    dataloader = Runner.build_dataloader(cfg.train_dataloader)
+    data_batch = next(iter(dataloader))
+    data = model.data_preprocessor(data_batch, True)
+
+    step_times = []
+    for i in range(args.num_iters + args.num_warmup):
+        if device == 'cuda':
+            torch.cuda.synchronize()
+        start_time = time.perf_counter()
+
+        losses = model(**data, mode='loss')
+        loss, _ = model.parse_losses(losses)
+        loss.backward()
+        model.zero_grad()
+
+        if device == 'cuda':
+            torch.cuda.synchronize()
+        if i >= args.num_warmup:
+            step_times.append(time.perf_counter() - start_time)
+
+    mean_time = sum(step_times) / len(step_times) * 1000
+    print(f'{args.config}: {mean_time:.1f} ms / step on {device} '
+          f'(share_forward={args.share_forward})')
+
+
+if __name__ == '__main__':
+    main()
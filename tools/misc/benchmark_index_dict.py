@@ -0,0 +1,87 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import random
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from mmrazor.utils import IndexDict
+
+
+class LegacyIndexDict(OrderedDict):
+    """The IndexDict sorting all the items on every insertion and scanning all
+    the indexes for overlap, as the baseline."""
+
+    def __setitem__(self, __k: Tuple[int, int], __v):
+        start, end = __k
+        assert start < end
+        assert (start, end) not in self, 'index overlap'
+        super().__setitem__(__k, __v)
+        items = sorted(self.items())
+        self.clear()
+        for k, v in items:
+            super().__setitem__(k, v)
+
+    def __contains__(self, __o) -> bool:
+        if super().__contains__(__o):
+            return True
+        start, end = __o
+        existed = False
+        for s, e in self.keys():
+            existed = (s <= start < e or s < end < e or
+                       (s < start and end < e)) or existed
+        return existed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark IndexDict against the sort-on-insert one')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[16, 256, 2048],
+        help='numbers of indexes to insert')
+    parser.add_argument(
+        '--num-iters', type=int, default=3, help='num of timed iterations')
+    args = parser.parse_args()
+    return args
+
+
+def build(dict_class, indexes):
+    """Insert the indexes and query every index for overlap."""
+    index_dict = dict_class()
+    for index in indexes:
+        index_dict[index] = None
+    for start, end in indexes:
+        assert (start, end) in index_dict
+    return index_dict
+
+
+def benchmark(dict_class, indexes, num_iters):
+    times = []
+    for _ in range(num_iters):
+        start_time = time.perf_counter()
+        build(dict_class, indexes)
+        times.append(time.perf_counter() - start_time)
+    return sum(times) / len(times) * 1000
+
+
+def main():
+    args = parse_args()
+    for size in args.sizes:
+        ascending = [(i * 2, i * 2 + 2) for i in range(size)]
+        shuffled = random.Random(0).sample(ascending, size)
+        for order, indexes in [('ascending', ascending),
+                               ('shuffled', shuffled)]:
+            assert list(build(IndexDict, indexes).items()) == list(
+                build(LegacyIndexDict, indexes).items())
+            new_time = benchmark(IndexDict, indexes, args.num_iters)
+            legacy_time = benchmark(LegacyIndexDict, indexes, args.num_iters)
+            print(f'{size} {order} indexes: IndexDict {new_time:.2f} ms, '
+                  f'legacy {legacy_time:.2f} ms, '
+                  f'speedup {legacy_time / new_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
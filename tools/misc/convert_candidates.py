@@ -0,0 +1,41 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+
+from mmengine import fileio
+
+from mmrazor.structures import CandidatePool, Candidates
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Convert candidates between `Candidates` files (.pkl / '
+        '.yaml, e.g. `search_epoch_*.pkl`) and `CandidatePool` files (.npz)')
+    parser.add_argument('src', help='source candidates file path')
+    parser.add_argument('dst', help='destination candidates file path')
+    parser.add_argument(
+        '--key',
+        default='candidates',
+        help='the key of candidates in a searcher checkpoint, e.g. '
+        '`candidates` or `top_k_candidates`')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.src.endswith('.npz'):
+        candidates = CandidatePool.load(args.src).to_candidates()
+        fileio.dump(candidates, args.dst)
+    else:
+        candidates = fileio.load(args.src)
+        if isinstance(candidates, dict):
+            candidates = candidates[args.key]
+        assert isinstance(candidates, Candidates), \
+            f'Expect `Candidates`, but got `{type(candidates)}`.'
+        CandidatePool.from_candidates(candidates).dump(args.dst)
+    print(f'Successful converted. Saved in {args.dst}.')
+
+
+if __name__ == '__main__':
+    main()